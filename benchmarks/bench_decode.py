@@ -0,0 +1,98 @@
+"""Benchmark JSON decoding of call_history pages in-process and in a process pool.
+
+Each pool size is reported with its speedup over in-process decoding; the pool
+can only scale up to the number of cores of the host, printed first.
+
+Usage:
+    python benchmarks/bench_decode.py [--pages 200] [--workers 1 2 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import wait
+
+from tap_zoomphone.decoding import DecodePool, decode_compact, expand_compact
+
+RECORDS_JSONPATH = "$.call_logs[*]"
+
+
+def make_page(page_size: int = 300) -> bytes:
+    """Build a synthetic call_history page body."""
+    call_logs = [
+        {
+            "id": f"48c1dfd4-91ce-4df5-8495-{i:012d}",
+            "call_id": str(7018317023722949162 + i),
+            "direction": "inbound",
+            "international": False,
+            "start_time": "2024-01-01T10:00:00Z",
+            "answer_time": "2024-01-01T10:00:05Z",
+            "end_time": "2024-01-01T10:03:00Z",
+            "duration": 175,
+            "connect_type": "external",
+            "call_type": "general",
+            "call_result": "answered",
+            "caller_ext_id": "ATu63--9TjudZetpf4UuQg",
+            "caller_did_number": "+12059300920",
+            "caller_name": "Caller name",
+            "callee_ext_id": "V4UobpuxRxCwN_8iNf7k4w",
+            "callee_ext_number": "101229",
+            "callee_name": "Callee name",
+            "site_name": "Main Site",
+            "department": "Support",
+            "cost_center": "CC-100",
+        }
+        for i in range(page_size)
+    ]
+    body = {"call_logs": call_logs, "page_count": 1, "page_size": page_size, "next_page_token": ""}
+    return json.dumps(body).encode()
+
+
+def bench_in_process(pages: list[bytes]) -> float:
+    started = time.perf_counter()
+    for content in pages:
+        expand_compact(decode_compact(content, RECORDS_JSONPATH))
+    return time.perf_counter() - started
+
+
+def bench_pool(pages: list[bytes], workers: int) -> float:
+    pool = DecodePool(workers, min_bytes=0)
+    pool.decode(pages[0], RECORDS_JSONPATH)  # start the workers
+    started = time.perf_counter()
+    futures = [
+        pool._executor.submit(decode_compact, content, RECORDS_JSONPATH)  # noqa: SLF001
+        for content in pages
+    ]
+    wait(futures)
+    for future in futures:
+        expand_compact(future.result())
+    elapsed = time.perf_counter() - started
+    pool.shutdown()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    pages = [make_page() for _ in range(args.pages)]
+    total_mb = sum(len(page) for page in pages) / 1e6
+
+    print(f"cores: {os.cpu_count()}")
+    baseline = bench_in_process(pages)
+    print(f"in-process      {baseline:7.3f}s  {total_mb / baseline:7.1f} MB/s")
+    for workers in args.workers:
+        elapsed = bench_pool(pages, workers)
+        print(
+            f"pool workers={workers:<2} {elapsed:7.3f}s  {total_mb / elapsed:7.1f} MB/s"
+            f"  x{baseline / elapsed:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
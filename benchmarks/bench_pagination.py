@@ -0,0 +1,104 @@
+"""Benchmark the per-page overhead of the date-range paginator.
+
+Drives ``ZoomDateJsonPaginator`` with a call_history strategy over synthetic
+pages: each page is turned into URL params and the paginator is advanced with
+a prebuilt response, with no I/O or record decoding involved. Windows starting
+in the future get an empty page, as Zoom returns. Whenever the paginator
+finishes a new one is started, as the next sync would.
+
+Usage:
+    python benchmarks/bench_pagination.py [--pages 2000000] [--pages-per-window 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import time
+from datetime import datetime, timezone
+
+import requests
+from dateutil.relativedelta import relativedelta
+
+from tap_zoomphone.pagination import (
+    PageCountBasedDateRangePaginationStrategy,
+    ZoomDateJsonPaginator,
+)
+
+URL = "https://api.zoom.us/v2/phone/call_history"
+
+
+def make_response(body: dict) -> requests.Response:
+    """Build a response to a call_history request."""
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(body).encode()
+    response.request = requests.Request("GET", URL).prepare()
+    return response
+
+
+def make_responses(pages_per_window: int) -> list[requests.Response]:
+    """Build one response per page position of a window, without records."""
+    return [
+        make_response(
+            {
+                "next_page_token": "" if page == pages_per_window - 1 else f"token{page}",
+                "page_count": pages_per_window,
+                "page_size": 300,
+                "total_records": 300 * pages_per_window,
+                "call_logs": [],
+            }
+        )
+        for page in range(pages_per_window)
+    ]
+
+
+def bench(pages: int, pages_per_window: int) -> float:
+    strategy = PageCountBasedDateRangePaginationStrategy(
+        page_size=300,
+        history_window=relativedelta(years=20),
+        logger=logging.getLogger("bench"),
+    )
+    strategy._get_initial_start_date = lambda context: (  # noqa: SLF001
+        datetime.now(timezone.utc) - relativedelta(years=20)
+    )
+    responses = make_responses(pages_per_window)
+    empty = make_response({"next_page_token": "", "page_count": 0, "call_logs": []})
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    logger = logging.getLogger("bench")
+
+    started = time.perf_counter()
+    paginator = ZoomDateJsonPaginator("$.next_page_token", logger, strategy)
+    position = 0
+    for _ in range(pages):
+        if paginator.finished:
+            paginator = ZoomDateJsonPaginator("$.next_page_token", logger, strategy)
+            position = 0
+        params = strategy.get_url_params(None, paginator.current_value)
+        if params["from"] >= now:
+            response = empty
+            position = -1
+        else:
+            response = responses[position]
+        response.request.url = f"{URL}?from={params['from']}&to={params['to']}"
+        paginator.advance(response)
+        position = (position + 1) % pages_per_window
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=2_000_000)
+    parser.add_argument("--pages-per-window", type=int, default=10)
+    args = parser.parse_args()
+
+    elapsed = bench(args.pages, args.pages_per_window)
+    print(
+        f"{args.pages} pages  {elapsed:7.3f}s  "
+        f"{elapsed / args.pages * 1e6:6.2f} us/page  {args.pages / elapsed:10.0f} pages/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark replication key and window bound handling.
+
+Compares, over synthetic call_history ``start_time`` values, the SDK's datetime
+parsing with ``parse_timestamp``, and bookmark comparisons on parsed datetimes
+with comparisons on ``timestamp_key`` strings. Window bounds are formatted once
+per page of 300 records, with ``strftime`` and with the cached
+``format_timestamp``.
+
+Usage:
+    python benchmarks/bench_timestamps.py [--records 1000000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from singer_sdk.streams.core import Stream
+
+from tap_zoomphone.timestamps import (
+    TIMESTAMP_FORMAT,
+    format_timestamp,
+    parse_timestamp,
+    timestamp_key,
+)
+
+BOOKMARK = "2024-01-15T00:00:00Z"
+PAGE_SIZE = 300
+
+
+def make_values(records: int) -> list[str]:
+    """Build sorted start times spread over one month, at one-second resolution."""
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    offsets = sorted(random.randrange(31 * 24 * 3600) for _ in range(records))
+    return [
+        (start + timedelta(seconds=offset)).strftime(TIMESTAMP_FORMAT)
+        for offset in offsets
+    ]
+
+
+def timed(function, values: list[str]) -> float:
+    started = time.perf_counter()
+    function(values)
+    return time.perf_counter() - started
+
+
+def sdk_parse(values: list[str]) -> None:
+    for value in values:
+        Stream._parse_datetime(None, value)  # noqa: SLF001
+
+
+def tap_parse(values: list[str]) -> None:
+    for value in values:
+        parse_timestamp(value)
+
+
+def sdk_compare(values: list[str]) -> None:
+    bookmark = Stream._parse_datetime(None, BOOKMARK)  # noqa: SLF001
+    for value in values:
+        _ = Stream._parse_datetime(None, value) >= bookmark  # noqa: SLF001
+
+
+def key_compare(values: list[str]) -> None:
+    bookmark = timestamp_key(BOOKMARK)
+    for value in values:
+        _ = timestamp_key(value) >= bookmark
+
+
+def strftime_bounds(values: list[str]) -> None:
+    window_from = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    window_to = datetime(2024, 2, 1, tzinfo=timezone.utc)
+    for _ in range(0, len(values), PAGE_SIZE):
+        window_from.strftime(TIMESTAMP_FORMAT)
+        window_to.strftime(TIMESTAMP_FORMAT)
+
+
+def cached_bounds(values: list[str]) -> None:
+    window_from = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    window_to = datetime(2024, 2, 1, tzinfo=timezone.utc)
+    for _ in range(0, len(values), PAGE_SIZE):
+        format_timestamp(window_from)
+        format_timestamp(window_to)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    zoom_values = make_values(args.records)
+    offset_values = [value[:19] + "+00:00" for value in zoom_values]
+
+    rows = [
+        ("parse, SDK", sdk_parse, zoom_values),
+        ("parse, parse_timestamp", tap_parse, zoom_values),
+        ("parse +00:00, SDK", sdk_parse, offset_values),
+        ("parse +00:00, tap", tap_parse, offset_values),
+        ("compare, parsed", sdk_compare, zoom_values),
+        ("compare, timestamp_key", key_compare, zoom_values),
+        ("bounds, strftime", strftime_bounds, zoom_values),
+        ("bounds, cached", cached_bounds, zoom_values),
+    ]
+    for label, function, values in rows:
+        elapsed = timed(function, values)
+        print(f"{label:<24} {elapsed:7.3f}s  {elapsed / len(values) * 1e9:6.0f} ns/record")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Benchmark writing call_history RECORD messages.
+
+Writes synthetic call_history records once with the SDK's writer and once with
+``BufferedSingerWriter``, with stdout sent to ``/dev/null``. The "sync" rows go
+through the stream's ``_write_record_message``, as a sync does, which also
+conforms each record to the schema; the "writer" rows time the writers alone on
+prebuilt RECORD messages. A STATE message is written every 10,000 records, as
+the SDK does.
+
+Usage:
+    python benchmarks/bench_writer.py [--records 200000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from singer_sdk.helpers._state import StateWriter
+from singer_sdk.io_base import SingerWriter
+from singer_sdk.singerlib import RecordMessage
+
+from tap_zoomphone.tap import TapZoomPhone
+from tap_zoomphone.timestamps import TIMESTAMP_FORMAT
+from tap_zoomphone.writer import BufferedSingerWriter
+
+STATE_EVERY = 10_000
+
+
+def make_records(records: int) -> list[dict]:
+    """Build call_history records with every field of the schema filled."""
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    result = []
+    for index in range(records):
+        started = start + timedelta(seconds=index * 7)
+        result.append(
+            {
+                "id": f"{index:032x}",
+                "call_id": f"7{index:018d}",
+                "direction": "outbound" if index % 2 else "inbound",
+                "international": False,
+                "start_time": started.strftime(TIMESTAMP_FORMAT),
+                "answer_time": (started + timedelta(seconds=5)).strftime(TIMESTAMP_FORMAT),
+                "end_time": (started + timedelta(seconds=65)).strftime(TIMESTAMP_FORMAT),
+                "duration": 60,
+                "connect_type": "internal",
+                "sbc_id": None,
+                "sbc_name": None,
+                "sip_group_id": None,
+                "sip_group_name": None,
+                "call_type": "general",
+                "call_result": "answered",
+                "caller_ext_id": f"ext{index % 500:05d}",
+                "caller_did_number": "+15550100",
+                "caller_ext_number": str(1000 + index % 500),
+                "caller_name": "Caller Name",
+                "caller_email": "caller@example.com",
+                "caller_ext_type": "user",
+                "caller_number_type": "internal",
+                "caller_device_type": "Mac_Client",
+                "caller_country_iso_code": "US",
+                "caller_country_code": "1",
+                "callee_ext_id": f"ext{(index + 7) % 500:05d}",
+                "callee_did_number": "+15550199",
+                "callee_ext_number": str(1000 + (index + 7) % 500),
+                "callee_name": "Callee Name",
+                "callee_email": "callee@example.com",
+                "callee_ext_type": "user",
+                "callee_number_type": "internal",
+                "callee_device_type": "iOS",
+                "callee_country_iso_code": "US",
+                "callee_country_code": "1",
+                "client_code": None,
+                "department": "Sales",
+                "cost_center": "CC1",
+                "site_id": "site1",
+                "group_id": None,
+                "site_name": "Main Office",
+                "spam": None,
+                "recording_status": "non_recorded",
+            }
+        )
+    return result
+
+
+@contextlib.contextmanager
+def stdout_to_devnull():
+    """Send file descriptor 1 to /dev/null, leaving stderr for the results."""
+    sys.stdout.flush()
+    saved = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved, 1)
+        os.close(devnull)
+        os.close(saved)
+
+
+def bench_sync(writer, records: list[dict]) -> float:
+    tap = TapZoomPhone(
+        config={
+            "client_id": "client_id",
+            "client_secret": "client_secret",
+            "account_id": "account_id",
+        },
+        parse_env_config=False,
+        message_writer=writer,
+    )
+    state_writer = StateWriter(writer)
+    stream = tap.streams["call_history"]
+    started = time.perf_counter()
+    with stdout_to_devnull():
+        for index, record in enumerate(records, 1):
+            stream._write_record_message(record)  # noqa: SLF001
+            if index % STATE_EVERY == 0:
+                state_writer.write_state({"bookmarks": {"call_history": {"n": index}}})
+        state_writer.write_state({"bookmarks": {"call_history": {"n": len(records)}}})
+    return time.perf_counter() - started
+
+
+def bench_writer(writer, records: list[dict]) -> float:
+    state_writer = StateWriter(writer)
+    extracted = datetime.now(timezone.utc)
+    messages = [
+        RecordMessage(stream="call_history", record=record, time_extracted=extracted)
+        for record in records
+    ]
+    started = time.perf_counter()
+    with stdout_to_devnull():
+        for index, message in enumerate(messages, 1):
+            writer.write_message(message)
+            if index % STATE_EVERY == 0:
+                state_writer.write_state({"bookmarks": {"call_history": {"n": index}}})
+        state_writer.write_state({"bookmarks": {"call_history": {"n": len(records)}}})
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=200_000)
+    args = parser.parse_args()
+
+    records = make_records(args.records)
+    for label, function, writer in (
+        ("sync, SDK writer", bench_sync, SingerWriter()),
+        ("sync, buffered", bench_sync, BufferedSingerWriter()),
+        ("writer, SDK", bench_writer, SingerWriter()),
+        ("writer, buffered", bench_writer, BufferedSingerWriter()),
+    ):
+        elapsed = function(writer, records)
+        print(
+            f"{label:<18} {elapsed:7.3f}s  {args.records / elapsed:9,.0f} records/s",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""Asyncio request engine for Zoom Phone streams.
+
+The engine sends the ``requests.PreparedRequest`` objects built by the stream
+through an ``httpx.AsyncClient`` and converts every reply back into a
+``requests.Response``. Pagination strategies, the ``ZoomDateJsonPaginator``,
+``validate_response`` and ``parse_response`` therefore run unchanged on top of
+it, while many requests can be in flight from a single thread.
+
+Requires the optional ``httpx`` dependency (``pip install tap-zoomphone[async]``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from singer_sdk import metrics
+from singer_sdk.exceptions import RetriableAPIError
+from singer_sdk.pagination import SinglePagePaginator
+
+from tap_zoomphone.partitions import PartitionAbandonedError
+from tap_zoomphone.prometheus import IN_FLIGHT
+from tap_zoomphone.retry import RecordNotFoundError, ServerError
+
+if t.TYPE_CHECKING:
+    import httpx
+    from singer_sdk.helpers.types import Context
+
+    from tap_zoomphone.client import ZoomPhoneStream
+    from tap_zoomphone.partitions import PartitionBuffer
+
+
+DEFAULT_MAX_CONCURRENCY = 100
+
+
+class AsyncRequestEngine:
+    """Send a stream's requests on an asyncio event loop."""
+
+    def __init__(
+        self,
+        stream: ZoomPhoneStream,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        """Initialize the engine.
+
+        Args:
+            stream: The stream whose requests are sent.
+            max_concurrency: Upper bound on requests in flight at once.
+            transport: Optional httpx transport, mainly for tests.
+        """
+        self.stream = stream
+        self.max_concurrency = max_concurrency
+        self._transport = transport
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Return the private event loop used by this engine."""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop
+
+    def run(self, awaitable: t.Awaitable) -> t.Any:  # noqa: ANN401
+        """Run an awaitable to completion on the engine's loop."""
+        return self.loop.run_until_complete(awaitable)
+
+    def close(self) -> None:
+        """Close the HTTP client and the event loop."""
+        if self._loop is None:
+            return
+        if self._client is not None:
+            self._loop.run_until_complete(self._client.aclose())
+            self._client = None
+        self._loop.close()
+        self._loop = None
+        self._semaphore = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared async client, creating it on first use."""
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                transport=self._transport,
+                timeout=self.stream.timeout,
+                follow_redirects=self.stream.allow_redirects,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    @staticmethod
+    def _to_requests_response(
+        reply: httpx.Response,
+        prepared_request: requests.PreparedRequest,
+        elapsed: float,
+    ) -> requests.Response:
+        """Convert an httpx reply into the ``requests.Response`` the SDK expects."""
+        response = requests.Response()
+        response.status_code = reply.status_code
+        response._content = reply.content  # noqa: SLF001
+        response.headers = CaseInsensitiveDict(reply.headers)
+        response.url = str(reply.url)
+        response.reason = reply.reason_phrase
+        response.encoding = reply.encoding
+        response.elapsed = timedelta(seconds=elapsed)
+        response.request = prepared_request
+        return response
+
+    async def send(
+        self,
+        prepared_request: requests.PreparedRequest,
+        context: Context | None,
+    ) -> requests.Response:
+        """Send a prepared request, retrying with the stream's backoff settings.
+
+        Requests for immutable windows are answered from the stream's response
+        cache when it holds them.
+
+        Args:
+            prepared_request: Request built by ``stream.prepare_request``.
+            context: Stream partition or context dictionary.
+
+        Returns:
+            The validated response.
+        """
+        import httpx
+
+        cached = self.stream.cached_response(prepared_request)
+        if cached is not None:
+            return cached
+
+        client = self._get_client()
+        waits = self.stream.backoff_wait_generator()
+        next(waits)
+        max_tries = self.stream.backoff_max_tries()
+        tries = 0
+        while True:
+            tries += 1
+            delay = self.stream.circuit_breaker.delay()
+            if delay:
+                await asyncio.sleep(delay)
+            metrics_registry = self.stream.metrics_registry
+            try:
+                async with self._semaphore:
+                    if metrics_registry is not None:
+                        metrics_registry.inc(IN_FLIGHT, {"stream": self.stream.name})
+                    started = time.perf_counter()
+                    try:
+                        reply = await client.request(
+                            prepared_request.method,
+                            prepared_request.url,
+                            headers=dict(prepared_request.headers),
+                            content=prepared_request.body,
+                        )
+                    finally:
+                        elapsed = time.perf_counter() - started
+                        if metrics_registry is not None:
+                            metrics_registry.inc(
+                                IN_FLIGHT, {"stream": self.stream.name}, -1
+                            )
+                response = self._to_requests_response(reply, prepared_request, elapsed)
+                self.stream._write_request_duration_log(  # noqa: SLF001
+                    endpoint=self.stream.path,
+                    response=response,
+                    context=context,
+                    extra_tags={"url": prepared_request.path_url}
+                    if self.stream._LOG_REQUEST_METRIC_URLS  # noqa: SLF001
+                    else None,
+                )
+                self.stream.record_request_metrics(response, elapsed)
+                self.stream.validate_response(response)
+            except (RetriableAPIError, httpx.TransportError) as exc:
+                if isinstance(exc, (ServerError, httpx.TransportError)):
+                    self.stream.record_request_failure()
+                self.stream.trace_failure(
+                    prepared_request, exc, time.perf_counter() - started
+                )
+                if tries >= max_tries:
+                    raise
+                wait = self.stream.backoff_jitter(waits.send(exc))
+                self.stream.backoff_handler(
+                    {
+                        "target": self.send,
+                        "args": (prepared_request, context),
+                        "kwargs": {},
+                        "tries": tries,
+                        "elapsed": 0,
+                        "wait": wait,
+                        "exception": exc,
+                    }
+                )
+                await asyncio.sleep(wait)
+            else:
+                self.stream.circuit_breaker.record_success()
+                self.stream.store_response(prepared_request, response)
+                return response
+
+    async def iter_responses(
+        self,
+        context: Context | None,
+    ) -> t.AsyncGenerator[requests.Response, None]:
+        """Yield every page of a context using the stream's paginator.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            Each page response, in order.
+        """
+        paginator = self.stream.get_new_paginator() or SinglePagePaginator()
+        with metrics.http_request_counter(
+            self.stream.name, self.stream.path
+        ) as request_counter:
+            request_counter.context = context
+            while not paginator.finished:
+                prepared_request = self.stream.prepare_request(
+                    context,
+                    next_page_token=paginator.current_value,
+                )
+                response = await self.send(prepared_request, context)
+                request_counter.increment()
+                self.stream.update_sync_costs(prepared_request, response, context)
+                yield response
+                paginator.advance(response)
+
+    async def parse_response(self, response: requests.Response) -> list[dict]:
+        """Parse a response, decoding large bodies in the stream's process pool."""
+        pool = self.stream.decode_pool
+        if pool is not None and pool.should_offload(response.content):
+            records = await pool.decode_async(
+                response.content, self.stream.records_jsonpath
+            )
+            self.stream.observe_page(response, len(records))
+            return records
+        return list(self.stream.parse_response(response))
+
+    async def fetch_records(self, context: Context | None) -> list[dict]:
+        """Fetch and parse every record for a context."""
+        records = []
+        async for response in self.iter_responses(context):
+            records.extend(await self.parse_response(response))
+        return records
+
+    async def _fetch_many(self, contexts: t.Sequence[Context]) -> list[list[dict]]:
+        results = await asyncio.gather(
+            *(self.fetch_records(context) for context in contexts),
+            return_exceptions=True,
+        )
+        for index, result in enumerate(results):
+            if isinstance(result, RecordNotFoundError):
+                self.stream.logger.warning("Skipping %s: %s", contexts[index], result)
+                results[index] = []
+            elif isinstance(result, BaseException):
+                raise result
+        return results
+
+    def fetch_many(self, contexts: t.Sequence[Context]) -> list[list[dict]]:
+        """Fetch the records of many contexts concurrently.
+
+        Args:
+            contexts: Stream contexts, e.g. one per ``/call_history/{id}``.
+
+        Returns:
+            The records of each context, in the same order as ``contexts``.
+        """
+        with self.stream.window_replay_scope():
+            return self.run(self._fetch_many(contexts))
+
+    async def _stream_records(
+        self,
+        context: Context,
+        buffer: PartitionBuffer,
+        put_pool: ThreadPoolExecutor,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        responses = self.iter_responses(context)
+        try:
+            async for response in responses:
+                page = await self.parse_response(response)
+                # put() blocks while the buffer is full, so it runs off the loop.
+                await loop.run_in_executor(put_pool, buffer.put, page)
+        except RecordNotFoundError as exc:
+            self.stream.logger.warning("Skipping %s: %s", context, exc)
+        except PartitionAbandonedError:
+            return
+        except Exception as exc:  # noqa: BLE001
+            buffer.finish(exc)
+            return
+        finally:
+            await responses.aclose()
+        buffer.finish()
+
+    async def _stream_many(
+        self,
+        contexts: t.Sequence[Context],
+        buffers: t.Sequence[PartitionBuffer],
+        put_pool: ThreadPoolExecutor,
+    ) -> None:
+        await asyncio.gather(
+            *(
+                self._stream_records(context, buffer, put_pool)
+                for context, buffer in zip(contexts, buffers)
+            )
+        )
+
+    def stream_many(
+        self,
+        contexts: t.Sequence[Context],
+        buffers: t.Sequence[PartitionBuffer],
+    ) -> None:
+        """Fetch many contexts concurrently, handing each page to its buffer.
+
+        Args:
+            contexts: Stream contexts, e.g. one per user partition.
+            buffers: The buffer receiving the pages of each context.
+        """
+        with (
+            self.stream.window_replay_scope(),
+            ThreadPoolExecutor(
+                max_workers=len(contexts), thread_name_prefix="partition-put"
+            ) as put_pool,
+        ):
+            self.run(self._stream_many(contexts, buffers, put_pool))
+
+    def request_records(self, context: Context | None) -> t.Iterable[dict]:
+        """Synchronous equivalent of ``RESTStream.request_records``.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            An item for every record in the response.
+        """
+        responses = self.iter_responses(context)
+        try:
+            while True:
+                try:
+                    response = self.run(responses.__anext__())
+                except StopAsyncIteration:
+                    break
+                yield from self.stream.parse_response(response)
+        finally:
+            self.run(responses.aclose())
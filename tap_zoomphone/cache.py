@@ -0,0 +1,249 @@
+"""On-disk cache of responses for date windows that can no longer change.
+
+Call history older than a few days is immutable, so a window whose ``to``
+lies before the immutability horizon can be served from disk on re-runs and
+backfills. Each entry holds every page of one window, stored once the last page
+was received, and is addressed by a SHA-256 of the Zoom account, the request
+method and the normalized URL of the window's first page (``from``, ``to``,
+``page_size``), so taps of different accounts can share a cache directory.
+Zoom's page tokens expire, so later pages are never cached on their own: a
+replay serves them from the window's entry, by the token the previous cached
+page handed out. Entries are stored gzip-compressed. They expire after the TTL,
+and once the cache grows past its size limit the least recently used entries
+are evicted.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from urllib import parse
+
+import requests
+
+from tap_zoomphone.pagination import next_page_token, page_count
+
+DEFAULT_RESPONSE_CACHE_MAX_BYTES = 1024**3
+DEFAULT_RESPONSE_CACHE_TTL_DAYS = 30
+DEFAULT_IMMUTABILITY_HORIZON_DAYS = 3
+
+_caches: dict[Path, ResponseCache] = {}
+
+
+def cache_key(method: str, url: str, account: str) -> str:
+    """Return the cache key of the window a request of `account` belongs to.
+
+    The page token is left out, so every page of a window shares the key of
+    its first page. Query parameters are sorted so that equivalent URLs share
+    a key.
+    """
+    parts = parse.urlsplit(url)
+    query = parse.urlencode(
+        sorted(
+            (name, value)
+            for name, value in parse.parse_qsl(parts.query, keep_blank_values=True)
+            if name != "next_page_token"
+        )
+    )
+    normalized = parse.urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path, query, "")
+    )
+    return hashlib.sha256(
+        f"{account} {method.upper()} {normalized}".encode()
+    ).hexdigest()
+
+
+def request_token(url: str) -> str | None:
+    """Return the ``next_page_token`` query parameter of a request URL, if set."""
+    values = parse.parse_qs(parse.urlsplit(url).query).get("next_page_token")
+    return values[0] if values else None
+
+
+def pack_pages(pages: list[bytes]) -> bytes:
+    """Join page bodies into one entry, each preceded by its length."""
+    return b"".join(b"%d\n%s" % (len(page), page) for page in pages)
+
+
+def unpack_pages(content: bytes) -> list[bytes]:
+    """Split an entry written by `pack_pages` into its page bodies."""
+    pages = []
+    position = 0
+    while position < len(content):
+        newline = content.index(b"\n", position)
+        end = newline + 1 + int(content[position:newline])
+        pages.append(content[newline + 1 : end])
+        position = end
+    return pages
+
+
+def is_last_page(content: bytes, page_number: int) -> bool:
+    """Return True if no page follows page `page_number` (from 1) of a window."""
+    count = page_count(content)
+    return not next_page_token(content) or (count is not None and page_number >= count)
+
+
+class CachedResponse(requests.Response):
+    """A response served from the cache, which is not counted against quotas."""
+
+    from_cache = True
+
+
+class CachedWindow:
+    """The pages of a cached window, looked up by the token they were requested with."""
+
+    def __init__(self, pages: list[bytes]):
+        """Index the pages of a window by the token of the page before each."""
+        self.pages = pages
+        self._index: dict[str | None, int] = {None: 0}
+        for number, page in enumerate(pages[:-1], start=1):
+            self._index[next_page_token(page)] = number
+
+    def page(self, token: str | None) -> tuple[bytes, bool] | None:
+        """Return the page requested with `token` and whether it is the last one."""
+        number = self._index.get(token)
+        if number is None:
+            return None
+        return self.pages[number], number == len(self.pages) - 1
+
+
+class WindowRecording:
+    """The pages of a window received so far, in order."""
+
+    def __init__(self):
+        """Start a recording without pages."""
+        self.pages: list[bytes] = []
+
+    def add(self, token: str | None, content: bytes) -> bool:
+        """Add the page requested with `token` and return True if it follows the last.
+
+        Pages that do not continue the recorded chain leave the recording
+        incomplete for good.
+        """
+        expected = next_page_token(self.pages[-1]) if self.pages else None
+        if token != expected:
+            return False
+        self.pages.append(content)
+        return True
+
+    @property
+    def complete(self) -> bool:
+        """Return True once the last page of the window was recorded."""
+        return bool(self.pages) and is_last_page(self.pages[-1], len(self.pages))
+
+
+class ResponseCache:
+    """Compressed response bodies on disk with TTL and size based eviction."""
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int = DEFAULT_RESPONSE_CACHE_MAX_BYTES,
+        ttl: float = DEFAULT_RESPONSE_CACHE_TTL_DAYS * 86400,
+    ):
+        """Initialize the cache, indexing the entries already on disk.
+
+        Args:
+            directory: Root directory of the cache.
+            max_bytes: Total compressed size above which entries are evicted.
+            ttl: Seconds an entry stays valid after it was written.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._sizes: dict[Path, int] = {}
+        self._total_bytes = 0
+        for path in directory.glob("*/*.gz"):
+            self._track(path, path.stat().st_size)
+
+    @property
+    def total_bytes(self) -> int:
+        """Return the compressed size of all entries."""
+        return self._total_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.gz"
+
+    def _track(self, path: Path, size: int) -> None:
+        self._total_bytes += size - self._sizes.get(path, 0)
+        self._sizes[path] = size
+
+    def _forget(self, path: Path) -> None:
+        self._total_bytes -= self._sizes.pop(path, 0)
+        path.unlink(missing_ok=True)
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached body for a key, or None if missing or expired."""
+        path = self._path(key)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+
+        now = time.time()
+        if now - stat.st_mtime > self.ttl:
+            with self._lock:
+                self._forget(path)
+            return None
+
+        try:
+            content = gzip.decompress(path.read_bytes())
+        except (FileNotFoundError, OSError, EOFError):
+            with self._lock:
+                self._forget(path)
+            return None
+        # The access time orders entries for eviction; mtime still dates the write.
+        os.utime(path, (now, stat.st_mtime))
+        return content
+
+    def put(self, key: str, content: bytes) -> None:
+        """Store a body, then evict entries until the cache fits its size limit."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = gzip.compress(content, compresslevel=6)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._track(path, len(data))
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        def last_used(path: Path) -> float:
+            try:
+                return path.stat().st_atime
+            except FileNotFoundError:
+                return 0.0
+
+        for path in sorted(self._sizes, key=last_used):
+            if self._total_bytes <= self.max_bytes:
+                return
+            self._forget(path)
+
+
+def get_response_cache(
+    directory: str,
+    max_bytes: int = DEFAULT_RESPONSE_CACHE_MAX_BYTES,
+    ttl_days: float = DEFAULT_RESPONSE_CACHE_TTL_DAYS,
+) -> ResponseCache:
+    """Return the process-wide response cache stored in `directory`.
+
+    Streams share one cache so that its size limit applies to all of them.
+    """
+    path = Path(directory)
+    if path not in _caches:
+        path.mkdir(parents=True, exist_ok=True)
+        _caches[path] = ResponseCache(path, max_bytes=max_bytes, ttl=ttl_days * 86400)
+    return _caches[path]
+
+
+def window_end(url: str) -> str | None:
+    """Return the ``to`` query parameter of a request URL, if present."""
+    values = parse.parse_qs(parse.urlsplit(url).query).get("to")
+    return values[0] if values else None
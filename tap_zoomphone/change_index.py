@@ -0,0 +1,104 @@
+"""Content hashes of emitted records, kept between runs to skip unchanged ones.
+
+The index maps each record's key to a short hash of its content and is stored
+as JSON under ``state_dir``. A stream compares every record it fetches with the
+index and only emits records that are new or whose hash changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import typing as t
+from pathlib import Path
+
+HASH_BYTES = 16
+
+
+def record_hash(record: t.Mapping[str, t.Any]) -> str:
+    """Return a hash of a record's content, independent of key order."""
+    encoded = json.dumps(record, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(encoded.encode(), digest_size=HASH_BYTES).hexdigest()
+
+
+class RecordHashIndex:
+    """Mapping of record keys to content hashes, persisted to a JSON file."""
+
+    def __init__(self, path: Path):
+        """Initialize the index, loading it from `path` if the file exists."""
+        self.path = path
+        self._hashes: dict[str, str] = {}
+        if path.exists():
+            self._load(json.loads(path.read_text(encoding="utf-8")))
+
+    def _load(self, data: dict) -> None:
+        self._hashes = data
+
+    def _dump(self) -> dict:
+        return self._hashes
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._hashes
+
+    def keys(self) -> t.KeysView[str]:
+        """Return the keys in the index."""
+        return self._hashes.keys()
+
+    def changed(self, key: str, content_hash: str) -> bool:
+        """Record the hash of a key and return True if it is new or different."""
+        if self._hashes.get(key) == content_hash:
+            return False
+        self._hashes[key] = content_hash
+        return True
+
+    def discard(self, key: str) -> None:
+        """Remove a key from the index."""
+        self._hashes.pop(key, None)
+
+    def save(self) -> None:
+        """Write the index to disk atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps(self._dump(), separators=(",", ":")), encoding="utf-8"
+        )
+        os.replace(tmp_path, self.path)
+
+
+class TimestampedHashIndex(RecordHashIndex):
+    """Record hashes along with the replication key value each record had.
+
+    Used for a trailing window of records, where entries older than the start of
+    the next rescan can be pruned.
+    """
+
+    def __init__(self, path: Path):
+        """Initialize the index, loading it from `path` if the file exists."""
+        self._stamps: dict[str, str] = {}
+        super().__init__(path)
+
+    def _load(self, data: dict) -> None:
+        self._hashes = {key: entry[0] for key, entry in data.items()}
+        self._stamps = {key: entry[1] for key, entry in data.items()}
+
+    def _dump(self) -> dict:
+        return {key: [self._hashes[key], self._stamps[key]] for key in self._hashes}
+
+    def changed(self, key: str, content_hash: str, stamp: str | None = None) -> bool:
+        """Record the hash and stamp of a key and return True if it is new or different."""
+        self._stamps[key] = stamp or ""
+        return super().changed(key, content_hash)
+
+    def discard(self, key: str) -> None:
+        """Remove a key from the index."""
+        super().discard(key)
+        self._stamps.pop(key, None)
+
+    def prune(self, before: str) -> None:
+        """Remove the entries stamped earlier than `before`."""
+        for key in [key for key, stamp in self._stamps.items() if stamp < before]:
+            self.discard(key)
@@ -0,0 +1,155 @@
+"""Bounded producer/consumer queue between a parent stream and its children.
+
+The parent stream puts child contexts and bookmark updates into one FIFO as it
+emits records. Child contexts are fetched in batches on a background worker
+while the parent keeps paginating. Completed children are synced, and bookmark
+updates applied, on the caller's thread in the order they were queued. A
+bookmark therefore never advances past a record whose children are still
+outstanding. Once ``max_pending`` child contexts are outstanding, ``put_child``
+blocks until the oldest batch completes, which pauses parent pagination.
+"""
+
+from __future__ import annotations
+
+import typing as t
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+if t.TYPE_CHECKING:
+    from singer_sdk.helpers.types import Context
+
+
+DEFAULT_MAX_PENDING_CHILD_CONTEXTS = 10_000
+
+
+class _ChildEntry:
+    __slots__ = ("context", "future", "index")
+
+    def __init__(self, context: Context):
+        self.context = context
+        self.future: Future | None = None
+        self.index = 0
+
+
+class _BookmarkEntry:
+    __slots__ = ("context", "record")
+
+    def __init__(self, record: dict, context: Context | None):
+        self.record = record
+        self.context = context
+
+
+class ChildFetchQueue:
+    """FIFO of child fetches and parent bookmarks with a bound on pending children."""
+
+    def __init__(
+        self,
+        fetch_batch: t.Callable[[list[Context]], t.Sequence[t.Any]],
+        sync_child: t.Callable[[Context, t.Any], None],
+        apply_bookmark: t.Callable[[dict, Context | None], None],
+        batch_size: int,
+        max_pending: int = DEFAULT_MAX_PENDING_CHILD_CONTEXTS,
+    ):
+        """Initialize the queue.
+
+        Args:
+            fetch_batch: Called on the worker thread with a list of child contexts,
+                returns one result per context.
+            sync_child: Called on the caller's thread with a context and its result.
+            apply_bookmark: Called on the caller's thread with a queued record and
+                its parent context once every earlier child has been synced.
+            batch_size: Number of child contexts fetched per batch.
+            max_pending: Number of queued child contexts that blocks the producer.
+        """
+        self._fetch_batch = fetch_batch
+        self._sync_child = sync_child
+        self._apply_bookmark = apply_bookmark
+        self.batch_size = batch_size
+        self.max_pending = max(max_pending, batch_size)
+        self._entries: deque[_ChildEntry | _BookmarkEntry] = deque()
+        self._batch: list[_ChildEntry] = []
+        self._pending = 0
+        self._synced = 0
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def pending(self) -> int:
+        """Return the number of child contexts queued but not yet synced."""
+        return self._pending
+
+    @property
+    def synced(self) -> int:
+        """Return the number of child contexts synced since the queue was created."""
+        return self._synced
+
+    def put_child(self, context: Context) -> None:
+        """Queue a child context, blocking while the queue is full."""
+        while self._pending >= self.max_pending:
+            self._submit_batch()
+            self._drain(wait_for_head=True)
+
+        entry = _ChildEntry(context)
+        self._entries.append(entry)
+        self._batch.append(entry)
+        self._pending += 1
+        if len(self._batch) >= self.batch_size:
+            self._submit_batch()
+        self._drain()
+
+    def put_bookmark(self, record: dict, context: Context | None) -> None:
+        """Queue a bookmark update behind every child queued so far."""
+        if not self._entries:
+            self._apply_bookmark(record, context)
+            return
+        self._entries.append(_BookmarkEntry(record, context))
+
+    def join(self) -> None:
+        """Fetch and sync everything still queued."""
+        self._submit_batch()
+        while self._entries:
+            self._drain(wait_for_head=True)
+
+    def close(self) -> None:
+        """Stop the background worker."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _submit_batch(self) -> None:
+        if not self._batch:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="child-fetch"
+            )
+
+        batch, self._batch = self._batch, []
+        future = self._executor.submit(
+            self._fetch_batch, [entry.context for entry in batch]
+        )
+        for index, entry in enumerate(batch):
+            entry.future = future
+            entry.index = index
+
+    def _drain(self, *, wait_for_head: bool = False) -> None:
+        """Sync completed entries from the head of the queue.
+
+        Args:
+            wait_for_head: Block until the child entry at the head is fetched.
+        """
+        while self._entries:
+            entry = self._entries[0]
+            if isinstance(entry, _BookmarkEntry):
+                self._entries.popleft()
+                self._apply_bookmark(entry.record, entry.context)
+                continue
+
+            if entry.future is None or not (wait_for_head or entry.future.done()):
+                return
+
+            result = entry.future.result()[entry.index]
+            self._entries.popleft()
+            self._pending -= 1
+            wait_for_head = False
+            self._sync_child(entry.context, result)
+            self._synced += 1
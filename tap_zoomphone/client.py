@@ -2,56 +2,629 @@
 
 from __future__ import annotations
 
-import logging
-import sys
-from datetime import datetime, timezone
-from urllib import parse
-from dateutil.relativedelta import relativedelta
 import decimal
+import sys
+import threading
+import time
 import typing as t
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from urllib import parse
+
 if sys.version_info < (3, 12):
-    from typing_extensions import override
+    pass
 else:
-    from typing import override  # noqa: ICN003
+    pass
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from functools import cached_property
 from importlib import resources
+from pathlib import Path
 
+import requests
+import singer_sdk.singerlib as singer
+from singer_sdk import metrics
 from singer_sdk.helpers.jsonpath import extract_jsonpath
-from singer_sdk.pagination import BaseAPIPaginator, SinglePagePaginator  # noqa: TC002
+from singer_sdk.pagination import BaseAPIPaginator, SinglePagePaginator
 from singer_sdk.streams import RESTStream
 
+from tap_zoomphone import prometheus, rate_limits
+from tap_zoomphone.async_engine import DEFAULT_MAX_CONCURRENCY, AsyncRequestEngine
 from tap_zoomphone.auth import ZoomPhoneAuthenticator
-from tap_zoomphone.pagination import ZoomDateJsonPaginator
+from tap_zoomphone.cache import (
+    DEFAULT_IMMUTABILITY_HORIZON_DAYS,
+    DEFAULT_RESPONSE_CACHE_MAX_BYTES,
+    DEFAULT_RESPONSE_CACHE_TTL_DAYS,
+    CachedResponse,
+    CachedWindow,
+    WindowRecording,
+    cache_key,
+    get_response_cache,
+    pack_pages,
+    request_token,
+    unpack_pages,
+    window_end,
+)
+from tap_zoomphone.change_index import TimestampedHashIndex, record_hash
+from tap_zoomphone.decoding import (
+    DEFAULT_DECODE_MIN_BYTES,
+    expand_compact,
+    get_decode_pool,
+)
+from tap_zoomphone.dedupe import DEFAULT_BLOOM_ERROR_RATE, RecordDeduplicator
+from tap_zoomphone.integrity import (
+    STATE_KEY as WINDOW_MISMATCHES_KEY,
+)
+from tap_zoomphone.integrity import (
+    WindowIntegrity,
+    merge_mismatches,
+    request_window,
+    total_records,
+)
+from tap_zoomphone.memory import get_memory_profiler
+from tap_zoomphone.page_size import (
+    DEFAULT_MAX_BYTES as DEFAULT_PAGE_MAX_BYTES,
+)
+from tap_zoomphone.page_size import (
+    DEFAULT_TARGET_SECONDS as DEFAULT_PAGE_TARGET_SECONDS,
+)
+from tap_zoomphone.page_size import (
+    AdaptivePageSize,
+)
+from tap_zoomphone.pagination import (
+    DateRangePaginationStrategy,
+    SinglePageStrategy,
+    ZoomDateJsonPaginator,
+)
+from tap_zoomphone.quota import get_quota_ledger
+from tap_zoomphone.retry import (
+    DEFAULT_CIRCUIT_BREAKER_COOLDOWN,
+    DEFAULT_CIRCUIT_BREAKER_THRESHOLD,
+    DEFAULT_MAX_RETRY_AFTER,
+    CircuitBreaker,
+    RateLimitedError,
+    RecordNotFoundError,
+    RetryAfterTooLongError,
+    ServerError,
+    parse_retry_after,
+    retry_wait_generator,
+)
+from tap_zoomphone.session import configure_session, get_http_adapter
+from tap_zoomphone.sharding import Shard
+from tap_zoomphone.timestamps import (
+    format_timestamp,
+    is_zoom_timestamp,
+    parse_timestamp,
+    timestamp_key,
+)
+from tap_zoomphone.trace import get_trace_sink
 
 if t.TYPE_CHECKING:
-    import requests
+    from concurrent.futures import Future
+
     from singer_sdk.helpers.types import Auth, Context
 
+    from tap_zoomphone.cache import ResponseCache
+    from tap_zoomphone.decoding import DecodePool
+    from tap_zoomphone.memory import MemoryProfiler
+    from tap_zoomphone.prometheus import MetricsRegistry
+    from tap_zoomphone.quota import QuotaLedger
+    from tap_zoomphone.trace import TraceSink
+    from tap_zoomphone.users_index import UsersIndex
+
 
 SCHEMAS_DIR = resources.files(__package__) / "schemas"
 
 
 class ZoomPhoneStream(RESTStream):
     """ZoomPhone stream class."""
+
     _page_size = 100
+    #: Largest page size the stream's endpoint documents.
+    _max_page_size = 100
     _LOG_REQUEST_METRIC_URLS = True
     _history_window = None
 
+    #: Zoom rate limit category of the stream's endpoint.
+    api_category = rate_limits.MEDIUM
+
     # Update this value if necessary or override `get_new_paginator`.
     next_page_token_jsonpath = "$.next_page_token"  # noqa: S105
-    
+
     def __init__(self, *args, **kwargs):
-        """Initialize the stream with pagination strategy."""
+        """Initialize the stream, leaving pagination and pooling until first use."""
+        self._concurrent_fetch = threading.local()
+        self._session_pooled = False
+        #: Guards the state that threads fetching concurrently update.
+        self._shared_state_lock = threading.Lock()
+        #: Cached windows being replayed and windows being received, by cache key.
+        self._cached_windows: dict[str, CachedWindow] = {}
+        self._window_recordings: dict[str, WindowRecording] = {}
+        #: Number of `request_records` calls running, which may use them.
+        self._active_requests = 0
         super().__init__(*args, **kwargs)
-        self._pagination_strategy = self.get_pagination_strategy()
-    
+
+    @property
+    def requests_session(self) -> requests.Session:
+        """Return the calling thread's session.
+
+        Threads that fetched within `concurrent_fetch` keep a session of their
+        own, sending through the same connection pool as the stream's.
+        """
+        session = getattr(self._concurrent_fetch, "session", None)
+        if session is not None:
+            return session
+        session = super().requests_session
+        if not self._session_pooled:
+            configure_session(session, get_http_adapter(self.config))
+            self._session_pooled = True
+        return session
+
+    @cached_property
+    def _pagination_strategy(self):
+        """Return the strategy built by `get_pagination_strategy`."""
+        return self.get_pagination_strategy()
+
     def get_pagination_strategy(self):
         """Return the default pagination strategy for this stream.
-        
+
         Subclasses should override this method to provide their specific strategy.
         """
         from tap_zoomphone.pagination import TokenPaginationStrategy
-        return TokenPaginationStrategy(page_size=self._page_size)
+
+        return TokenPaginationStrategy(page_size=self.page_size)
+
+    @cached_property
+    def page_size(self) -> int | None:
+        """Return the page size set in ``page_sizes``, capped at the endpoint's maximum.
+
+        Streams that request a single page have no page size.
+        """
+        if self._page_size is None:
+            return None
+        page_size = (self.config.get("page_sizes") or {}).get(self.name)
+        if page_size is None:
+            return self._page_size
+        if page_size > self._max_page_size:
+            self.logger.warning(
+                "Page size %d of %s exceeds the endpoint's maximum, using %d",
+                page_size,
+                self.name,
+                self._max_page_size,
+            )
+            return self._max_page_size
+        return page_size
+
+    @cached_property
+    def page_sizer(self) -> AdaptivePageSize | None:
+        """Return the adaptive page size, if ``adaptive_page_size`` is enabled."""
+        if not self.config.get("adaptive_page_size") or self.page_size is None:
+            return None
+        return AdaptivePageSize(
+            self.page_size,
+            self._max_page_size,
+            target_seconds=self.config.get(
+                "adaptive_page_size_target_seconds", DEFAULT_PAGE_TARGET_SECONDS
+            ),
+            max_bytes=self.config.get(
+                "adaptive_page_size_max_bytes", DEFAULT_PAGE_MAX_BYTES
+            ),
+        )
+
+    def adapt_page_size(self, response: requests.Response, record_count: int) -> None:
+        """Adjust the page size after a page, for the next token chain."""
+        page_sizer = self.page_sizer
+        url = response.request.url
+        if page_sizer is None or not url:
+            return
+        requested = parse.parse_qs(parse.urlsplit(url).query).get("page_size")
+        if not requested:
+            return
+        with self._shared_state_lock:
+            changed = page_sizer.observe(
+                int(requested[0]),
+                response.elapsed.total_seconds(),
+                len(response.content),
+                record_count,
+            )
+            if changed:
+                self._set_page_size(page_sizer.size)
+
+    def _set_page_size(self, size: int) -> None:
+        """Hand the adapted size to the strategy (called holding the state lock)."""
+        self.logger.info("Page size of %s is now %d", self.name, size)
+        self._pagination_strategy.page_size = size
+
+    @property
+    def has_date_windows(self) -> bool:
+        """Return True if the stream pages through date windows."""
+        return isinstance(self._pagination_strategy, DateRangePaginationStrategy)
+
+    def iter_windows(self, context: Context | None) -> t.Iterator[tuple[str, str]]:
+        """Yield the (from, to) bounds of every date window a sync would request.
+
+        Streams without date windows yield nothing.
+        """
+        if self.has_date_windows:
+            yield from self._pagination_strategy.iter_windows(context)
+
+    def request_window_sample(
+        self,
+        context: Context | None,
+        window_from: str,
+        window_to: str,
+    ) -> requests.Response:
+        """Request the first record of a date window, with the usual retries.
+
+        The response carries the window's ``total_records`` and ``page_count``.
+        It is sent straight through the session, so the probe is neither cached
+        nor counted towards the window's records.
+        """
+        prepared_request = self.build_prepared_request(
+            method="GET",
+            url=self.get_url(context),
+            params={"page_size": 1, "from": window_from, "to": window_to},
+            headers=self.http_headers,
+            auth=self.authenticator,
+        )
+
+        def send(
+            prepared_request: requests.PreparedRequest,
+            context: Context | None,  # noqa: ARG001
+        ) -> requests.Response:
+            response = self.requests_session.send(
+                prepared_request,
+                timeout=self.timeout,
+                allow_redirects=self.allow_redirects,
+            )
+            self.validate_response(response)
+            return response
+
+        return self.request_decorator(send)(prepared_request, context)
+
+    @cached_property
+    def shard(self) -> Shard | None:
+        """Return the date-range shard this run is limited to, if any."""
+        shard = self.config.get("shard")
+        return Shard.parse(shard) if shard else None
+
+    @cached_property
+    def window_filter(self) -> t.Callable[[datetime], bool] | None:
+        """Return the filter selecting which date windows are requested, if any.
+
+        Combines the shard set with ``shard``, the windows of the plan set with
+        ``backfill_plan`` and, in repair mode, the months of the windows recorded
+        as incomplete; a window is requested only if all of them accept it.
+        """
+        filters = []
+        if self.repair_partitions is not None:
+            months = {
+                (window_from.year, window_from.month)
+                for window_from in (
+                    parse_timestamp(entry["from"])
+                    for _, mismatches in self.repair_partitions
+                    for entry in mismatches
+                )
+            }
+            filters.append(
+                lambda window_start: (window_start.year, window_start.month) in months
+            )
+        if self.shard is not None:
+            filters.append(self.shard.owns_window)
+        if self.config.get("backfill_plan"):
+            from tap_zoomphone.planner import BackfillPlan
+
+            plan_filter = BackfillPlan.load(self.config["backfill_plan"]).window_filter(
+                self.name
+            )
+            if plan_filter is not None:
+                filters.append(plan_filter)
+
+        if not filters:
+            return None
+        if len(filters) == 1:
+            return filters[0]
+        return lambda window_start: all(f(window_start) for f in filters)
+
+    def refresh_window_filter(self) -> None:
+        """Select the date windows to request again, from the state loaded now.
+
+        Streams are built before the tap loads its state, so the windows to
+        repair are only known once a sync starts.
+        """
+        self.__dict__.pop("repair_partitions", None)
+        self.__dict__.pop("window_filter", None)
+        if self.has_date_windows:
+            self._pagination_strategy.window_filter = self.window_filter
+
+    @cached_property
+    def repair_partitions(self) -> list[tuple[Context | None, list[dict]]] | None:
+        """Return each context with windows to re-fetch in repair mode, else None.
+
+        Enabled with ``repair_windows``. The windows are read from the state
+        written by earlier runs: the stream's own state, or that of each state
+        partition, such as a user, that belongs to this run's shard.
+        """
+        if not self.config.get("repair_windows") or self._history_window is None:
+            return None
+        state = self.stream_state
+        if "partitions" in state:
+            entries = [(entry.get("context"), entry) for entry in state["partitions"]]
+        else:
+            entries = [(None, state)]
+        shard_context = self.shard.context if self.shard is not None else {}
+        return [
+            (context, list(entry[WINDOW_MISMATCHES_KEY]))
+            for context, entry in entries
+            if entry.get(WINDOW_MISMATCHES_KEY)
+            and shard_context.items() <= (context or {}).items()
+        ]
+
+    def repair_mismatches(self, context: Context | None) -> list[dict]:
+        """Return the incomplete windows to re-fetch for a context in repair mode."""
+        for partition_context, mismatches in self.repair_partitions or []:
+            if (partition_context or None) == (context or None):
+                return mismatches
+        return []
+
+    @cached_property
+    def window_integrity(self) -> dict[str, WindowIntegrity] | None:
+        """Return the per-window record tallies of a date-range stream, if verified.
+
+        Tallies are kept per endpoint path, so partitions requesting the same
+        windows from different endpoints are verified separately.
+        """
+        if self._history_window is None or not self.config.get("verify_windows", True):
+            return None
+        return defaultdict(WindowIntegrity)
+
+    @cached_property
+    def trace_sink(self) -> TraceSink | None:
+        """Return the request trace log, or None without ``trace_file``."""
+        path = self.config.get("trace_file")
+        if not path:
+            return None
+        return get_trace_sink(path)
+
+    def trace_failure(
+        self,
+        prepared_request: requests.PreparedRequest,
+        exc: Exception,
+        latency: float,
+    ) -> None:
+        """Write a failed request attempt to the trace log, if enabled."""
+        if self.trace_sink is None:
+            return
+        response = getattr(exc, "response", None)
+        self.trace_sink.request(
+            self.name,
+            prepared_request.url,
+            status=response.status_code if response is not None else None,
+            latency=latency,
+            size=len(response.content) if response is not None else None,
+            error=type(exc).__name__,
+        )
+
+    @cached_property
+    def metrics_registry(self) -> MetricsRegistry | None:
+        """Return the Prometheus metrics shared by all streams, if exported."""
+        return prometheus.get_metrics_registry(self.config)
+
+    def record_request_metrics(
+        self,
+        response: requests.Response | None,
+        latency: float,
+    ) -> None:
+        """Publish the latency and rate limit headroom of a request attempt."""
+        if self.metrics_registry is None:
+            return
+        self.metrics_registry.observe(
+            prometheus.REQUEST_DURATION, {"stream": self.name}, latency
+        )
+        reused = getattr(response, "connection_reused", None)
+        if reused is not None:
+            self.metrics_registry.inc(
+                prometheus.HTTP_RESPONSES,
+                {
+                    "stream": self.name,
+                    "connection": "reused" if reused else "new",
+                    "encoding": response.headers.get("Content-Encoding", "identity"),
+                },
+            )
+        remaining = (
+            response.headers.get("X-RateLimit-Remaining")
+            if response is not None
+            else None
+        )
+        if remaining is not None:
+            self.metrics_registry.set(
+                prometheus.RATE_LIMIT_REMAINING,
+                {
+                    "category": self.api_category,
+                    "type": response.headers.get("X-RateLimit-Type", ""),
+                },
+                float(remaining),
+            )
+
+    def backoff_handler(self, details: dict) -> None:
+        """Log the backoff and count the retry by its cause."""
+        super().backoff_handler(details)
+        if self.metrics_registry is not None:
+            exc = details.get("exception")
+            self.metrics_registry.inc(
+                prometheus.RETRIES,
+                {
+                    "stream": self.name,
+                    "reason": type(exc).__name__ if exc else "unknown",
+                },
+            )
+
+    @cached_property
+    def memory_profiler(self) -> MemoryProfiler | None:
+        """Return the tracemalloc profiler shared by all streams, if enabled."""
+        return get_memory_profiler(self.config)
+
+    def _sync_records(
+        self,
+        context: Context | None = None,
+        *,
+        write_messages: bool = True,
+    ) -> t.Generator[dict, t.Any, t.Any]:
+        """Sync records, measuring the memory the sync retains when profiling.
+
+        A top-level sync first selects its date windows from the loaded state,
+        and writes the lookback index once all of its partitions are synced.
+        """
+        if self.parent_stream_type is None:
+            self.refresh_window_filter()
+        try:
+            if self.memory_profiler is None:
+                yield from super()._sync_records(context, write_messages=write_messages)
+                return
+            with self.memory_profiler.measure(self.name):
+                yield from super()._sync_records(context, write_messages=write_messages)
+        finally:
+            if self.parent_stream_type is None:
+                self._save_lookback_index()
+
+    def _write_record_message(self, record: dict) -> None:
+        """Write a RECORD message and count it."""
+        super()._write_record_message(record)
+        if self.metrics_registry is not None:
+            self.metrics_registry.inc(prometheus.RECORDS, {"stream": self.name})
+
+    def _write_request_duration_log(
+        self,
+        endpoint: str,
+        response: requests.Response,
+        context: Context | None,
+        extra_tags: dict | None,
+    ) -> None:
+        """Tag the request metric with whether the request reused a connection."""
+        reused = getattr(response, "connection_reused", None)
+        if reused is not None:
+            extra_tags = {**(extra_tags or {}), "connection_reused": reused}
+        super()._write_request_duration_log(endpoint, response, context, extra_tags)
+
+    def _write_state_message(self) -> None:
+        """Write the quota ledger's pending counts along with a STATE message."""
+        if self.quota_ledger is not None:
+            self.quota_ledger.flush()
+        super()._write_state_message()
+
+    def _write_activate_version_message(self, full_table_version: int) -> None:
+        """Write an ACTIVATE_VERSION message through the tap's writer.
+
+        The SDK writes it straight to stdout, ahead of any buffered records.
+        """
+        self._tap.write_message(
+            singer.ActivateVersionMessage(stream=self.name, version=full_table_version)
+        )
+
+    def observe_page(self, response: requests.Response, record_count: int) -> None:
+        """Trace a parsed page and add its records to its window's tally."""
+        url = response.request.url if response.request is not None else None
+        if not url:
+            return
+        if self.trace_sink is not None:
+            self.trace_sink.request(
+                self.name,
+                url,
+                status=response.status_code,
+                latency=response.elapsed.total_seconds(),
+                size=len(response.content),
+                records=record_count,
+                cached=getattr(response, "from_cache", False),
+                content=response.content,
+            )
+        if self.page_sizer is not None and not getattr(response, "from_cache", False):
+            self.adapt_page_size(response, record_count)
+        window_integrity = self.window_integrity
+        if window_integrity is None and self.metrics_registry is None:
+            return
+        window = request_window(url)
+        if window is not None and self.metrics_registry is not None:
+            self.metrics_registry.set(
+                prometheus.WINDOW_START,
+                {"stream": self.name},
+                parse_timestamp(window[0]).timestamp(),
+            )
+        if window is not None and window_integrity is not None:
+            path = parse.urlsplit(url).path
+            with self._shared_state_lock:
+                window_integrity[path].observe(
+                    window, total_records(response.content), record_count
+                )
+
+    def _record_window_mismatches(self, context: Context | None) -> None:
+        """Store the windows whose record count differed from ``total_records``."""
+        if self.window_integrity is None:
+            return
+        path = parse.urlsplit(self.get_url(context)).path
+        with self._shared_state_lock:
+            integrity = self.window_integrity.pop(path, None) or WindowIntegrity()
+        state = self.get_context_state(context)
+        mismatches = merge_mismatches(state.get(WINDOW_MISMATCHES_KEY, []), integrity)
+        for entry in integrity.mismatches():
+            self.logger.warning(
+                "Window %s to %s of %s returned %d records, expected %d",
+                entry["from"],
+                entry["to"],
+                self.name,
+                entry["received"],
+                entry["expected"],
+            )
+        if mismatches:
+            state[WINDOW_MISMATCHES_KEY] = mismatches
+        else:
+            state.pop(WINDOW_MISMATCHES_KEY, None)
+
+    #: Cached properties that only hold for one sync and are reset between polls.
+    _per_sync_properties: t.ClassVar[tuple[str, ...]] = (
+        "deduplicator",
+        "repair_partitions",
+        "users_index",
+        "window_filter",
+        "window_integrity",
+    )
+
+    def start_poll(self) -> None:
+        """Reset what is only valid for one sync before the daemon syncs again.
+
+        Without this a record updated since the last poll would be dropped as a
+        duplicate of the copy emitted then.
+        """
+        for name in self._per_sync_properties:
+            self.__dict__.pop(name, None)
+
+    @property
+    def partitions(self) -> list[dict] | None:
+        """Keep the bookmarks of a sharded date-range stream in a shard partition."""
+        if self.shard is not None and self._history_window is not None:
+            return [self.shard.context]
+        return super().partitions
+
+    def _process_record(
+        self,
+        record: dict,
+        child_context: Context | None = None,
+        partition_context: Context | None = None,
+    ) -> None:
+        """Process a record, copying only partition keys of the schema onto it.
+
+        The SDK adds the partition context to every record, but keys such as
+        ``shard`` or ``user_id`` only name the state partition.
+        """
+        if partition_context:
+            properties = self.schema["properties"]
+            partition_context = {
+                key: value
+                for key, value in partition_context.items()
+                if key in properties
+            }
+        super()._process_record(
+            record, child_context=child_context, partition_context=partition_context
+        )
 
     @property
     def url_base(self) -> str:
@@ -68,7 +641,7 @@ class ZoomPhoneStream(RESTStream):
         return ZoomPhoneAuthenticator(
             client_id=self.config["client_id"],
             client_secret=self.config["client_secret"],
-            account_id=self.config["account_id"]
+            account_id=self.config["account_id"],
         )
 
     @property
@@ -93,20 +666,657 @@ class ZoomPhoneStream(RESTStream):
         Returns:
             A pagination helper instance.
         """
-        
         return ZoomDateJsonPaginator(
-            self.next_page_token_jsonpath, 
-            self.logger,
-            self._pagination_strategy
+            self.next_page_token_jsonpath, self.logger, self._pagination_strategy
         )
 
-    def get_url_params(
+    @cached_property
+    def http_engine(self) -> AsyncRequestEngine | None:
+        """Return the asyncio request engine, or None for the default requests loop.
+
+        Enabled with the ``http_engine: async`` setting.
+        """
+        if self.config.get("http_engine", "requests") != "async":
+            return None
+
+        return AsyncRequestEngine(
+            self,
+            max_concurrency=self.config.get(
+                "max_concurrent_requests", DEFAULT_MAX_CONCURRENCY
+            ),
+        )
+
+    def close_http_engine(self) -> None:
+        """Close the stream's async engine and page prefetch worker, if opened.
+
+        A closed engine opens a new event loop and client when used again.
+        """
+        engine = self.__dict__.get("http_engine")
+        if engine is not None:
+            engine.close()
+        if "prefetch_executor" in self.__dict__:
+            self.__dict__.pop("prefetch_executor").shutdown()
+
+    @cached_property
+    def decode_pool(self) -> DecodePool | None:
+        """Return the shared JSON decode process pool, or None when disabled.
+
+        Enabled by setting ``decode_workers`` to a positive number of processes.
+        """
+        workers = self.config.get("decode_workers", 0)
+        if not workers:
+            return None
+        return get_decode_pool(
+            workers,
+            min_bytes=self.config.get("decode_min_bytes", DEFAULT_DECODE_MIN_BYTES),
+        )
+
+    @contextmanager
+    def concurrent_fetch(self) -> t.Iterator[None]:
+        """Mark the calling thread's requests as one of several pages in flight.
+
+        The thread sends them through a session of its own, and large bodies
+        they receive are handed to the decode pool on arrival.
+        """
+        if getattr(self._concurrent_fetch, "session", None) is None:
+            session = requests.Session()
+            configure_session(session, get_http_adapter(self.config))
+            self._concurrent_fetch.session = session
+        self._concurrent_fetch.active = True
+        try:
+            yield
+        finally:
+            self._concurrent_fetch.active = False
+
+    def start_decode(self, response: requests.Response) -> None:
+        """Start decoding a large body in the decode pool, for `parse_response`.
+
+        Only bodies received within `concurrent_fetch` are offloaded: a page
+        fetched on its own would just wait for the worker process.
+        """
+        if (
+            self.decode_pool is not None
+            and getattr(self._concurrent_fetch, "active", False)
+            and self.decode_pool.should_offload(response.content)
+        ):
+            response.decoded = self.decode_pool.submit(
+                response.content, self.records_jsonpath
+            )
+
+    @cached_property
+    def quota_ledger(self) -> QuotaLedger | None:
+        """Return the persistent daily quota ledger, or None without ``state_dir``."""
+        state_dir = self.config.get("state_dir")
+        if not state_dir:
+            return None
+        return get_quota_ledger(state_dir, self.config)
+
+    def calculate_sync_cost(
         self,
+        request: requests.PreparedRequest,  # noqa: ARG002
+        response: requests.Response,
         context: Context | None,  # noqa: ARG002
+    ) -> dict[str, int]:
+        """Count every request sent to Zoom against the stream's rate limit category."""
+        return {self.api_category: 0 if getattr(response, "from_cache", False) else 1}
+
+    def update_sync_costs(
+        self,
+        request: requests.PreparedRequest,
+        response: requests.Response,
+        context: Context | None,
+    ) -> dict[str, int]:
+        """Update the sync costs and record the request in the quota ledger."""
+        with self._shared_state_lock:
+            costs = super().update_sync_costs(request, response, context)
+        if self.quota_ledger is not None and not getattr(response, "from_cache", False):
+            self.quota_ledger.spend(self.api_category)
+            remaining = response.headers.get("X-RateLimit-Remaining")
+            limit_type = response.headers.get("X-RateLimit-Type", "")
+            if remaining is not None and "daily" in limit_type.lower():
+                self.quota_ledger.observe_remaining(self.api_category, int(remaining))
+        return costs
+
+    @cached_property
+    def deduplicator(self) -> RecordDeduplicator | None:
+        """Return the duplicate filter of a top-level stream, or None when disabled."""
+        if (
+            not self.config.get("dedupe_records", False)
+            or not self.primary_keys
+            or self.parent_stream_type is not None
+        ):
+            return None
+        return RecordDeduplicator(
+            self.primary_keys,
+            window_key=self.replication_key,
+            bloom_capacity=self.config.get("dedupe_bloom_capacity", 0),
+            bloom_error_rate=self.config.get(
+                "dedupe_bloom_error_rate", DEFAULT_BLOOM_ERROR_RATE
+            ),
+        )
+
+    @cached_property
+    def users_index(self) -> UsersIndex | None:
+        """Return the index participants are enriched from, if ``enrich_participants`` is set."""
+        if not self.config.get("enrich_participants"):
+            return None
+        return self._tap.streams["users"].get_users_index()
+
+    @property
+    def lookback(self) -> timedelta | None:
+        """Return how far a date-range stream rescans before its bookmark, if at all."""
+        hours = self.config.get("lookback_hours", 0)
+        if not hours or self._history_window is None:
+            return None
+        return timedelta(hours=hours)
+
+    def _increment_stream_state(
+        self,
+        latest_record: dict,
+        *,
+        context: Context | None = None,
+    ) -> None:
+        """Update the bookmark, except while repairing windows before it.
+
+        The SDK compares replication key values as strings, so values in any
+        other shape than Zoom's own are normalized first.
+        """
+        if self.repair_partitions is not None:
+            return
+        value = (
+            latest_record.get(self.replication_key) if self.replication_key else None
+        )
+        if value and not is_zoom_timestamp(value):
+            latest_record = {
+                **latest_record,
+                self.replication_key: timestamp_key(value),
+            }
+        super()._increment_stream_state(latest_record, context=context)
+
+    def _parse_datetime(self, value: str) -> datetime:
+        """Parse a replication key value or start date, with caching."""
+        return parse_timestamp(value)
+
+    def get_starting_timestamp(self, context: Context | None) -> datetime | None:
+        """Return the starting timestamp, rewound by ``lookback_hours`` from a bookmark.
+
+        In repair mode this is the start of the earliest incomplete window.
+        """
+        mismatches = self.repair_mismatches(context)
+        if mismatches:
+            return min(parse_timestamp(entry["from"]) for entry in mismatches)
+
+        start = super().get_starting_timestamp(context)
+        if (
+            start is not None
+            and self.lookback is not None
+            and self.get_context_state(context).get("replication_key_value")
+        ):
+            return start - self.lookback
+        return start
+
+    @cached_property
+    def lookback_index(self) -> TimestampedHashIndex | None:
+        """Return the hashes of recently emitted records, used to skip unchanged ones."""
+        state_dir = self.config.get("state_dir")
+        if self.lookback is None or not state_dir:
+            return None
+        return TimestampedHashIndex(
+            Path(state_dir) / f"{self.name}_lookback_index.json"
+        )
+
+    def get_records(self, context: Context | None) -> t.Iterable[dict]:
+        """Return records, dropping duplicates and unchanged lookback records.
+
+        Dropping them here also avoids syncing their child streams again.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            Each record that is new or changed.
+        """
+        if self.repair_partitions is not None and not self.repair_mismatches(context):
+            self.logger.info("No incomplete %s windows to repair", self.name)
+            return
+
+        records = super().get_records(context)
+        if self.deduplicator is not None:
+            records = self._drop_duplicates(records)
+        if self.lookback_index is not None:
+            records = self._drop_unchanged(records, context)
+        yield from records
+
+        if self.window_integrity is not None:
+            self._record_window_mismatches(context)
+
+    def _drop_duplicates(self, records: t.Iterable[dict]) -> t.Iterable[dict]:
+        deduplicator = self.deduplicator
+        if deduplicator is None:
+            yield from records
+            return
+        for record in records:
+            if not deduplicator.is_duplicate(record):
+                yield record
+        if deduplicator.duplicates:
+            self.logger.info(
+                "Dropped %d duplicate %s records so far",
+                deduplicator.duplicates,
+                self.name,
+            )
+
+    def _drop_unchanged(
+        self,
+        records: t.Iterable[dict],
+        context: Context | None,
+    ) -> t.Iterable[dict]:
+        """Skip records emitted by an earlier run with identical content.
+
+        Hashes are kept for records from the trailing lookback period, the only
+        ones a later run rescans, but not before ``start_date``. The index is
+        pruned and written once the stream's sync ends, by
+        `_save_lookback_index`.
+        """
+        index, lookback = self.lookback_index, self.lookback
+        if index is None or lookback is None:
+            yield from records
+            return
+        bookmark = self.get_context_state(context).get("replication_key_value")
+        index_from = datetime.now(timezone.utc) - lookback
+        if bookmark:
+            index_from = min(index_from, parse_timestamp(bookmark) - lookback)
+        start_date = self.config.get("start_date")
+        if start_date:
+            index_from = max(index_from, parse_timestamp(start_date))
+        index_from_value = format_timestamp(index_from)
+
+        unchanged = 0
+        for record in records:
+            stamp = record.get(self.replication_key)
+            stamp = timestamp_key(stamp) if stamp else ""
+            if stamp >= index_from_value:
+                key = "\x1f".join(str(record.get(name)) for name in self.primary_keys)
+                if not index.changed(key, record_hash(record), stamp):
+                    unchanged += 1
+                    continue
+            yield record
+
+        if unchanged:
+            self.logger.info(
+                "Skipped %d unchanged %s records in the lookback window",
+                unchanged,
+                self.name,
+            )
+
+    def _save_lookback_index(self) -> None:
+        """Prune the lookback index against the oldest bookmark and write it.
+
+        Each partition rescans from its own bookmark, so hashes are kept back to
+        the lookback before the oldest one, and all of them while a partition
+        has no bookmark yet.
+        """
+        index = self.__dict__.get("lookback_index")
+        lookback = self.lookback
+        if index is None or lookback is None:
+            return
+        state = self.stream_state
+        bookmarks = [
+            partition.get("replication_key_value")
+            for partition in state.get("partitions") or [state]
+        ]
+        if all(bookmarks):
+            oldest = min(parse_timestamp(bookmark) for bookmark in bookmarks)
+            index.prune(format_timestamp(oldest - lookback))
+        index.save()
+
+    def request_records(self, context: Context | None) -> t.Iterable[dict]:
+        """Request records, routing through the asyncio engine when enabled.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            An item for every record in the response.
+        """
+        with self.window_replay_scope():
+            if self.http_engine is not None:
+                yield from self.http_engine.request_records(context)
+            elif self.prefetches_pages:
+                yield from self._request_records_prefetched(context)
+            else:
+                yield from super().request_records(context)
+
+    @contextmanager
+    def window_replay_scope(self) -> t.Iterator[None]:
+        """Forget windows partly replayed from or recorded for the response cache.
+
+        A request loop that stops midway, on an error or because its consumer
+        stopped, leaves its window behind; without this a later sync of the same
+        window would resume the replay where it stopped. Windows are forgotten
+        before the first and after the last of any concurrent calls, such as
+        user partition workers, so none of them loses a window in progress.
+        """
+        with self._shared_state_lock:
+            if not self._active_requests:
+                self._forget_windows()
+            self._active_requests += 1
+        try:
+            yield
+        finally:
+            with self._shared_state_lock:
+                self._active_requests -= 1
+                if not self._active_requests:
+                    self._forget_windows()
+
+    def _forget_windows(self) -> None:
+        """Drop replayed and recorded windows (called holding the lock)."""
+        self._cached_windows.clear()
+        self._window_recordings.clear()
+
+    @property
+    def prefetches_pages(self) -> bool:
+        """Return True if the next page is fetched while the current one is processed.
+
+        Enabled with ``page_prefetch`` for paginated top-level streams. Child
+        streams request one page per parent record, and threads already
+        fetching concurrently, such as user partition workers, have no page to
+        overlap with.
+        """
+        return (
+            self.config.get("page_prefetch", False)
+            and self.parent_stream_type is None
+            and not isinstance(self._pagination_strategy, SinglePageStrategy)
+            and not getattr(self._concurrent_fetch, "active", False)
+        )
+
+    @cached_property
+    def prefetch_executor(self) -> ThreadPoolExecutor:
+        """Return the worker sending the stream's prefetched page requests.
+
+        One worker is kept for the life of the stream, so its session and the
+        connections it holds are reused from one window or sync to the next.
+        """
+        return ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"{self.name}-prefetch"
+        )
+
+    def _request_records_prefetched(self, context: Context | None) -> t.Iterable[dict]:
+        """Request records, sending the next page while the current one is processed.
+
+        As soon as a response arrives the paginator is advanced and the request
+        for the next page is handed to a single background worker. The records
+        of the current page are then yielded while that request is in flight, so
+        at most one page is being processed and one is being fetched at a time.
+        The request is sent by the stream's `prefetch_executor`.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            An item for every record in the response.
+        """
+        paginator = self.get_new_paginator() or SinglePagePaginator()
+        decorated_request = self.request_decorator(self._request)
+
+        def fetch(prepared_request: requests.PreparedRequest) -> requests.Response:
+            with self.concurrent_fetch():
+                return decorated_request(prepared_request, context)
+
+        executor = self.prefetch_executor
+        with metrics.http_request_counter(self.name, self.path) as request_counter:
+            request_counter.context = context
+            prepared_request = self.prepare_request(
+                context, next_page_token=paginator.current_value
+            )
+            pending: Future[requests.Response] | None = executor.submit(
+                fetch, prepared_request
+            )
+
+            while pending is not None:
+                resp = pending.result()
+                request_counter.increment()
+                self.update_sync_costs(prepared_request, resp, context)
+                paginator.advance(resp)
+
+                pending = None
+                if not paginator.finished:
+                    prepared_request = self.prepare_request(
+                        context, next_page_token=paginator.current_value
+                    )
+                    pending = executor.submit(fetch, prepared_request)
+
+                yield from self.parse_response(resp)
+
+    @cached_property
+    def response_cache(self) -> ResponseCache | None:
+        """Return the on-disk response cache, or None without ``response_cache_dir``."""
+        directory = self.config.get("response_cache_dir")
+        if not directory:
+            return None
+        return get_response_cache(
+            directory,
+            max_bytes=self.config.get(
+                "response_cache_max_bytes", DEFAULT_RESPONSE_CACHE_MAX_BYTES
+            ),
+            ttl_days=self.config.get(
+                "response_cache_ttl_days", DEFAULT_RESPONSE_CACHE_TTL_DAYS
+            ),
+        )
+
+    def _response_cache_key(
+        self, prepared_request: requests.PreparedRequest
+    ) -> str | None:
+        """Return the cache key of a request for an immutable window, or None."""
+        url = prepared_request.url
+        if self.response_cache is None or not url or not prepared_request.method:
+            return None
+        to = window_end(url)
+        if to is None:
+            return None
+        horizon = datetime.now(timezone.utc) - timedelta(
+            days=self.config.get(
+                "immutability_horizon_days", DEFAULT_IMMUTABILITY_HORIZON_DAYS
+            )
+        )
+        if parse_timestamp(to) > horizon:
+            return None
+        account = self.config.get("account_id") or self.config["client_id"]
+        return cache_key(prepared_request.method, url, account)
+
+    def cached_response(
+        self, prepared_request: requests.PreparedRequest
+    ) -> requests.Response | None:
+        """Return the cached response of a request, or None on a miss.
+
+        The first page of a window loads the window's entry; later pages are
+        only served from a window loaded that way. The response is a
+        ``CachedResponse`` so it is not counted against quotas.
+        """
+        key = self._response_cache_key(prepared_request)
+        cache, url = self.response_cache, prepared_request.url
+        if key is None or cache is None or not url:
+            return None
+        window: CachedWindow | None
+        token = request_token(url)
+        if token is None:
+            entry = cache.get(key)
+            if entry is None:
+                return None
+            window = CachedWindow(unpack_pages(entry))
+            with self._shared_state_lock:
+                self._cached_windows[key] = window
+        else:
+            with self._shared_state_lock:
+                window = self._cached_windows.get(key)
+            if window is None:
+                return None
+        page = window.page(token)
+        if page is None:
+            return None
+        content, last = page
+        if last:
+            with self._shared_state_lock:
+                self._cached_windows.pop(key, None)
+
+        response = CachedResponse()
+        response.status_code = 200
+        response._content = content  # noqa: SLF001
+        response.headers["Content-Type"] = "application/json"
+        response.url = url
+        response.request = prepared_request
+        return response
+
+    def store_response(
+        self,
+        prepared_request: requests.PreparedRequest,
+        response: requests.Response,
+    ) -> None:
+        """Record a page of an immutable window, caching the window once complete."""
+        if response.status_code != 200:  # noqa: PLR2004
+            return
+        key = self._response_cache_key(prepared_request)
+        cache, url = self.response_cache, prepared_request.url
+        if key is None or cache is None or not url:
+            return
+        token = request_token(url)
+        with self._shared_state_lock:
+            if token is None:
+                self._window_recordings[key] = WindowRecording()
+            recording = self._window_recordings.get(key)
+            if recording is None:
+                return
+            if not recording.add(token, response.content) or recording.complete:
+                del self._window_recordings[key]
+            if not recording.complete:
+                return
+        cache.put(key, pack_pages(recording.pages))
+
+    @cached_property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """Return the circuit breaker guarding this stream's endpoint."""
+        return CircuitBreaker(
+            threshold=self.config.get(
+                "circuit_breaker_threshold", DEFAULT_CIRCUIT_BREAKER_THRESHOLD
+            ),
+            cooldown=self.config.get(
+                "circuit_breaker_cooldown", DEFAULT_CIRCUIT_BREAKER_COOLDOWN
+            ),
+        )
+
+    @property
+    def skip_missing_records(self) -> bool:
+        """Return True if a 404 means the requested record was deleted.
+
+        This is the case for child streams, whose records are requested by the
+        id of a parent record that may have been deleted since it was listed.
+        """
+        return self.parent_stream_type is not None
+
+    def validate_response(self, response: requests.Response) -> None:
+        """Classify error responses so each kind is retried appropriately.
+
+        Raises:
+            RateLimitedError: On a 429, carrying the ``Retry-After`` wait.
+            RetryAfterTooLongError: On a 429 asking for more than ``max_retry_after``.
+            ServerError: On a 5xx.
+            RecordNotFoundError: On a 404 for a record that may be skipped.
+        """
+        status = response.status_code
+        if status == 429:  # noqa: PLR2004
+            msg = self.response_error_message(response)
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            max_retry_after = self.config.get(
+                "max_retry_after", DEFAULT_MAX_RETRY_AFTER
+            )
+            if retry_after is not None and retry_after > max_retry_after:
+                raise RetryAfterTooLongError(msg)
+            raise RateLimitedError(msg, response, retry_after=retry_after)
+        if status >= 500:  # noqa: PLR2004
+            raise ServerError(self.response_error_message(response), response)
+        if status == 404 and self.skip_missing_records:  # noqa: PLR2004
+            raise RecordNotFoundError(self.response_error_message(response))
+        super().validate_response(response)
+
+    def backoff_wait_generator(self) -> t.Generator[float, t.Any, None]:
+        """Wait for ``Retry-After`` on 429s and back off exponentially otherwise."""
+        return retry_wait_generator()
+
+    def backoff_jitter(self, value: float) -> float:
+        """Return the wait unchanged, `retry_wait_generator` already adds jitter."""
+        return value
+
+    def record_request_failure(self) -> None:
+        """Count a server error against the endpoint's circuit breaker."""
+        if self.circuit_breaker.record_failure():
+            self.logger.warning(
+                "Error rate of %s is too high, pausing requests for %s seconds",
+                self.name,
+                self.circuit_breaker.cooldown,
+            )
+
+    def _request(
+        self,
+        prepared_request: requests.PreparedRequest,
+        context: Context | None,
+    ) -> requests.Response:
+        """Send a request once the circuit breaker allows it and record the outcome.
+
+        Requests for immutable windows are answered from the response cache when
+        it holds them.
+        """
+        cached = self.cached_response(prepared_request)
+        if cached is not None:
+            self.start_decode(cached)
+            return cached
+
+        delay = self.circuit_breaker.delay()
+        if delay:
+            time.sleep(delay)
+        if self.metrics_registry is not None:
+            self.metrics_registry.inc(prometheus.IN_FLIGHT, {"stream": self.name})
+        started = time.perf_counter()
+        try:
+            response = super()._request(prepared_request, context)
+        except Exception as exc:
+            if isinstance(
+                exc,
+                (
+                    ServerError,
+                    requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout,
+                ),
+            ):
+                self.record_request_failure()
+            if (
+                isinstance(exc, requests.exceptions.Timeout)
+                and self.page_sizer is not None
+            ):
+                with self._shared_state_lock:
+                    if self.page_sizer.shrink():
+                        self._set_page_size(self.page_sizer.size)
+            latency = time.perf_counter() - started
+            self.trace_failure(prepared_request, exc, latency)
+            self.record_request_metrics(getattr(exc, "response", None), latency)
+            raise
+        else:
+            self.record_request_metrics(response, time.perf_counter() - started)
+        finally:
+            if self.metrics_registry is not None:
+                self.metrics_registry.inc(
+                    prometheus.IN_FLIGHT, {"stream": self.name}, -1
+                )
+        self.circuit_breaker.record_success()
+        self.store_response(prepared_request, response)
+        self.start_decode(response)
+        return response
+
+    def get_url_params(
+        self,
+        context: Context | None,
         next_page_token: t.Any | None,  # noqa: ANN401
     ) -> dict[str, t.Any]:
         """Returns query params for Zoom API supporting differing pagination
-        
+
             - Next Page Token (UsersStream)
             - Next Page Token and Incremental From/To dates (SmsSessions, CallHistory)
                 - Call History endpoint returns page count in body and returns a next page token when there isn't any more pages
@@ -120,7 +1330,7 @@ class ZoomPhoneStream(RESTStream):
 
         Returns:
             A dictionary of URL query parameters.
-        """    
+        """
         return self._pagination_strategy.get_url_params(context, next_page_token)
 
     def parse_response(self, response: requests.Response) -> t.Iterable[dict]:
@@ -132,7 +1342,18 @@ class ZoomPhoneStream(RESTStream):
         Yields:
             Each record from the source.
         """
-        yield from extract_jsonpath(
-            self.records_jsonpath,
-            input=response.json(parse_float=decimal.Decimal),
-        )
+        decoded = getattr(response, "decoded", None)
+        records: t.Iterable[dict]
+        if decoded is not None:
+            records = expand_compact(decoded.result())
+        else:
+            records = extract_jsonpath(
+                self.records_jsonpath,
+                input=response.json(parse_float=decimal.Decimal),
+            )
+
+        record_count = 0
+        for record in records:
+            record_count += 1
+            yield record
+        self.observe_page(response, record_count)
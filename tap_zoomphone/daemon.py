@@ -0,0 +1,155 @@
+"""Continuous polling of the date-range streams.
+
+Launching the tap for every poll pays for interpreter start-up, a token request,
+schema loading and catalog processing each time. ``PollingDaemon`` keeps one
+``TapZoomPhone`` alive instead and syncs ``call_history`` and ``sms_sessions``
+from their bookmarks every ``poll_interval_seconds``. Each stream keeps its HTTP
+session, access token and compiled schema between polls, and the bookmarks it
+advances stay in the tap's in-memory state, so every poll only requests the
+trailing window since the last one. Records and a STATE message are written to
+stdout after every stream.
+
+SIGINT and SIGTERM stop the daemon once the stream being synced has finished and
+its state was written; a second signal interrupts it immediately.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import signal
+import sys
+import threading
+import time
+import typing as t
+
+from tap_zoomphone.client import ZoomPhoneStream
+
+if t.TYPE_CHECKING:
+    from tap_zoomphone.tap import TapZoomPhone
+
+
+DEFAULT_POLL_INTERVAL_SECONDS = 60
+
+
+class PollingDaemon:
+    """Sync the selected date-range streams of a tap until stopped."""
+
+    def __init__(self, tap: TapZoomPhone, interval: float | None = None):
+        """Initialize the daemon.
+
+        Args:
+            tap: The tap whose streams are polled.
+            interval: Seconds between the starts of two polls. Defaults to the
+                ``poll_interval_seconds`` setting.
+        """
+        self.tap = tap
+        self.interval = (
+            interval
+            if interval is not None
+            else tap.config.get("poll_interval_seconds", DEFAULT_POLL_INTERVAL_SECONDS)
+        )
+        self.polls = 0
+        self._stopping = threading.Event()
+
+    @property
+    def stopping(self) -> bool:
+        """Return True once a stop was requested."""
+        return self._stopping.is_set()
+
+    def streams(self) -> list[ZoomPhoneStream]:
+        """Return the top-level date-range streams that are selected."""
+        return [
+            stream
+            for stream in self.tap.streams.values()
+            if isinstance(stream, ZoomPhoneStream)
+            if stream._history_window is not None  # noqa: SLF001
+            and stream.parent_stream_type is None
+            and (stream.selected or stream.has_selected_descendents)
+        ]
+
+    def stop(self, signum: int | None = None, frame: t.Any = None) -> None:  # noqa: ARG002, ANN401
+        """Stop after the current stream, or immediately if already stopping."""
+        if self.stopping:
+            raise KeyboardInterrupt
+        self.tap.logger.info(
+            "Received signal %s, stopping after the current stream", signum
+        )
+        self._stopping.set()
+
+    def install_signal_handlers(self) -> None:
+        """Stop the daemon cleanly on SIGINT and SIGTERM."""
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, self.stop)
+
+    def poll(self) -> None:
+        """Sync every stream once from its bookmark and write the state after each."""
+        for stream in self.streams():
+            if self.stopping:
+                return
+            stream.start_poll()
+            stream.sync()
+            stream.finalize_state_progress_markers()
+            self.tap.state_writer.write_state(self.tap.state)
+            sys.stdout.flush()
+
+    def run(self, max_polls: int | None = None) -> None:
+        """Poll until stopped.
+
+        The streams' engines, connections and decode workers stay open across
+        polls and are released once, when the loop stops.
+
+        Args:
+            max_polls: Stop after this many polls, mainly for tests.
+        """
+        self.tap._reset_state_progress_markers()  # noqa: SLF001
+        self.tap._set_compatible_replication_methods()  # noqa: SLF001
+        if self.tap.state:
+            self.tap.state_writer.write_state(self.tap.state)
+
+        try:
+            while not self.stopping:
+                started = time.monotonic()
+                self.poll()
+                self.polls += 1
+                if max_polls is not None and self.polls >= max_polls:
+                    break
+                self._stopping.wait(
+                    max(0.0, self.interval - (time.monotonic() - started))
+                )
+        finally:
+            self.tap.release_resources()
+
+        for stream in self.tap.streams.values():
+            stream.log_sync_costs()
+        self.tap.logger.info("Polling stopped after %d polls", self.polls)
+
+
+def main(argv: t.Sequence[str] | None = None) -> None:
+    """Run the tap as a polling daemon."""
+    from tap_zoomphone.tap import TapZoomPhone
+
+    parser = argparse.ArgumentParser(
+        description="Poll the tap-zoomphone date-range streams continuously."
+    )
+    parser.add_argument("--config", required=True, action="append", help="Config file")
+    parser.add_argument("--state", help="State file to start from")
+    parser.add_argument("--catalog", help="Catalog file selecting the streams")
+    parser.add_argument(
+        "--interval", type=float, help="Seconds between polls (poll_interval_seconds)"
+    )
+    args = parser.parse_args(argv)
+
+    state = None
+    if args.state:
+        with open(args.state, encoding="utf-8") as state_file:
+            state = json.load(state_file)
+
+    tap = TapZoomPhone(config=args.config, state=state, catalog=args.catalog)
+    daemon = PollingDaemon(tap, interval=args.interval)
+    daemon.install_signal_handlers()
+    daemon.run()
+
+
+if __name__ == "__main__":
+    main()
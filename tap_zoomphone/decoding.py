@@ -0,0 +1,117 @@
+"""Process pool stage for decoding large JSON responses off the main interpreter.
+
+Workers decode the raw response bytes, apply the stream's records JSONPath and
+send the records back in a compact form: each distinct key layout is sent once
+and every record is a tuple of values referencing its layout. The main process
+rebuilds the dictionaries in the original order.
+
+Waiting on a worker only pays off while other pages are in flight, so streams
+hand a body to the pool as soon as it arrives on a prefetch or partition
+thread and collect the records once they get to parse the page; a page fetched
+on its own is decoded in-process. The pools are shut down when the sync ends.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import decimal
+import json
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from singer_sdk.helpers.jsonpath import extract_jsonpath
+
+DEFAULT_DECODE_MIN_BYTES = 64 * 1024
+
+CompactRecords = tuple[list[tuple[str, ...]], list[tuple[int, tuple]]]
+
+_pools: dict[tuple[int, int], DecodePool] = {}
+
+
+def decode_compact(content: bytes, records_jsonpath: str) -> CompactRecords:
+    """Decode a response body into compact records.
+
+    Args:
+        content: Raw response body.
+        records_jsonpath: JSONPath selecting the records in the body.
+
+    Returns:
+        A list of key layouts and a list of ``(layout index, values)`` rows.
+    """
+    data = json.loads(content, parse_float=decimal.Decimal)
+    layouts: dict[tuple[str, ...], int] = {}
+    rows = []
+    for record in extract_jsonpath(records_jsonpath, input=data):
+        keys = tuple(record)
+        index = layouts.setdefault(keys, len(layouts))
+        rows.append((index, tuple(record.values())))
+    return list(layouts), rows
+
+
+def expand_compact(compact: CompactRecords) -> list[dict]:
+    """Rebuild record dictionaries from ``decode_compact`` output."""
+    layouts, rows = compact
+    return [dict(zip(layouts[index], values)) for index, values in rows]
+
+
+class DecodePool:
+    """Decode response bodies in worker processes."""
+
+    def __init__(self, max_workers: int, min_bytes: int = DEFAULT_DECODE_MIN_BYTES):
+        """Initialize the pool.
+
+        Args:
+            max_workers: Number of worker processes.
+            min_bytes: Bodies smaller than this are decoded in-process, as the
+                transfer cost outweighs the decode cost.
+        """
+        self.max_workers = max_workers
+        self.min_bytes = min_bytes
+        self._executor = ProcessPoolExecutor(max_workers=max_workers)
+
+    def should_offload(self, content: bytes) -> bool:
+        """Return True if a body is large enough to decode in a worker."""
+        return len(content) >= self.min_bytes
+
+    def submit(self, content: bytes, records_jsonpath: str) -> Future[CompactRecords]:
+        """Start decoding a response body in a worker.
+
+        Pass the result of the future to `expand_compact` to get the records.
+        """
+        return self._executor.submit(decode_compact, content, records_jsonpath)
+
+    def decode(self, content: bytes, records_jsonpath: str) -> list[dict]:
+        """Decode a response body in a worker and return its records."""
+        return expand_compact(self.submit(content, records_jsonpath).result())
+
+    async def decode_async(self, content: bytes, records_jsonpath: str) -> list[dict]:
+        """Decode a response body in a worker without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        compact = await loop.run_in_executor(
+            self._executor, decode_compact, content, records_jsonpath
+        )
+        return expand_compact(compact)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        self._executor.shutdown()
+
+
+def get_decode_pool(
+    max_workers: int,
+    min_bytes: int = DEFAULT_DECODE_MIN_BYTES,
+) -> DecodePool:
+    """Return the process-wide decode pool for the given settings.
+
+    Streams share one pool so the number of worker processes does not grow
+    with the number of streams.
+    """
+    key = (max_workers, min_bytes)
+    if key not in _pools:
+        _pools[key] = DecodePool(max_workers, min_bytes=min_bytes)
+    return _pools[key]
+
+
+def shutdown_decode_pools() -> None:
+    """Stop the worker processes of every decode pool."""
+    while _pools:
+        _pools.popitem()[1].shutdown()
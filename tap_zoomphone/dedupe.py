@@ -0,0 +1,193 @@
+"""Bounded-memory removal of duplicate records by primary key.
+
+Adjacent date windows share their edge and Zoom's token pagination sometimes
+repeats a record on the next page, so duplicates arrive close together. Keys
+are therefore kept exactly for the most recent windows only: records are
+bucketed by the month of their replication key, and once a new month starts
+the oldest bucket beyond ``retained_windows`` is dropped. An optional Bloom
+filter remembers every key in a fixed number of bytes to also catch duplicates
+that arrive further apart, at the cost of dropping a unique record with the
+configured false positive rate.
+
+Filtering is opt-in with ``dedupe_records``. Per-user ``call_history``
+partitions each restart at their own bookmark, so a call shared by two users
+can arrive months apart; those streams always filter, and also remember up to
+``max_digests`` keys as 64-bit digests in a ``DigestSet``. A Python ``set`` of
+ints costs 70 to 100 bytes per key; the flat table costs 12 to 24, so the
+default of 2,000,000 keys takes at most 32 MiB. A unique call is only mistaken
+for a duplicate on a digest collision. Once the table is full, new keys are no
+longer remembered and only the month buckets and the Bloom filter catch their
+duplicates.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import typing as t
+from array import array
+from collections import OrderedDict
+
+DEFAULT_RETAINED_WINDOWS = 2
+DEFAULT_BLOOM_ERROR_RATE = 0.0001
+DEFAULT_MAX_DIGESTS = 2_000_000
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size probabilistic set of strings."""
+
+    def __init__(self, capacity: int, error_rate: float = DEFAULT_BLOOM_ERROR_RATE):
+        """Initialize a filter sized for `capacity` keys at `error_rate`."""
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> t.Iterator[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for index in range(self.hash_count):
+            yield (first + index * second) % self.size
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[position // 8] & (1 << position % 8)
+            for position in self._positions(key)
+        )
+
+    def add(self, key: str) -> bool:
+        """Add a key and return True if it was possibly present already."""
+        present = True
+        for position in self._positions(key):
+            byte, bit = divmod(position, 8)
+            if not self._bits[byte] & (1 << bit):
+                present = False
+                self._bits[byte] |= 1 << bit
+        return present
+
+
+class DigestSet:
+    """Set of at most `max_size` 64-bit digests, in an open-addressing array."""
+
+    def __init__(self, max_size: int):
+        """Initialize an empty set."""
+        self.max_size = max_size
+        self._slots = array("Q", bytes(8 * 1024))
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of digests stored."""
+        return self._size
+
+    @property
+    def full(self) -> bool:
+        """Return True once `max_size` digests are stored."""
+        return self._size >= self.max_size
+
+    def _slot(self, digest: int) -> int:
+        # 0 marks an empty slot, so add() stores a zero digest as 1.
+        slots = self._slots
+        mask = len(slots) - 1
+        index = digest & mask
+        while slots[index] and slots[index] != digest:
+            index = (index + 1) & mask
+        return index
+
+    def add(self, digest: int) -> bool:
+        """Add a digest unless the set is full, and return True if it was present."""
+        digest = digest or 1
+        index = self._slot(digest)
+        if self._slots[index]:
+            return True
+        if self.full:
+            return False
+        self._slots[index] = digest
+        self._size += 1
+        if self._size * 3 > len(self._slots) * 2:
+            old_slots = self._slots
+            self._slots = array("Q", bytes(16 * len(old_slots)))
+            for stored in old_slots:
+                if stored:
+                    self._slots[self._slot(stored)] = stored
+        return False
+
+
+class RecordDeduplicator:
+    """Detect records whose primary key was already seen."""
+
+    def __init__(
+        self,
+        key_properties: t.Sequence[str],
+        window_key: str | None = None,
+        retained_windows: int = DEFAULT_RETAINED_WINDOWS,
+        bloom_capacity: int = 0,
+        bloom_error_rate: float = DEFAULT_BLOOM_ERROR_RATE,
+        max_digests: int = 0,
+    ):
+        """Initialize the deduplicator.
+
+        Args:
+            key_properties: The stream's primary keys.
+            window_key: Timestamp property whose month buckets the keys. Without
+                it every key is kept in a single bucket.
+            retained_windows: Number of most recent month buckets kept exactly.
+            bloom_capacity: Expected number of keys in the Bloom filter, or 0 to
+                only use the exact buckets.
+            bloom_error_rate: False positive rate of the Bloom filter.
+            max_digests: Also keep a digest of up to this many keys, so their
+                duplicates are caught however far apart they arrive. 0 keeps none.
+        """
+        self.key_properties = list(key_properties)
+        self.window_key = window_key
+        self.retained_windows = retained_windows
+        self.bloom = (
+            BloomFilter(bloom_capacity, bloom_error_rate) if bloom_capacity else None
+        )
+        self.duplicates = 0
+        self._digests = DigestSet(max_digests) if max_digests else None
+        self._digests_full_logged = False
+        self._windows: OrderedDict[str | None, set[str]] = OrderedDict()
+
+    def _key(self, record: t.Mapping[str, t.Any]) -> str:
+        return "\x1f".join(str(record.get(name)) for name in self.key_properties)
+
+    def _window(self, record: t.Mapping[str, t.Any]) -> set[str]:
+        value = record.get(self.window_key) if self.window_key else None
+        window = value[:7] if isinstance(value, str) else None
+        keys = self._windows.get(window)
+        if keys is None:
+            keys = self._windows[window] = set()
+            while len(self._windows) > self.retained_windows:
+                self._windows.popitem(last=False)
+        return keys
+
+    def is_duplicate(self, record: t.Mapping[str, t.Any]) -> bool:
+        """Remember a record's key and return True if it was seen before."""
+        key = self._key(record)
+        window = self._window(record)
+        duplicate = key in window or any(
+            key in keys for keys in self._windows.values() if keys is not window
+        )
+        if self.bloom is not None:
+            duplicate = self.bloom.add(key) or duplicate
+        if self._digests is not None:
+            digest = int.from_bytes(
+                hashlib.blake2b(key.encode(), digest_size=8).digest(), "little"
+            )
+            duplicate = self._digests.add(digest) or duplicate
+            if self._digests.full and not self._digests_full_logged:
+                self._digests_full_logged = True
+                logger.warning(
+                    "Remembered %d record keys, the most dedupe keeps; duplicates "
+                    "of later records are only dropped within the recent windows",
+                    len(self._digests),
+                )
+        window.add(key)
+        if duplicate:
+            self.duplicates += 1
+        return duplicate
@@ -0,0 +1,99 @@
+"""Verification that every date window returned all of its records.
+
+Zoom reports ``total_records`` for a window on each page of ``/call_history``.
+The records parsed from every page are counted per window (identified by the
+``from`` and ``to`` of the request) and compared with that figure once the
+stream has finished. Windows that came up short, or long, are kept in the
+stream state under ``window_mismatches`` until a run in repair mode fetches
+them again and finds them complete.
+"""
+
+from __future__ import annotations
+
+import typing as t
+from urllib import parse
+
+from tap_zoomphone.pagination import top_level_field
+
+STATE_KEY = "window_mismatches"
+
+
+def total_records(content: bytes) -> int | None:
+    """Return the ``total_records`` of a response body, if present."""
+    count = top_level_field(content, "total_records")
+    return count if isinstance(count, int) else None
+
+
+def request_window(url: str) -> tuple[str, str] | None:
+    """Return the ``from`` and ``to`` query parameters of a request URL, if present."""
+    params = parse.parse_qs(parse.urlsplit(url).query)
+    if "from" not in params or "to" not in params:
+        return None
+    return params["from"][0], params["to"][0]
+
+
+class WindowIntegrity:
+    """Per-window tallies of expected and received records."""
+
+    def __init__(self):
+        """Initialize an empty tally."""
+        self._expected: dict[tuple[str, str], int | None] = {}
+        self._received: dict[tuple[str, str], int] = {}
+
+    def observe(
+        self, window: tuple[str, str], expected: int | None, received: int
+    ) -> None:
+        """Add the records of one page to its window's tally."""
+        if expected is not None or window not in self._expected:
+            self._expected[window] = expected
+        self._received[window] = self._received.get(window, 0) + received
+
+    def verified(self) -> list[tuple[str, str]]:
+        """Return the windows whose record count matched ``total_records``."""
+        return [
+            window
+            for window, expected in self._expected.items()
+            if expected is not None and expected == self._received[window]
+        ]
+
+    def mismatches(self) -> list[dict[str, t.Any]]:
+        """Return the windows whose record count differed from ``total_records``."""
+        return [
+            {
+                "from": window[0],
+                "to": window[1],
+                "expected": expected,
+                "received": self._received[window],
+            }
+            for window, expected in self._expected.items()
+            if expected is not None and expected != self._received[window]
+        ]
+
+    def reset(self) -> None:
+        """Forget all tallies."""
+        self._expected.clear()
+        self._received.clear()
+
+
+def merge_mismatches(
+    previous: t.Sequence[dict],
+    integrity: WindowIntegrity,
+) -> list[dict]:
+    """Combine the mismatches already in state with those of the current run.
+
+    A window from state is dropped once this run tallied a window covering it,
+    whether that window matched or was found short again (it is then listed
+    with its new tally). Windows this run did not reach are kept.
+    """
+    current = integrity.mismatches()
+    tallied = integrity.verified() + [(entry["from"], entry["to"]) for entry in current]
+
+    def covered(entry: dict) -> bool:
+        return any(
+            window_from <= entry["from"] and entry["to"] <= window_to
+            for window_from, window_to in tallied
+        )
+
+    merged = [entry for entry in previous if not covered(entry)]
+    merged.extend(current)
+    return sorted(merged, key=lambda entry: entry["from"])
@@ -0,0 +1,233 @@
+"""Opt-in memory profiling with tracemalloc.
+
+With ``memory_profile`` enabled, tracemalloc traces every allocation of the
+run. A daemon thread takes a snapshot every ``memory_profile_interval_seconds``
+and logs the traced total with the components that grew the most since the
+previous snapshot. Each stream's syncs are measured as well: the memory still
+allocated when a sync returns, less that of its child streams' syncs, is added
+to the stream's total.
+
+When the interpreter exits, a report goes to stderr. It has the traced memory
+over the run (first sample, peak, last sample), the memory held per component
+and per stream, and the top allocation sites that are still alive.
+
+A component is the part of the code that made an allocation: a tap module such
+as ``tap_zoomphone.client``, or ``singer_sdk``, ``json``, ``logging``, ``http``
+(requests and urllib3), ``tracemalloc`` or ``other``. Allocations made by
+library code are also shown with the innermost tap frame that led to them.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import typing as t
+from collections import defaultdict
+from contextlib import contextmanager
+
+DEFAULT_MEMORY_PROFILE_INTERVAL_SECONDS = 60
+DEFAULT_MEMORY_PROFILE_TOP = 20
+TRACEBACK_FRAMES = 16
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+_LIBRARY_COMPONENTS = (
+    (f"{os.sep}singer_sdk{os.sep}", "singer_sdk"),
+    (f"{os.sep}json{os.sep}", "json"),
+    (f"{os.sep}logging{os.sep}", "logging"),
+    (f"{os.sep}requests{os.sep}", "http"),
+    (f"{os.sep}urllib3{os.sep}", "http"),
+    (f"{os.sep}tracemalloc.py", "tracemalloc"),
+)
+
+logger = logging.getLogger(__name__)
+
+
+def component(filename: str) -> str:
+    """Return the component a source file belongs to."""
+    if filename.startswith(_PACKAGE_DIR):
+        module = os.path.splitext(os.path.relpath(filename, _PACKAGE_DIR))[0]
+        return "tap_zoomphone." + module.replace(os.sep, ".")
+    for marker, name in _LIBRARY_COMPONENTS:
+        if marker in filename:
+            return name
+    return "other"
+
+
+def _tap_frame(traceback: tracemalloc.Traceback) -> tracemalloc.Frame | None:
+    """Return the innermost frame of a traceback in tap code, if any."""
+    for frame in reversed(traceback):
+        if frame.filename.startswith(_PACKAGE_DIR):
+            return frame
+    return None
+
+
+def _location(frame: tracemalloc.Frame) -> str:
+    """Return ``file:line``, shortened to the last two path components."""
+    filename = os.sep.join(frame.filename.split(os.sep)[-2:])
+    return f"{filename}:{frame.lineno}"
+
+
+def _mib(size: float) -> str:
+    return f"{size / 2**20:8.1f} MiB"
+
+
+def component_sizes(snapshot: tracemalloc.Snapshot) -> dict[str, int]:
+    """Return the bytes held per component in a snapshot."""
+    sizes: dict[str, int] = defaultdict(int)
+    for statistic in snapshot.statistics("filename"):
+        sizes[component(statistic.traceback[0].filename)] += statistic.size
+    return dict(sizes)
+
+
+class _Measurement:
+    __slots__ = ("children", "start", "stream")
+
+    def __init__(self, stream: str, start: int):
+        self.stream = stream
+        self.start = start
+        self.children = 0
+
+
+class MemoryProfiler:
+    """Trace allocations, sample them periodically and report at exit."""
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_MEMORY_PROFILE_INTERVAL_SECONDS,
+        top: int = DEFAULT_MEMORY_PROFILE_TOP,
+    ):
+        """Initialize the profiler; call ``start`` to begin tracing."""
+        self.interval = interval
+        self.top = top
+        self.samples: list[tuple[float, int]] = []
+        self.stream_sizes: dict[str, int] = defaultdict(int)
+        self._stack: list[_Measurement] = []
+        self._previous: dict[str, int] = {}
+        self._started = time.monotonic()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="memory-profile", daemon=True
+        )
+
+    def start(self) -> None:
+        """Start tracing and sampling, and print the report at interpreter exit."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEBACK_FRAMES)
+        self.sample()
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """Stop sampling and write the report to stderr."""
+        self._stopped.set()
+        sys.stderr.write(self.report() + "\n")
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> tracemalloc.Snapshot:
+        """Record the traced total and log the components that grew most."""
+        snapshot = tracemalloc.take_snapshot()
+        sizes = component_sizes(snapshot)
+        total = sum(sizes.values())
+        self.samples.append((time.monotonic() - self._started, total))
+        if self._previous:
+            growth = sorted(
+                (
+                    (size - self._previous.get(name, 0), name)
+                    for name, size in sizes.items()
+                ),
+                reverse=True,
+            )
+            logger.info(
+                "Memory traced: %.1f MiB; largest growth: %s",
+                total / 2**20,
+                ", ".join(
+                    f"{name} {delta / 2**20:+.1f} MiB"
+                    for delta, name in growth[:3]
+                    if delta > 0
+                )
+                or "none",
+            )
+        self._previous = sizes
+        return snapshot
+
+    @contextmanager
+    def measure(self, stream: str) -> t.Iterator[None]:
+        """Add the memory a stream sync leaves allocated, less its children's."""
+        measurement = _Measurement(stream, tracemalloc.get_traced_memory()[0])
+        self._stack.append(measurement)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            retained = tracemalloc.get_traced_memory()[0] - measurement.start
+            self.stream_sizes[stream] += retained - measurement.children
+            if self._stack:
+                self._stack[-1].children += retained
+
+    def report(self) -> str:
+        """Return the end-of-run report."""
+        snapshot = self.sample()
+        lines = ["Memory profile:"]
+        first, last = self.samples[0][1], self.samples[-1][1]
+        peak = tracemalloc.get_traced_memory()[1]
+        lines.append(
+            f"  traced {_mib(first).strip()} at start, {_mib(last).strip()} at end, "
+            f"{_mib(peak).strip()} peak over {self.samples[-1][0]:.0f}s "
+            f"({len(self.samples)} samples)"
+        )
+
+        lines.append("By component:")
+        sizes = sorted(component_sizes(snapshot).items(), key=lambda item: -item[1])
+        lines.extend(f"  {_mib(size)}  {name}" for name, size in sizes[: self.top])
+
+        lines.append("By stream (retained by its syncs, excluding child streams):")
+        streams = sorted(self.stream_sizes.items(), key=lambda item: -item[1])
+        lines.extend(f"  {_mib(size)}  {name}" for name, size in streams[: self.top])
+
+        lines.append("Top allocation sites:")
+        sites: dict[tuple[str, str], list[int]] = {}
+        for statistic in snapshot.statistics("traceback"):
+            frame = statistic.traceback[-1]
+            tap_frame = _tap_frame(statistic.traceback)
+            via = "" if tap_frame in (None, frame) else f"  via {_location(tap_frame)}"
+            key = (_location(frame), via)
+            totals = sites.setdefault(key, [0, 0])
+            totals[0] += statistic.size
+            totals[1] += statistic.count
+        ranked = sorted(sites.items(), key=lambda item: -item[1][0])
+        lines.extend(
+            f"  {_mib(size)}  {count:>9} blocks  {location}{via}"
+            for (location, via), (size, count) in ranked[: self.top]
+        )
+        return "\n".join(lines)
+
+
+_profilers: dict[tuple, MemoryProfiler] = {}
+
+
+def get_memory_profiler(config: t.Mapping[str, t.Any]) -> MemoryProfiler | None:
+    """Return the profiler shared by all streams, starting it once.
+
+    Returns None unless ``memory_profile`` is enabled.
+    """
+    if not config.get("memory_profile"):
+        return None
+    key = (
+        config.get(
+            "memory_profile_interval_seconds", DEFAULT_MEMORY_PROFILE_INTERVAL_SECONDS
+        ),
+        config.get("memory_profile_top", DEFAULT_MEMORY_PROFILE_TOP),
+    )
+    profiler = _profilers.get(key)
+    if profiler is None:
+        profiler = _profilers[key] = MemoryProfiler(*key)
+        profiler.start()
+    return profiler
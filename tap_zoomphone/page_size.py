@@ -0,0 +1,83 @@
+"""Adaptation of a stream's page size to the latency and size of its pages.
+
+With ``adaptive_page_size`` each paged stream starts at its configured page
+size and adjusts it after every page it requested at the current size:
+
+- it halves the size when a page took longer than
+  ``adaptive_page_size_target_seconds`` or its body exceeded
+  ``adaptive_page_size_max_bytes``, or when a request timed out;
+- it grows the size by half when a page was full and would still have stayed
+  within both limits at the larger size.
+
+The size never exceeds the endpoint's documented maximum, nor drops below 10
+records. Zoom ties a ``next_page_token`` to the query it continues, so a new
+size is only used from the first page of the next token chain: the next date
+window, or the next listing of a stream without windows.
+"""
+
+from __future__ import annotations
+
+DEFAULT_TARGET_SECONDS = 5.0
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+MIN_PAGE_SIZE = 10
+GROWTH_FACTOR = 1.5
+
+
+class AdaptivePageSize:
+    """Page size that shrinks on slow or large pages and grows on fast, small ones."""
+
+    def __init__(
+        self,
+        size: int,
+        maximum: int,
+        target_seconds: float = DEFAULT_TARGET_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        """Initialize the page size.
+
+        Args:
+            size: The page size to start with.
+            maximum: The largest page size the endpoint accepts.
+            target_seconds: The longest a page should take.
+            max_bytes: The largest a page's body should be.
+        """
+        self.size = size
+        self.maximum = maximum
+        self.minimum = min(MIN_PAGE_SIZE, maximum)
+        self.target_seconds = target_seconds
+        self.max_bytes = max_bytes
+
+    def observe(self, page_size: int, latency: float, size: int, records: int) -> bool:
+        """Adjust the size after a page and return True if it changed.
+
+        Pages requested at an earlier size are ignored.
+
+        Args:
+            page_size: The page size the page was requested with.
+            latency: Seconds the request took.
+            size: Bytes in the response body.
+            records: Records in the page.
+        """
+        if page_size != self.size:
+            return False
+        if latency > self.target_seconds or size > self.max_bytes:
+            return self.shrink()
+        if (
+            records >= page_size
+            and latency * GROWTH_FACTOR <= self.target_seconds
+            and size * GROWTH_FACTOR <= self.max_bytes
+        ):
+            return self.grow()
+        return False
+
+    def shrink(self) -> bool:
+        """Halve the size, down to the minimum, and return True if it changed."""
+        size = max(self.minimum, self.size // 2)
+        changed, self.size = size != self.size, size
+        return changed
+
+    def grow(self) -> bool:
+        """Grow the size by half, up to the maximum, and return True if it changed."""
+        size = min(self.maximum, int(self.size * GROWTH_FACTOR))
+        changed, self.size = size != self.size, size
+        return changed
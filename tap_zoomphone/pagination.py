@@ -2,277 +2,303 @@
 
 from __future__ import annotations
 
+import json
 import logging
+import re
 import sys
 import typing as t
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
-from urllib import parse
 
 from dateutil.relativedelta import relativedelta
-from singer_sdk.helpers.jsonpath import extract_jsonpath
 from singer_sdk.pagination import BaseAPIPaginator
 
+from tap_zoomphone.timestamps import format_timestamp, parse_timestamp
+
 if sys.version_info < (3, 12):
     from typing_extensions import override
 else:
-    from typing import override  # noqa: ICN003
+    from typing import override
 
 if t.TYPE_CHECKING:
     import requests
 
+# One member of a JSON object with a scalar value: the opening brace or comma
+# before it, the key and the value.
+SCALAR_MEMBER_PATTERN = re.compile(
+    rb'\s*[{,]\s*"((?:[^"\\]|\\.)*)"\s*:\s*'
+    rb'("(?:[^"\\]|\\.)*"|-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?|true|false|null)'
+)
+
+
+def top_level_field(content: bytes, name: str) -> t.Any:  # noqa: ANN401
+    """Return a member of the top-level object of a response body, if present.
+
+    Zoom sends the pagination fields of a list ahead of its records, so only
+    the scalar members leading the body are read, and the scan stops at the
+    first object or array. The records are never decoded here, and keys inside
+    them or inside string values are never mistaken for `name`.
+    """
+    key = name.encode()
+    position = 0
+    while match := SCALAR_MEMBER_PATTERN.match(content, position):
+        if match.group(1) == key:
+            return json.loads(match.group(2))
+        position = match.end()
+    return None
+
+
+def next_page_token(content: bytes) -> str | None:
+    """Return the non-empty ``next_page_token`` of a response body, if present."""
+    token = top_level_field(content, "next_page_token")
+    return token if isinstance(token, str) and token else None
+
+
+def page_count(content: bytes) -> int | None:
+    """Return the ``page_count`` of a response body, if present."""
+    count = top_level_field(content, "page_count")
+    return count if isinstance(count, int) else None
+
+
+class Window:
+    """A date window with its bounds formatted once for the query string."""
+
+    __slots__ = ("end", "from_param", "start", "to_param")
+
+    def __init__(self, start: datetime, end: datetime):
+        """Initialize a window from `start` (inclusive) to `end`."""
+        self.start = start
+        self.end = end
+        self.from_param = format_timestamp(start)
+        self.to_param = format_timestamp(end)
+
+    def __repr__(self) -> str:
+        return f"Window({self.from_param}, {self.to_param})"
+
+
+class PageState:
+    """Position of a paginator: the page to request next.
+
+    ``window`` is None for streams without date windows, and also for the first
+    page of a date-range stream until the strategy has resolved the starting
+    window, which depends on the stream context. ``page`` is the 1-based number
+    of the page within its window. ``page_size`` is set by the strategy on the
+    state of the first page of a token chain and copied to the pages after it,
+    as Zoom ties a token to the query it continues.
+    """
+
+    __slots__ = ("next_page_token", "page", "page_size", "window")
+
+    def __init__(
+        self,
+        window: Window | None = None,
+        next_page_token: str | None = None,
+        page: int = 1,
+        page_size: int | None = None,
+    ):
+        """Initialize a page state."""
+        self.window = window
+        self.next_page_token = next_page_token
+        self.page = page
+        self.page_size = page_size
+
+    def __eq__(self, other: object) -> bool:
+        """Two states are equal if they would request the same page."""
+        if not isinstance(other, PageState):
+            return NotImplemented
+        return (
+            self.window is other.window
+            and self.next_page_token == other.next_page_token
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"PageState({self.window!r}, {self.next_page_token!r}, page={self.page})"
+
 
 class PaginationStrategy(ABC):
-    """Abstract base class for pagination strategies."""
-    
-    @abstractmethod
-    def get_url_params(self, context: t.Any, next_page_token: t.Any) -> dict[str, t.Any]:
-        """Get URL parameters for the next request."""
-        pass
-    
+    """Abstract base class for pagination strategies.
+
+    The paginator holds a ``PageState`` and hands the state of each page back to
+    the strategy together with its response; ``next_state`` decides what comes
+    next. Strategies keep no per-sync state, so one instance can serve several
+    paginators at once; ``page_size`` only applies to token chains started
+    after it changes.
+    """
+
+    page_size: int | None = None
+
     @abstractmethod
-    def should_continue(self, response: requests.Response) -> bool:
-        """Determine if pagination should continue."""
-        pass
-    
+    def get_url_params(
+        self, context: t.Any, next_page_token: PageState | None
+    ) -> dict[str, t.Any]:
+        """Get URL parameters for the request of the page in `next_page_token`."""
+
+    def start_state(self) -> PageState | None:
+        """Return the state of the first page."""
+        return PageState(page_size=self.page_size)
+
     @abstractmethod
-    def extract_pagination_data(self, response: requests.Response, request_url: str) -> dict[str, t.Any]:
-        """Extract pagination-relevant data from response."""
-        pass
+    def next_state(
+        self, response: requests.Response, state: PageState | None
+    ) -> PageState | None:
+        """Return the state of the page after `response`, or None when done.
+
+        Args:
+            response: The response to the page described by `state`.
+            state: The state the request was built from.
+        """
 
 
 class TokenPaginationStrategy(PaginationStrategy):
     """Simple token-based pagination strategy."""
-    
+
     def __init__(self, page_size: int = 100):
         self.page_size = page_size
-    
-    def get_url_params(self, context: t.Any, next_page_token: t.Any) -> dict[str, t.Any]:
+
+    def get_url_params(
+        self, context: t.Any, next_page_token: PageState | None
+    ) -> dict[str, t.Any]:
         """Get URL parameters for token-based pagination."""
-        params = {"page_size": self.page_size}
-        if next_page_token and next_page_token.get("next_page_token"):
-            params["next_page_token"] = next_page_token["next_page_token"]
+        state = next_page_token or PageState()
+        params = {"page_size": state.page_size or self.page_size}
+        if state.next_page_token:
+            params["next_page_token"] = state.next_page_token
         return params
-    
-    def should_continue(self, response: requests.Response) -> bool:
-        """Continue if there's a next page token."""
-        return bool(response.json().get("next_page_token"))
-    
-    def extract_pagination_data(self, response: requests.Response, request_url: str) -> dict[str, t.Any]:
-        """Extract token pagination data."""
-        response_json = response.json()
-        all_matches = extract_jsonpath("$.next_page_token", response_json)
-        next_page_token = next(all_matches, None)
-        
-        return {
-            "next_page_token": next_page_token,
-            "has_more": bool(next_page_token)
-        }
 
+    def next_state(
+        self, response: requests.Response, state: PageState | None
+    ) -> PageState | None:
+        """Follow the next page token until the API stops returning one."""
+        token = next_page_token(response.content)
+        if not token:
+            return None
+        if state is None:
+            return PageState(None, token, 2, self.page_size)
+        return PageState(None, token, state.page + 1, state.page_size)
 
-class TokenBasedDateRangePaginationStrategy(PaginationStrategy):
-    """Pagination strategy that relies on next_page_token only for date range pagination."""
-    
-    def __init__(self, page_size: int, history_window: relativedelta, logger: logging.Logger, stream=None):
+
+class DateRangePaginationStrategy(PaginationStrategy):
+    """Base class for strategies that page through month-sized date windows.
+
+    An optional ``window_filter`` restricts which windows are requested. It is
+    called with the start of each window and windows it rejects are skipped.
+    """
+
+    def __init__(
+        self,
+        page_size: int,
+        history_window: relativedelta,
+        logger: logging.Logger,
+        stream=None,
+        window_filter: t.Callable[[datetime], bool] | None = None,
+    ):
         self.page_size = page_size
         self.history_window = history_window
         self.logger = logger
         self.stream = stream
-    
-    def get_url_params(self, context: t.Any, next_page_token: t.Any) -> dict[str, t.Any]:
-        """Get URL parameters for SMS Sessions pagination."""
-        params = {"page_size": self.page_size}
-        
-        if next_page_token:
-            if self._has_valid_token(next_page_token):
-                params["next_page_token"] = next_page_token["next_page_token"]
-                if self._has_date_range(next_page_token):
-                    params["from"] = next_page_token["last_from"]
-                    params["to"] = next_page_token["last_to"]
-            elif self._should_advance_date_range(next_page_token):
-                params["from"] = next_page_token["last_to"]
-                params["to"] = self._calculate_next_month_end(next_page_token["last_to"])
-        else:
-            # Initial request
-            start_date = self._get_initial_start_date(context)
-            params["from"] = start_date.strftime('%Y-%m-%dT%H:%M:%SZ')
-            params["to"] = self._calculate_month_end(start_date).strftime('%Y-%m-%dT%H:%M:%SZ')
-        
-        return params
-    
-    def should_continue(self, response: requests.Response) -> bool:
-        """Continue if we haven't reached the current date."""
-        return True  # Handled by has_more logic
-    
-    def extract_pagination_data(self, response: requests.Response, request_url: str) -> dict[str, t.Any]:
-        """Extract SMS Sessions pagination data - relies on next_page_token only."""
-        req_params = parse.parse_qs(parse.urlparse(request_url).query)
-        last_from = req_params.get("from", [None])[0]
-        last_to = req_params.get("to", [None])[0]
-        
-        response_json = response.json()
-        
-        # Extract next page token
-        all_matches = extract_jsonpath("$.next_page_token", response_json)
-        next_page_token = next(all_matches, None)
-        
-        # For SMS Sessions, we need to check if we should continue even without a token
-        # (i.e., if we haven't reached the current date yet)
-        has_more = bool(next_page_token)
-        if not has_more and last_to:
-            # No more pages in current date range, but check if we should advance to next month
-            last_to_datetime = datetime.fromisoformat(last_to)
-            has_more = last_to_datetime < datetime.now(timezone.utc)
-        
-        return {
-            "next_page_token": next_page_token,
-            "last_from": last_from,
-            "last_to": last_to,
-            "has_more": has_more
+        self.window_filter = window_filter
+
+    def get_url_params(
+        self, context: t.Any, next_page_token: PageState | None
+    ) -> dict[str, t.Any]:
+        """Get URL parameters for date range pagination.
+
+        The first state has no window yet; it is resolved here, once, from the
+        stream context.
+        """
+        state = next_page_token or PageState()
+        if state.window is None:
+            state.window = self._first_window(context)
+        params = {
+            "page_size": state.page_size or self.page_size,
+            "from": state.window.from_param,
+            "to": state.window.to_param,
         }
-    
-    def _has_valid_token(self, next_page_token: dict) -> bool:
-        """Check if we have a valid next page token."""
-        return bool(next_page_token.get("next_page_token") and 
-                   not next_page_token.get("last_page_in_batch", False))
-    
-    def _has_date_range(self, next_page_token: dict) -> bool:
-        """Check if we have date range information."""
-        return bool(next_page_token.get("last_from") and next_page_token.get("last_to"))
-    
-    def _should_advance_date_range(self, next_page_token: dict) -> bool:
-        """Check if we should advance to the next date range."""
-        return bool(next_page_token.get("last_to"))
-    
-    def _calculate_next_month_end(self, last_to: str) -> str:
-        """Calculate the end of the next month."""
-        last_to_date = datetime.fromisoformat(last_to)
-        next_month_end = last_to_date + relativedelta(months=1)
-        return next_month_end.strftime('%Y-%m-%dT%H:%M:%SZ')
-    
-    def _get_starting_timestamp(self, context: t.Any) -> datetime | None:
-        """Get the starting timestamp from the stream."""
-        if not self.stream:
+        if state.next_page_token:
+            params["next_page_token"] = state.next_page_token
+        return params
+
+    def next_state(
+        self, response: requests.Response, state: PageState | None
+    ) -> PageState | None:
+        """Request the next page of the window if there is one, else the next window."""
+        token = next_page_token(response.content)
+        if token and self._window_has_more(response, state):
+            return PageState(state.window, token, state.page + 1, state.page_size)
+        if not self.has_window_after(state.window.end):
             return None
-        return self.stream.get_starting_timestamp(context)
-    
-    def _get_initial_start_date(self, context: t.Any) -> datetime:
-        """Get the initial start date for the first request."""
-        starting_date = self._get_starting_timestamp(context)
-        
-        if starting_date:
-            return starting_date
-        
-        # revert to full sync based on history window size
-        return (datetime.now(timezone.utc) + relativedelta(days=1) - self.history_window).replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
-    
-    def _calculate_month_end(self, start_date: datetime) -> datetime:
-        """Calculate the end of the month for the given start date."""
-        return (start_date + relativedelta(months=1)).replace(
-            day=1, hour=0, minute=0, second=0, microsecond=0
-        )
+        return PageState(self._window_after(state.window), page_size=self.page_size)
 
+    def _window_has_more(self, response: requests.Response, state: PageState) -> bool:
+        """Check whether the window of `state` has pages after this one."""
+        return True
+
+    def has_window_after(self, last_to: datetime | str) -> bool:
+        """Check if a selected window starts at or after `last_to` and before now."""
+        now = datetime.now(timezone.utc)
+        window_start = parse_timestamp(last_to) if isinstance(last_to, str) else last_to
+        if window_start >= now:
+            return False
+        if self.window_filter is None:
+            return True
+        return self._next_selected_window_start(window_start) < now
+
+    def iter_windows(self, context: t.Any) -> t.Iterator[tuple[str, str]]:
+        """Yield the (from, to) bounds of every window a sync would request."""
+        window = self._first_window(context)
+        while True:
+            yield window.from_param, window.to_param
+            if not self.has_window_after(window.end):
+                return
+            window = self._window_after(window)
+
+    def _first_window(self, context: t.Any) -> Window:
+        """Return the window of the first request: the rest of the starting month."""
+        start_date = self._get_initial_start_date(context)
+        if self.window_filter is not None:
+            start_date = self._next_selected_window_start(start_date)
+        return Window(start_date, self._calculate_month_end(start_date))
+
+    def _window_after(self, window: Window) -> Window:
+        """Return the month-long window starting where `window` ends."""
+        start_date = window.end
+        if self.window_filter is not None:
+            start_date = self._next_selected_window_start(start_date)
+        return Window(start_date, start_date + relativedelta(months=1))
+
+    def _next_selected_window_start(self, window_start: datetime) -> datetime:
+        """Return the start of the first window accepted by the window filter.
+
+        If no window before now is accepted, the first window after now is returned.
+        """
+        if self.window_filter(window_start):
+            return window_start
+        now = datetime.now(timezone.utc)
+        window_start = self._calculate_month_end(window_start)
+        while window_start < now and not self.window_filter(window_start):
+            window_start += relativedelta(months=1)
+        return window_start
 
-class PageCountBasedDateRangePaginationStrategy(PaginationStrategy):
-    """Pagination strategy that relies on page_count for date range pagination, ignores misleading token."""
-    
-    def __init__(self, page_size: int, history_window: relativedelta, logger: logging.Logger, stream=None):
-        self.page_size = page_size
-        self.history_window = history_window
-        self.logger = logger
-        self.stream = stream
-    
-    def get_url_params(self, context: t.Any, next_page_token: t.Any) -> dict[str, t.Any]:
-        """Get URL parameters for Call History pagination."""
-        params = {"page_size": self.page_size}
-        
-        if next_page_token:
-            if self._has_valid_token(next_page_token):
-                params["next_page_token"] = next_page_token["next_page_token"]
-                if self._has_date_range(next_page_token):
-                    params["from"] = next_page_token["last_from"]
-                    params["to"] = next_page_token["last_to"]
-            elif self._should_advance_date_range(next_page_token):
-                params["from"] = next_page_token["last_to"]
-                params["to"] = self._calculate_next_month_end(next_page_token["last_to"])
-        else:
-            # Initial request
-            start_date = self._get_initial_start_date(context)
-            params["from"] = start_date.strftime('%Y-%m-%dT%H:%M:%SZ')
-            params["to"] = self._calculate_month_end(start_date).strftime('%Y-%m-%dT%H:%M:%SZ')
-        
-        return params
-    
-    def should_continue(self, response: requests.Response) -> bool:
-        """Continue if we haven't reached the current date."""
-        return True  # Handled by has_more logic
-    
-    def extract_pagination_data(self, response: requests.Response, request_url: str) -> dict[str, t.Any]:
-        """Extract Call History pagination data - relies on page_count, ignores misleading token."""
-        req_params = parse.parse_qs(parse.urlparse(request_url).query)
-        last_from = req_params.get("from", [None])[0]
-        last_to = req_params.get("to", [None])[0]
-        
-        response_json = response.json()
-        response_page_count = response_json.get("page_count")
-        
-        # Extract next page token but don't rely on it for has_more logic
-        all_matches = extract_jsonpath("$.next_page_token", response_json)
-        next_page_token = next(all_matches, None)
-        
-        has_more = bool(response_page_count is not None and response_page_count > 0)  #check page_count
-        if not has_more and last_to:
-            # No more pages in current date range, but check if we should advance to next month
-            last_to_datetime = datetime.fromisoformat(last_to)
-            has_more = last_to_datetime < datetime.now(timezone.utc)
-        
-        return {
-            "next_page_token": next_page_token,
-            "last_from": last_from,
-            "last_to": last_to,
-            "page_count": response_page_count,
-            "has_more": has_more
-        }
-    
-    def _has_valid_token(self, next_page_token: dict) -> bool:
-        """Check if we have a valid next page token."""
-        return bool(next_page_token.get("next_page_token") and 
-                   not next_page_token.get("last_page_in_batch", False))
-    
-    def _has_date_range(self, next_page_token: dict) -> bool:
-        """Check if we have date range information."""
-        return bool(next_page_token.get("last_from") and next_page_token.get("last_to"))
-    
-    def _should_advance_date_range(self, next_page_token: dict) -> bool:
-        """Check if we should advance to the next date range."""
-        return bool(next_page_token.get("last_to"))
-    
-    def _calculate_next_month_end(self, last_to: str) -> str:
-        """Calculate the end of the next month."""
-        last_to_date = datetime.fromisoformat(last_to)
-        next_month_end = last_to_date + relativedelta(months=1)
-        return next_month_end.strftime('%Y-%m-%dT%H:%M:%SZ')
-    
     def _get_starting_timestamp(self, context: t.Any) -> datetime | None:
         """Get the starting timestamp from the stream."""
         if not self.stream:
             return None
         return self.stream.get_starting_timestamp(context)
-    
+
     def _get_initial_start_date(self, context: t.Any) -> datetime:
         """Get the initial start date for the first request."""
         starting_date = self._get_starting_timestamp(context)
-        
+
         if starting_date:
             return starting_date
-        
+
         # revert to full sync based on history window size
-        return (datetime.now(timezone.utc) + relativedelta(days=1) - self.history_window).replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
-    
+        return (
+            datetime.now(timezone.utc) + relativedelta(days=1) - self.history_window
+        ).replace(hour=0, minute=0, second=0, microsecond=0)
+
     def _calculate_month_end(self, start_date: datetime) -> datetime:
         """Calculate the end of the month for the given start date."""
         return (start_date + relativedelta(months=1)).replace(
@@ -280,27 +306,45 @@ class PageCountBasedDateRangePaginationStrategy(PaginationStrategy):
         )
 
 
+class TokenBasedDateRangePaginationStrategy(DateRangePaginationStrategy):
+    """Pagination strategy that relies on next_page_token only for date range pagination."""
+
+
+class PageCountBasedDateRangePaginationStrategy(DateRangePaginationStrategy):
+    """Pagination strategy that relies on page_count for date range pagination, ignores misleading token."""
+
+    def _window_has_more(self, response: requests.Response, state: PageState) -> bool:
+        """Trust ``page_count`` over the token, which Zoom also sends on the last page."""
+        count = page_count(response.content)
+        return count is not None and state.page < count
+
+
 class SinglePageStrategy(PaginationStrategy):
     """Strategy for single page requests (no pagination)."""
-    
-    def get_url_params(self, context: t.Any, next_page_token: t.Any) -> dict[str, t.Any]:
+
+    def get_url_params(
+        self, context: t.Any, next_page_token: PageState | None
+    ) -> dict[str, t.Any]:
         """No pagination parameters needed."""
         return {}
-    
-    def should_continue(self, response: requests.Response) -> bool:
-        """Never continue for single page requests."""
-        return False
-    
-    def extract_pagination_data(self, response: requests.Response, request_url: str) -> dict[str, t.Any]:
-        """No pagination data for single page requests."""
-        return {
-            "next_page_token": None,
-            "has_more": False
-        }
 
+    def start_state(self) -> PageState | None:
+        """Single page requests carry no state."""
+        return None
+
+    def next_state(
+        self, response: requests.Response, state: PageState | None
+    ) -> PageState | None:
+        """There is never a next page."""
+        return None
 
-class ZoomDateJsonPaginator(BaseAPIPaginator[t.Optional[dict]]):
-    """Enhanced paginator for Zoom API with better testability."""
+
+class ZoomDateJsonPaginator(BaseAPIPaginator[t.Optional[PageState]]):
+    """Paginator for Zoom API streams that delegates every decision to its strategy.
+
+    The current value is a ``PageState``; the SDK passes it to ``get_url_params``
+    as the next page token.
+    """
 
     def __init__(
         self,
@@ -318,90 +362,23 @@ class ZoomDateJsonPaginator(BaseAPIPaginator[t.Optional[dict]]):
             args: Paginator positional arguments for base class.
             kwargs: Paginator keyword arguments for base class.
         """
-        super().__init__(None, *args, **kwargs)
+        super().__init__(pagination_strategy.start_state(), *args, **kwargs)
         self._jsonpath = jsonpath
         self.logger = logger
         self.pagination_strategy = pagination_strategy
-        self._sub_page_count = 0
-        self._last_seen_record: dict[str, t.Any] = {}
 
     @override
-    def get_next(self, response: requests.Response) -> dict | None:
-        """Get the next page token using the pagination strategy.
+    def get_next(self, response: requests.Response) -> PageState | None:
+        """Get the state of the next page from the pagination strategy.
 
         Args:
             response: API response object.
 
         Returns:
-            The next page token.
+            The next page state, or None after the last page.
         """
-        req_url = response.request.url
-        self.logger.debug("Request URL: {}".format(req_url))
-        
-        # Delegate to strategy to extract pagination data
-        pagination_data = self.pagination_strategy.extract_pagination_data(response, req_url)
-        
-        # Store data for advance/has_more logic
-        self._last_seen_record = pagination_data
-        
-        # Return appropriate next page token based on strategy
-        if not pagination_data.get("has_more"):
-            return None
-            
-        result = {
-            "next_page_token": pagination_data.get("next_page_token"),
-            "last_from": pagination_data.get("last_from"),
-            "last_to": pagination_data.get("last_to"),
-            "last_page_in_batch": self._is_last_page_in_batch(pagination_data)
-        }
-        self.logger.debug(f"[{getattr(self, 'stream_name', getattr(self, 'name', None))}] Returning pagination object: {result}")
-        return result
-
-    def advance(self, response):
-        """Advance the pagination state based on strategy."""
-        if isinstance(self.pagination_strategy, (TokenBasedDateRangePaginationStrategy, PageCountBasedDateRangePaginationStrategy)):
-            # Date range strategies handle page counting
-            if self._last_seen_record and self._last_seen_record.get("last_page_in_batch"):
-                self._sub_page_count = 1  # Reset for new batch
-            else:
-                self._sub_page_count += 1
-        else:
-            # Other strategies don't need page counting
-            pass
-        
-        return super().advance(response)
+        return self.pagination_strategy.next_state(response, self._value)
 
     def continue_if_empty(self, response: requests.Response) -> bool:
         """Continue pagination even if the response is empty."""
         return True
-
-    def has_more(self, response):
-        """Determine if there are more pages based on strategy."""
-        if isinstance(self.pagination_strategy, (TokenBasedDateRangePaginationStrategy, PageCountBasedDateRangePaginationStrategy)):
-            # Date range strategies check date boundaries
-            return self._has_more_date_range()
-        elif isinstance(self.pagination_strategy, TokenPaginationStrategy):
-            # Token strategy checks for next token
-            return bool(self._last_seen_record.get("next_page_token"))
-        else:
-            # Single page strategy never has more
-            return False
-    
-    def _is_last_page_in_batch(self, pagination_data: dict) -> bool:
-        """Determine if this is the last page in a date range batch."""
-        if isinstance(self.pagination_strategy, (TokenBasedDateRangePaginationStrategy, PageCountBasedDateRangePaginationStrategy)):
-            page_count = pagination_data.get("page_count", 0)
-            return self._sub_page_count == page_count
-        return False
-
-    def _has_more_date_range(self) -> bool:
-        """Check if there are more pages in date range pagination."""
-        if (self._last_seen_record and 
-            self._sub_page_count == self._last_seen_record.get("page_count") and 
-            self._last_seen_record.get("last_to")):
-            # Check if we've reached the current date
-            last_to_datetime = datetime.fromisoformat(self._last_seen_record["last_to"])
-            return last_to_datetime < datetime.now(timezone.utc)
-        return True
-
-
@@ -0,0 +1,193 @@
+"""Concurrent fetching of a stream's partitions ahead of the SDK sync loop.
+
+The SDK syncs the partitions of a stream one after another. ``PartitionPrefetcher``
+keeps the next few partitions in the stream's order fetching in the background,
+so while the records of one partition are emitted, the partitions after it are
+already being requested. Each partition in flight hands its records over page
+by page through a ``PartitionBuffer`` holding at most ``max_pages`` pages, so
+memory is bounded by ``lookahead`` times ``max_pages`` pages however many calls
+the busiest user has.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import typing as t
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+if t.TYPE_CHECKING:
+    from singer_sdk.helpers.types import Context
+
+
+DEFAULT_PARTITION_WORKERS = 8
+DEFAULT_BUFFERED_PAGES = 2
+
+
+def partition_key(context: Context) -> str:
+    """Return a hashable key for a partition context."""
+    return json.dumps(context, sort_keys=True)
+
+
+class PartitionAbandonedError(Exception):
+    """Raised to a fetch worker whose partition will no longer be read."""
+
+
+class PartitionBuffer:
+    """Bounded FIFO of the record pages of one partition, filled by a fetch worker."""
+
+    def __init__(self, max_pages: int = DEFAULT_BUFFERED_PAGES):
+        """Initialize an empty buffer holding at most `max_pages` pages."""
+        self.max_pages = max_pages
+        self._pages: deque[list[dict]] = deque()
+        self._condition = threading.Condition()
+        self._finished = False
+        self._abandoned = False
+        self._error: BaseException | None = None
+
+    def put(self, page: list[dict]) -> None:
+        """Add a page, blocking while the buffer is full.
+
+        Raises:
+            PartitionAbandonedError: If the partition will no longer be read.
+        """
+        with self._condition:
+            while len(self._pages) >= self.max_pages and not self._abandoned:
+                self._condition.wait()
+            if self._abandoned:
+                raise PartitionAbandonedError
+            self._pages.append(page)
+            self._condition.notify_all()
+
+    def finish(self, error: BaseException | None = None) -> None:
+        """Mark the partition as fetched, or as failed with `error`, if not already."""
+        with self._condition:
+            if self._finished:
+                return
+            self._finished = True
+            self._error = error
+            self._condition.notify_all()
+
+    def abandon(self) -> None:
+        """Drop the buffered pages and stop the worker filling the buffer."""
+        with self._condition:
+            self._abandoned = True
+            self._pages.clear()
+            self._condition.notify_all()
+
+    def __iter__(self) -> t.Iterator[dict]:
+        """Yield the partition's records as their pages arrive.
+
+        Raises:
+            BaseException: The error the partition's fetch failed with.
+        """
+        while True:
+            with self._condition:
+                while not self._pages and not self._finished:
+                    self._condition.wait()
+                if not self._pages:
+                    if self._error is not None:
+                        raise self._error
+                    return
+                page = self._pages.popleft()
+                self._condition.notify_all()
+            yield from page
+
+
+class PartitionPrefetcher:
+    """Fetch upcoming partitions in batches on a background thread pool."""
+
+    def __init__(
+        self,
+        partitions: t.Sequence[Context],
+        fetch_batch: t.Callable[[list[Context], list[PartitionBuffer]], None],
+        prepare: t.Callable[[Context], None],
+        workers: int = DEFAULT_PARTITION_WORKERS,
+        batch_size: int = 1,
+        max_pages: int = DEFAULT_BUFFERED_PAGES,
+    ):
+        """Initialize the prefetcher.
+
+        Args:
+            partitions: Partition contexts, in the order the SDK syncs them.
+            fetch_batch: Called on a worker thread with a list of contexts and
+                a buffer for each. It puts the pages of each context into its
+                buffer and finishes the buffer, with the error if one occurred.
+            prepare: Called on the caller's thread for each context before its
+                fetch is submitted, e.g. to write its starting bookmark.
+            workers: Number of worker threads.
+            batch_size: Number of contexts passed to each ``fetch_batch`` call.
+            max_pages: Number of pages buffered per partition in flight.
+        """
+        self._fetch_batch = fetch_batch
+        self._prepare = prepare
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_pages = max_pages
+        self.lookahead = workers * batch_size
+        self._upcoming: deque[Context] = deque(partitions)
+        self._buffers: dict[str, PartitionBuffer] = {}
+        self._executor: ThreadPoolExecutor | None = None
+
+    def records(self, context: Context) -> t.Iterator[dict]:
+        """Yield the records of a partition as its worker fetches them."""
+        key = partition_key(context)
+        if key not in self._buffers:
+            self._upcoming = deque(
+                upcoming
+                for upcoming in self._upcoming
+                if partition_key(upcoming) != key
+            )
+            self._upcoming.appendleft(context)
+        self._fill()
+
+        buffer = self._buffers.pop(key)
+        try:
+            yield from buffer
+        finally:
+            buffer.abandon()
+            self._fill()
+
+    def close(self) -> None:
+        """Stop the worker threads."""
+        for buffer in self._buffers.values():
+            buffer.abandon()
+        self._buffers.clear()
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def _fill(self) -> None:
+        """Submit upcoming partitions until ``lookahead`` are in flight."""
+        while self._upcoming and len(self._buffers) < self.lookahead:
+            batch: list[Context] = []
+            while self._upcoming and len(batch) < self.batch_size:
+                batch.append(self._upcoming.popleft())
+            self._submit(batch)
+
+    def _submit(self, batch: list[Context]) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="partition-fetch"
+            )
+        buffers = []
+        for context in batch:
+            self._prepare(context)
+            buffer = self._buffers[partition_key(context)] = PartitionBuffer(
+                self.max_pages
+            )
+            buffers.append(buffer)
+        self._executor.submit(self._fetch, batch, buffers)
+
+    def _fetch(self, batch: list[Context], buffers: list[PartitionBuffer]) -> None:
+        """Run ``fetch_batch`` on a worker, finishing any buffer it left open."""
+        error = None
+        try:
+            self._fetch_batch(batch, buffers)
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            for buffer in buffers:
+                buffer.finish(error)
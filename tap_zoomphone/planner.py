@@ -0,0 +1,261 @@
+"""Backfill planning for the date-range streams.
+
+The planner walks the windows a sync would request, probes each one with a
+single ``page_size=1`` request and reads ``total_records`` from the reply. From
+those counts it projects the page requests, the ``call_history_path`` child
+requests and the time the backfill needs at the configured rate limits.
+
+Endpoints that do not report a count, such as ``/sms/sessions``, are recorded
+with an unknown count and assumed to take one page per window. Empty windows
+still take the one page request that finds them empty.
+
+The resulting plan is written as JSON. Passing it back to the tap with the
+``backfill_plan`` setting limits a run to the windows that contain records.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+import typing as t
+from datetime import datetime, timezone
+
+from tap_zoomphone import rate_limits
+from tap_zoomphone.client import ZoomPhoneStream
+from tap_zoomphone.timestamps import parse_timestamp
+
+if t.TYPE_CHECKING:
+    from singer_sdk.helpers.types import Context
+
+    from tap_zoomphone.tap import TapZoomPhone
+
+
+class BackfillPlan:
+    """The windows, record counts and projected requests of a backfill."""
+
+    def __init__(self, plan: dict):
+        """Initialize the plan from its JSON form."""
+        self.plan = plan
+
+    @classmethod
+    def load(cls, path: str) -> BackfillPlan:
+        """Load a plan from a JSON file."""
+        with open(path, encoding="utf-8") as plan_file:
+            return cls(json.load(plan_file))
+
+    def dump(self, fp: t.TextIO) -> None:
+        """Write the plan as JSON."""
+        json.dump(self.plan, fp, indent=2)
+        fp.write("\n")
+
+    def window_filter(self, stream_name: str) -> t.Callable[[datetime], bool] | None:
+        """Return a filter accepting the planned windows that contain records.
+
+        Windows are matched by month, so a run resuming from a later bookmark
+        inside a planned window still recognises it. Windows starting after the
+        last planned window are accepted too, so a plan executed some time
+        after it was made still reaches the present.
+        Streams missing from the plan are not filtered.
+        """
+        stream_plan = self.plan["streams"].get(stream_name)
+        if stream_plan is None:
+            return None
+
+        def _month(window_start: datetime) -> tuple[int, int]:
+            return window_start.year, window_start.month
+
+        windows = stream_plan["windows"]
+        planned = [_month(parse_timestamp(window["from"])) for window in windows]
+        selected = {
+            _month(parse_timestamp(window["from"]))
+            for window in windows
+            if window["total_records"] != 0
+        }
+        last_planned = max(planned, default=None)
+
+        def _filter(window_start: datetime) -> bool:
+            month = _month(window_start)
+            if last_planned is None or month > last_planned:
+                return True
+            return month in selected
+
+        return _filter
+
+    def summary(self) -> str:
+        """Return a human readable summary of the plan."""
+        lines = []
+        for stream_name, stream_plan in self.plan["streams"].items():
+            windows = stream_plan["windows"]
+            lines.append(
+                f"{stream_name}: {len(windows)} windows, "
+                f"{stream_plan['total_records']} records, "
+                f"{stream_plan['page_requests']} page requests, "
+                f"{stream_plan['child_requests']} child requests"
+            )
+            lines.extend(
+                f"  {window['from']} -> {window['to']}: "
+                f"{window['total_records']} records, "
+                f"{window['page_requests']} pages"
+                for window in windows
+            )
+        for category, count in self.plan["requests_by_category"].items():
+            lines.append(f"{category} requests: {count}")
+        hours = self.plan["estimated_seconds"] / 3600
+        lines.append(f"estimated time at configured rate limits: {hours:.2f} hours")
+        lines.append(f"estimated days at daily quotas: {self.plan['estimated_days']}")
+        return "\n".join(lines)
+
+
+class BackfillPlanner:
+    """Probe the windows of the date-range streams and build a BackfillPlan."""
+
+    def __init__(self, tap: TapZoomPhone):
+        """Initialize the planner for a configured tap."""
+        self.tap = tap
+
+    def date_range_streams(self) -> list[ZoomPhoneStream]:
+        """Return the selected top-level streams that page through date windows."""
+        return [
+            stream
+            for stream in self.tap.streams.values()
+            if isinstance(stream, ZoomPhoneStream)
+            and stream.selected
+            and stream.parent_stream_type is None
+            and stream.has_date_windows
+        ]
+
+    def probe_window(
+        self,
+        stream: ZoomPhoneStream,
+        context: Context | None,
+        window_from: str,
+        window_to: str,
+    ) -> int | None:
+        """Return the number of records in a window using a one-record request.
+
+        With ``page_size=1`` the ``page_count`` equals the record count, so it is
+        used when ``total_records`` is missing. Returns None if neither is present.
+        """
+        response = stream.request_window_sample(context, window_from, window_to)
+        body = response.json()
+        total_records = body.get("total_records", body.get("page_count"))
+        return None if total_records is None else int(total_records)
+
+    def plan_stream(self, stream: ZoomPhoneStream) -> dict:
+        """Probe every window of a stream and project its requests."""
+        windows: list[dict[str, t.Any]] = []
+        contexts: list[Context | None] = (
+            [*stream.partitions] if stream.partitions else [None]
+        )
+        page_size = stream.page_size
+        for context in contexts:
+            for window_from, window_to in stream.iter_windows(context):
+                total_records = self.probe_window(
+                    stream, context, window_from, window_to
+                )
+                if total_records is None or page_size is None:
+                    page_requests = 1
+                else:
+                    page_requests = max(1, math.ceil(total_records / page_size))
+                windows.append(
+                    {
+                        "from": window_from,
+                        "to": window_to,
+                        "total_records": total_records,
+                        "page_requests": page_requests,
+                    }
+                )
+
+        total_records = sum(window["total_records"] or 0 for window in windows)
+        children = [
+            child
+            for child in stream.child_streams
+            if isinstance(child, ZoomPhoneStream)
+            and (child.selected or child.has_selected_descendents)
+        ]
+        return {
+            "api_category": stream.api_category,
+            "page_size": stream.page_size,
+            "windows": windows,
+            "total_records": total_records,
+            "page_requests": sum(window["page_requests"] for window in windows),
+            "probe_requests": len(windows),
+            "child_requests": total_records * len(children),
+            "child_categories": [child.api_category for child in children],
+        }
+
+    def build(self) -> BackfillPlan:
+        """Probe all date-range streams and return the plan."""
+        streams = {
+            stream.name: self.plan_stream(stream)
+            for stream in self.date_range_streams()
+        }
+
+        requests_by_category: dict[str, int] = {}
+        for stream_plan in streams.values():
+            category = stream_plan["api_category"]
+            requests_by_category[category] = (
+                requests_by_category.get(category, 0) + stream_plan["page_requests"]
+            )
+            for child_category in stream_plan["child_categories"]:
+                requests_by_category[child_category] = (
+                    requests_by_category.get(child_category, 0)
+                    + stream_plan["total_records"]
+                )
+
+        config = self.tap.config
+        estimated_seconds = sum(
+            count / rate_limits.requests_per_second(config, category)
+            for category, count in requests_by_category.items()
+        )
+        estimated_days = max(
+            [
+                math.ceil(count / quota)
+                for category, count in requests_by_category.items()
+                if (quota := rate_limits.daily_quota(config, category))
+            ],
+            default=1,
+        )
+        return BackfillPlan(
+            {
+                "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "streams": streams,
+                "requests_by_category": requests_by_category,
+                "estimated_seconds": round(estimated_seconds, 1),
+                "estimated_days": max(estimated_days, 1),
+            }
+        )
+
+
+def main(argv: t.Sequence[str] | None = None) -> None:
+    """Build a backfill plan, print a summary to stderr and the plan as JSON."""
+    from tap_zoomphone.tap import TapZoomPhone
+
+    parser = argparse.ArgumentParser(
+        description="Estimate the requests and quota a tap-zoomphone backfill needs."
+    )
+    parser.add_argument("--config", required=True, action="append", help="Config file")
+    parser.add_argument("--state", help="State file the backfill would start from")
+    parser.add_argument("--output", help="Write the plan here instead of stdout")
+    args = parser.parse_args(argv)
+
+    state = None
+    if args.state:
+        with open(args.state, encoding="utf-8") as state_file:
+            state = json.load(state_file)
+
+    tap = TapZoomPhone(config=args.config, state=state)
+    plan = BackfillPlanner(tap).build()
+    sys.stderr.write(plan.summary() + "\n")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as plan_file:
+            plan.dump(plan_file)
+    else:
+        plan.dump(sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
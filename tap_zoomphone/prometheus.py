@@ -0,0 +1,263 @@
+"""Prometheus exposition of the tap's runtime metrics.
+
+Streams update a process-wide ``MetricsRegistry`` with plain counters, gauges
+and histograms: once per emitted record for the record counter, and once per
+request or page for everything else. Nothing is logged. The registry is
+published in the Prometheus text format, either by rewriting a file for the
+node_exporter textfile collector every ``metrics_interval_seconds`` (and once
+more at exit), or by a local HTTP endpoint serving ``/metrics`` for long runs.
+
+Published metrics:
+
+- ``tap_zoomphone_records_total{stream}``: records emitted.
+- ``tap_zoomphone_requests_in_flight{stream}``: requests sent but not answered.
+- ``tap_zoomphone_request_duration_seconds{stream}``: request latency histogram.
+- ``tap_zoomphone_rate_limit_remaining{category,type}``: the last
+  ``X-RateLimit-Remaining`` reported by Zoom.
+- ``tap_zoomphone_retries_total{stream,reason}``: retried request attempts.
+- ``tap_zoomphone_window_start_seconds{stream}``: start of the date window
+  most recently requested by a date-range stream, as a Unix timestamp.
+- ``tap_zoomphone_http_responses_total{stream,connection,encoding}``: responses
+  received, by whether their request opened a ``new`` connection or ``reused``
+  a pooled one, and by ``Content-Encoding`` (``identity`` if uncompressed).
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+import typing as t
+from bisect import bisect_left
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RECORDS = "tap_zoomphone_records_total"
+IN_FLIGHT = "tap_zoomphone_requests_in_flight"
+REQUEST_DURATION = "tap_zoomphone_request_duration_seconds"
+RATE_LIMIT_REMAINING = "tap_zoomphone_rate_limit_remaining"
+RETRIES = "tap_zoomphone_retries_total"
+WINDOW_START = "tap_zoomphone_window_start_seconds"
+HTTP_RESPONSES = "tap_zoomphone_http_responses_total"
+
+METRICS = {
+    RECORDS: ("counter", "Records emitted per stream."),
+    IN_FLIGHT: ("gauge", "Requests sent and not yet answered."),
+    REQUEST_DURATION: ("histogram", "Request latency in seconds."),
+    RATE_LIMIT_REMAINING: ("gauge", "Last X-RateLimit-Remaining reported by Zoom."),
+    RETRIES: ("counter", "Request attempts that were retried."),
+    WINDOW_START: ("gauge", "Start of the date window most recently requested."),
+    HTTP_RESPONSES: ("counter", "Responses by connection reuse and content encoding."),
+}
+
+DEFAULT_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+DEFAULT_METRICS_INTERVAL_SECONDS = 15
+DEFAULT_METRICS_HOST = "127.0.0.1"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _labels(labels: t.Mapping[str, str]) -> Labels:
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels: Labels, extra: tuple[str, str] | None = None) -> str:
+    pairs = [*labels, extra] if extra else list(labels)
+    if not pairs:
+        return ""
+    escaped = (
+        name
+        + '="'
+        + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        + '"'
+        for name, value in pairs
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class _Histogram:
+    __slots__ = ("count", "counts", "sum")
+
+    def __init__(self, bucket_count: int):
+        self.counts = [0] * bucket_count
+        self.sum = 0.0
+        self.count = 0
+
+
+class MetricsRegistry:
+    """Thread-safe store of labelled counters, gauges and histograms."""
+
+    def __init__(self, buckets: t.Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        """Initialize an empty registry with the given histogram buckets."""
+        self.buckets = tuple(buckets)
+        self._values: dict[str, dict[Labels, float]] = defaultdict(dict)
+        self._histograms: dict[str, dict[Labels, _Histogram]] = defaultdict(dict)
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, labels: t.Mapping[str, str], value: float = 1) -> None:
+        """Add to a counter, or to a gauge such as the requests in flight."""
+        key = _labels(labels)
+        with self._lock:
+            series = self._values[name]
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, labels: t.Mapping[str, str], value: float) -> None:
+        """Set a gauge."""
+        with self._lock:
+            self._values[name][_labels(labels)] = value
+
+    def observe(self, name: str, labels: t.Mapping[str, str], value: float) -> None:
+        """Add an observation to a histogram."""
+        key = _labels(labels)
+        with self._lock:
+            histogram = self._histograms[name].get(key)
+            if histogram is None:
+                histogram = self._histograms[name][key] = _Histogram(len(self.buckets))
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                histogram.counts[index] += 1
+            histogram.sum += value
+            histogram.count += 1
+
+    def value(self, name: str, labels: t.Mapping[str, str]) -> float | None:
+        """Return the current value of a counter or gauge."""
+        with self._lock:
+            return self._values[name].get(_labels(labels))
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, (kind, description) in METRICS.items():
+                series = (
+                    self._histograms[name]
+                    if kind == "histogram"
+                    else self._values[name]
+                )
+                if not series:
+                    continue
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} {kind}")
+                if kind != "histogram":
+                    lines.extend(
+                        f"{name}{_format_labels(labels)} {_format_value(value)}"
+                        for labels, value in sorted(series.items())
+                    )
+                    continue
+                for labels, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(self.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(
+                            f"{name}_bucket{_format_labels(labels, ('le', repr(bound)))} "
+                            f"{cumulative}"
+                        )
+                    lines.append(
+                        f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} "
+                        f"{histogram.count}"
+                    )
+                    lines.append(
+                        f"{name}_sum{_format_labels(labels)} {histogram.sum!r}"
+                    )
+                    lines.append(
+                        f"{name}_count{_format_labels(labels)} {histogram.count}"
+                    )
+        return "\n".join(lines) + "\n"
+
+
+def write_textfile(registry: MetricsRegistry, path: str) -> None:
+    """Atomically replace `path` with the rendered registry."""
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w", encoding="utf-8") as textfile:
+        textfile.write(registry.render())
+    os.replace(temporary, path)
+
+
+class TextfileExporter:
+    """Rewrite a textfile collector file periodically on a daemon thread."""
+
+    def __init__(self, registry: MetricsRegistry, path: str, interval: float):
+        """Initialize the exporter; call ``start`` to begin writing."""
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="metrics-textfile", daemon=True
+        )
+
+    def start(self) -> None:
+        """Start the writer thread and write a final file at interpreter exit."""
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """Stop the writer thread after writing the file one last time."""
+        self._stopped.set()
+        write_textfile(self.registry, self.path)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            write_textfile(self.registry, self.path)
+
+
+def serve_http(registry: MetricsRegistry, host: str, port: int) -> ThreadingHTTPServer:
+    """Serve the registry at ``/metrics`` on a daemon thread."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: t.Any) -> None:  # noqa: A002
+            """Do not log scrapes."""
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="metrics-http", daemon=True
+    ).start()
+    return server
+
+
+_registries: dict[tuple, MetricsRegistry] = {}
+
+
+def get_metrics_registry(config: t.Mapping[str, t.Any]) -> MetricsRegistry | None:
+    """Return the registry shared by all streams, starting its exporters once.
+
+    Returns None unless ``metrics_textfile`` or ``metrics_port`` is set.
+    """
+    textfile = config.get("metrics_textfile")
+    port = config.get("metrics_port")
+    if not textfile and not port:
+        return None
+
+    host = config.get("metrics_host", DEFAULT_METRICS_HOST)
+    key = (textfile, host, port)
+    registry = _registries.get(key)
+    if registry is None:
+        registry = _registries[key] = MetricsRegistry()
+        if textfile:
+            TextfileExporter(
+                registry,
+                textfile,
+                config.get(
+                    "metrics_interval_seconds", DEFAULT_METRICS_INTERVAL_SECONDS
+                ),
+            ).start()
+        if port:
+            serve_http(registry, host, port)
+    return registry
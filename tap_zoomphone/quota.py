@@ -0,0 +1,233 @@
+"""Persistent ledger of daily API quota use and a spool of deferred child fetches.
+
+Zoom's daily quotas are shared by every run of the app during a UTC day, so
+the ledger keeps the requests spent per rate limit category and day in a JSON
+file under ``state_dir``. When the remaining heavy quota reaches the reserve,
+``call_history`` stops requesting ``call_history_path`` and appends the call
+ids to a spool file instead. The next run drains the spool before paginating,
+and only removes it once every spooled child was synced.
+
+Counts are kept in memory and the file is rewritten every
+``DEFAULT_FLUSH_REQUESTS`` requests or ``DEFAULT_FLUSH_SECONDS`` seconds, when
+a stream writes its state and when the process exits.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import typing as t
+from datetime import datetime, timezone
+from pathlib import Path
+
+from tap_zoomphone import rate_limits
+
+QUOTA_LEDGER_FILENAME = "quota_ledger.json"
+DEFAULT_QUOTA_RESERVE = 0
+DEFAULT_FLUSH_REQUESTS = 100
+DEFAULT_FLUSH_SECONDS = 30.0
+
+_ledgers: dict[Path, QuotaLedger] = {}
+
+
+def _today() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+class QuotaLedger:
+    """Requests spent per rate limit category and UTC day, persisted to disk."""
+
+    def __init__(
+        self,
+        path: Path,
+        config: t.Mapping[str, t.Any],
+        flush_requests: int = DEFAULT_FLUSH_REQUESTS,
+        flush_seconds: float = DEFAULT_FLUSH_SECONDS,
+    ):
+        """Initialize the ledger, loading today's counts if the file exists.
+
+        Args:
+            path: JSON file holding the counts.
+            config: Tap config providing ``daily_quotas`` and ``quota_reserve``.
+            flush_requests: Requests recorded before the file is rewritten.
+            flush_seconds: Seconds after which a recorded request is written.
+        """
+        self.path = path
+        self.config = config
+        self.reserve = config.get("quota_reserve", DEFAULT_QUOTA_RESERVE)
+        self.flush_requests = flush_requests
+        self.flush_seconds = flush_seconds
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self._saved_at = time.monotonic()
+        self._days: dict[str, dict[str, int]] = {}
+        if path.exists():
+            self._days = json.loads(path.read_text(encoding="utf-8"))
+
+    def spent(self, category: str) -> int:
+        """Return the requests spent today in a category."""
+        return self._days.get(_today(), {}).get(category, 0)
+
+    def remaining(self, category: str) -> int | None:
+        """Return the requests left today in a category, or None if it has no quota."""
+        quota = rate_limits.daily_quota(self.config, category)
+        if quota is None:
+            return None
+        return max(quota - self.spent(category), 0)
+
+    def exhausted(self, category: str, pending: int = 0) -> bool:
+        """Return True if `pending` more requests would eat into the reserve."""
+        remaining = self.remaining(category)
+        return remaining is not None and remaining - pending <= self.reserve
+
+    def spend(self, category: str, count: int = 1) -> None:
+        """Record requests made in a category, persisting the ledger now and then."""
+        with self._lock:
+            self._add(category, count)
+
+    def observe_remaining(self, category: str, remaining: int) -> None:
+        """Raise today's count to match a quota remaining value reported by Zoom.
+
+        Other apps or runs may share the quota, so the server's figure wins when
+        it shows more requests spent than the ledger knows about.
+        """
+        quota = rate_limits.daily_quota(self.config, category)
+        if quota is None:
+            return
+        with self._lock:
+            behind = (quota - remaining) - self.spent(category)
+            if behind > 0:
+                self._add(category, behind)
+
+    def flush(self) -> None:
+        """Write the counts recorded since the last write, if any."""
+        with self._lock:
+            if self._unsaved:
+                self._save()
+
+    def _add(self, category: str, count: int) -> None:
+        """Add to today's count (called holding the lock)."""
+        today = _today()
+        day = self._days.setdefault(today, {})
+        day[category] = day.get(category, 0) + count
+        # Only today's counts matter, older days are dropped on write.
+        self._days = {today: day}
+        self._unsaved += count
+        if (
+            self._unsaved >= self.flush_requests
+            or time.monotonic() - self._saved_at >= self.flush_seconds
+        ):
+            self._save()
+
+    def _save(self) -> None:
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._days), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self._unsaved = 0
+        self._saved_at = time.monotonic()
+
+
+class ChildSpool:
+    """Append-only file of child contexts whose fetch was deferred.
+
+    A drain first moves the file aside, so contexts deferred again meanwhile
+    start a new spool, and deletes the moved file once every context in it was
+    synced. If syncing fails, the contexts not known to be synced are written
+    back ahead of the new spool; a drain killed outright leaves the moved file,
+    which the next drain picks up again.
+    """
+
+    def __init__(self, path: Path):
+        """Initialize the spool backed by a JSON lines file."""
+        self.path = path
+        self.draining_path = path.with_suffix(".draining")
+
+    def put(self, context: dict) -> None:
+        """Append a deferred child context."""
+        with self.path.open("a", encoding="utf-8") as spool_file:
+            spool_file.write(json.dumps(context) + "\n")
+
+    def __len__(self) -> int:
+        return len(self._read(self.draining_path)) + len(self._read(self.path))
+
+    def drain(
+        self,
+        sync: t.Callable[[dict], None],
+        flush: t.Callable[[], None] | None = None,
+        progress: t.Callable[[], int] | None = None,
+    ) -> int:
+        """Sync every spooled context, oldest first, and return how many there were.
+
+        Args:
+            sync: Called with each spooled context.
+            flush: Called once every context was passed to `sync`, when `sync`
+                only queues the context.
+            progress: With `flush`, returns how many of the queued contexts
+                were synced so far, oldest first. Without it, no queued context
+                counts as synced until `flush` returns.
+        """
+        if self.path.exists():
+            if self.draining_path.exists():
+                self._write(
+                    self.draining_path,
+                    self._read(self.draining_path) + self._read(self.path),
+                )
+                self.path.unlink()
+            else:
+                os.replace(self.path, self.draining_path)
+        contexts = self._read(self.draining_path)
+
+        synced = 0
+        try:
+            for context in contexts:
+                sync(context)
+                if flush is None:
+                    synced += 1
+            if flush is not None:
+                flush()
+        except BaseException:
+            if flush is not None and progress is not None:
+                synced = progress()
+            self._write(self.path, contexts[synced:] + self._read(self.path))
+            self.draining_path.unlink()
+            raise
+
+        self.draining_path.unlink(missing_ok=True)
+        return len(contexts)
+
+    @staticmethod
+    def _read(path: Path) -> list[dict]:
+        if not path.exists():
+            return []
+        with path.open(encoding="utf-8") as spool_file:
+            return [json.loads(line) for line in spool_file if line.strip()]
+
+    @staticmethod
+    def _write(path: Path, contexts: list[dict]) -> None:
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(
+            "".join(json.dumps(context) + "\n" for context in contexts),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, path)
+
+
+def get_quota_ledger(state_dir: str, config: t.Mapping[str, t.Any]) -> QuotaLedger:
+    """Return the process-wide ledger stored in `state_dir`.
+
+    Streams share one ledger so that the counts of all categories are written
+    to the same file.
+    """
+    path = Path(state_dir) / QUOTA_LEDGER_FILENAME
+    if path not in _ledgers:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _ledgers[path] = QuotaLedger(path, config)
+    return _ledgers[path]
+
+
+def flush_quota_ledgers() -> None:
+    """Write the pending counts of every process-wide ledger."""
+    for ledger in _ledgers.values():
+        ledger.flush()
@@ -0,0 +1,37 @@
+"""Zoom API rate limit categories and their default limits.
+
+Zoom groups endpoints into rate limit categories. Every category has a
+per-second limit and the heavy category also has a daily quota shared by all
+requests of the app. The defaults are the Pro plan limits and can be
+overridden with the ``rate_limits`` and ``daily_quotas`` settings.
+"""
+
+from __future__ import annotations
+
+import typing as t
+
+LIGHT = "light"
+MEDIUM = "medium"
+HEAVY = "heavy"
+
+DEFAULT_REQUESTS_PER_SECOND: dict[str, float] = {
+    LIGHT: 30,
+    MEDIUM: 20,
+    HEAVY: 10,
+}
+
+DEFAULT_DAILY_QUOTAS: dict[str, int] = {
+    HEAVY: 30_000,
+}
+
+
+def requests_per_second(config: t.Mapping[str, t.Any], category: str) -> float:
+    """Return the configured per-second request limit of a category."""
+    limits = config.get("rate_limits") or {}
+    return limits.get(category, DEFAULT_REQUESTS_PER_SECOND[category])
+
+
+def daily_quota(config: t.Mapping[str, t.Any], category: str) -> int | None:
+    """Return the configured daily request quota of a category, if it has one."""
+    quotas = config.get("daily_quotas") or {}
+    return quotas.get(category, DEFAULT_DAILY_QUOTAS.get(category))
@@ -0,0 +1,166 @@
+"""Error classification, retry waits and a per-endpoint circuit breaker.
+
+Zoom errors are retried according to what caused them:
+
+- 429 responses wait for the ``Retry-After`` the API sends. A wait longer than
+  ``max_retry_after`` (e.g. the daily quota resetting tomorrow) is not retried.
+- 5xx responses and connection errors back off exponentially with full jitter.
+- 404 responses on child endpoints such as ``/call_history/{id}`` mean the
+  record was deleted; they raise ``RecordNotFoundError`` and are skipped.
+
+Server errors also feed a circuit breaker per stream endpoint. Once the error
+rate among recent requests crosses the threshold, the breaker opens and every
+request to that endpoint waits out the cooldown before it is sent.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+import typing as t
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from singer_sdk.exceptions import FatalAPIError, RetriableAPIError
+
+if t.TYPE_CHECKING:
+    import requests
+
+DEFAULT_MAX_RETRY_AFTER = 300
+DEFAULT_BACKOFF_FACTOR = 2
+DEFAULT_BACKOFF_MAX = 60
+DEFAULT_CIRCUIT_BREAKER_THRESHOLD = 0.5
+DEFAULT_CIRCUIT_BREAKER_COOLDOWN = 30
+CIRCUIT_BREAKER_WINDOW = 20
+CIRCUIT_BREAKER_MIN_REQUESTS = 10
+
+
+class RateLimitedError(RetriableAPIError):
+    """A 429 response, retried after the wait the API asked for."""
+
+    def __init__(
+        self,
+        message: str,
+        response: requests.Response | None = None,
+        retry_after: float | None = None,
+    ) -> None:
+        """Initialize the error with the ``Retry-After`` wait in seconds."""
+        super().__init__(message, response)
+        self.retry_after = retry_after
+
+
+class ServerError(RetriableAPIError):
+    """A 5xx response, retried with jittered exponential backoff."""
+
+
+class RecordNotFoundError(FatalAPIError):
+    """A 404 response for a single record, which is skipped without retrying."""
+
+
+class RetryAfterTooLongError(FatalAPIError):
+    """A 429 response asking for a longer wait than the tap is willing to sleep."""
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Return the wait in seconds of a ``Retry-After`` header, if valid.
+
+    The header is either a number of seconds or an HTTP date.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def retry_wait_generator(
+    factor: float = DEFAULT_BACKOFF_FACTOR,
+    max_value: float = DEFAULT_BACKOFF_MAX,
+) -> t.Generator[float, BaseException, None]:
+    """Yield the wait before each retry, given the exception that caused it.
+
+    Follows the ``backoff`` wait generator protocol: it is primed with an empty
+    send and then receives each exception. Rate limited errors wait for their
+    ``Retry-After``; everything else waits a random time up to an exponentially
+    growing cap. The waits are already jittered.
+    """
+    attempt = 0
+    exception = yield  # type: ignore[misc]
+    while True:
+        retry_after = getattr(exception, "retry_after", None)
+        if retry_after is not None:
+            wait = retry_after
+        else:
+            wait = random.uniform(0, min(max_value, factor * 2**attempt))  # noqa: S311
+            attempt += 1
+        exception = yield wait
+
+
+class CircuitBreaker:
+    """Pause requests to an endpoint while its recent error rate is too high."""
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_CIRCUIT_BREAKER_THRESHOLD,
+        cooldown: float = DEFAULT_CIRCUIT_BREAKER_COOLDOWN,
+        window: int = CIRCUIT_BREAKER_WINDOW,
+        min_requests: int = CIRCUIT_BREAKER_MIN_REQUESTS,
+    ):
+        """Initialize a closed breaker.
+
+        Args:
+            threshold: Error rate among the last `window` requests that opens it.
+            cooldown: Seconds requests are paused once it opens.
+            window: Number of recent outcomes considered.
+            min_requests: Outcomes required before the error rate is trusted.
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.min_requests = min_requests
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while requests are paused."""
+        return time.monotonic() < self._open_until
+
+    def delay(self) -> float:
+        """Return the seconds to wait before the next request may be sent."""
+        return max(self._open_until - time.monotonic(), 0.0)
+
+    def record_success(self) -> None:
+        """Record a request that did not fail with a server error."""
+        with self._lock:
+            self._outcomes.append(True)
+
+    def record_failure(self) -> bool:
+        """Record a server error, opening the breaker if the error rate spiked.
+
+        Returns:
+            True if this failure opened the breaker.
+        """
+        with self._lock:
+            self._outcomes.append(False)
+            failures = self._outcomes.count(False)
+            if (
+                self.is_open
+                or len(self._outcomes) < self.min_requests
+                or failures / len(self._outcomes) < self.threshold
+            ):
+                return False
+            self._open_until = time.monotonic() + self.cooldown
+            # Judge the endpoint afresh once the cooldown ends.
+            self._outcomes.clear()
+            return True
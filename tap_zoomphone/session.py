@@ -0,0 +1,108 @@
+"""Connection pooling shared by the streams' requests sessions.
+
+Every stream has its own ``requests.Session``, as the SDK creates it, but they
+all send requests through one ``PooledHTTPAdapter`` per process, so a
+connection to ``api.zoom.us`` opened by one stream is reused by the others.
+The pool holds ``http_pool_size`` connections per host; by default enough for
+every thread that may share a session (the user partition workers, the page
+prefetch thread and the main thread), and never fewer than requests' 10.
+
+Sockets are opened with TCP keep-alive, so that idle pooled connections are
+not silently dropped by load balancers between pages. Each response records
+whether its request opened a connection (a TCP and TLS handshake) or reused a
+pooled one. The adapters are closed at the end of a sync.
+"""
+
+from __future__ import annotations
+
+import socket
+import threading
+import typing as t
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+from tap_zoomphone.partitions import DEFAULT_PARTITION_WORKERS
+
+DEFAULT_POOL_SIZE = 10
+KEEPALIVE_SOCKET_OPTIONS = [
+    *HTTPConnection.default_socket_options,
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+
+
+def pool_size(config: t.Mapping[str, t.Any]) -> int:
+    """Return the number of connections to keep per host."""
+    if config.get("http_pool_size"):
+        return config["http_pool_size"]
+    workers = config.get("user_partition_workers", DEFAULT_PARTITION_WORKERS)
+    return max(DEFAULT_POOL_SIZE, workers + 2)
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTP adapter with keep-alive sockets that tells reused connections apart.
+
+    Sets ``connection_reused`` on every response it returns.
+    """
+
+    def __init__(self, pool_maxsize: int = DEFAULT_POOL_SIZE):
+        """Initialize the adapter with `pool_maxsize` connections per host."""
+        self._connected = threading.local()
+        super().__init__(pool_maxsize=pool_maxsize)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        """Create the pool manager with keep-alive sockets and counted connects."""
+        pool_kwargs.setdefault("socket_options", KEEPALIVE_SOCKET_OPTIONS)
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: self._counting_pool_class(pool_class)
+            for scheme, pool_class in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+    def _counting_pool_class(self, pool_class: type) -> type:
+        """Return a subclass of `pool_class` whose connections flag each connect."""
+        connected = self._connected
+
+        class CountingConnection(pool_class.ConnectionCls):
+            def connect(self) -> None:
+                connected.value = True
+                super().connect()
+
+        return type(
+            pool_class.__name__, (pool_class,), {"ConnectionCls": CountingConnection}
+        )
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        **kwargs: t.Any,
+    ) -> requests.Response:
+        """Send a request, noting whether it had to open a connection."""
+        self._connected.value = False
+        response = super().send(request, **kwargs)
+        response.connection_reused = not self._connected.value
+        return response
+
+
+_adapters: dict[int, PooledHTTPAdapter] = {}
+
+
+def get_http_adapter(config: t.Mapping[str, t.Any]) -> PooledHTTPAdapter:
+    """Return the process-wide adapter for the configured pool size."""
+    size = pool_size(config)
+    if size not in _adapters:
+        _adapters[size] = PooledHTTPAdapter(pool_maxsize=size)
+    return _adapters[size]
+
+
+def close_http_adapters() -> None:
+    """Close the connections of every process-wide adapter."""
+    while _adapters:
+        _adapters.popitem()[1].close()
+
+
+def configure_session(session: requests.Session, adapter: PooledHTTPAdapter) -> None:
+    """Send a session's requests through `adapter`."""
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
@@ -0,0 +1,193 @@
+"""Date-range sharding of backfills across several tap processes.
+
+With ``shard: "k/n"`` each date-range stream only requests the month windows
+owned by shard ``k`` of ``n`` and keeps its bookmark in a state partition named
+after the shard. Once every shard has finished, ``tap-zoomphone-merge-shards``
+combines the shard states into one state for incremental runs, dropping the
+shard key from every partition.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import typing as t
+
+from tap_zoomphone.integrity import STATE_KEY as WINDOW_MISMATCHES_KEY
+
+if t.TYPE_CHECKING:
+    from datetime import datetime
+
+SHARD_PATTERN = re.compile(r"^\s*(\d+)\s*/\s*(\d+)\s*$")
+CONTEXT_KEY = "shard"
+
+
+class Shard:
+    """One shard ``index`` of ``count``, numbered from 1."""
+
+    def __init__(self, index: int, count: int):
+        """Initialize the shard.
+
+        Raises:
+            ValueError: If the index is not between 1 and count.
+        """
+        if count < 1 or not 1 <= index <= count:
+            msg = f"Invalid shard {index}/{count}, expected 1 <= k <= n"
+            raise ValueError(msg)
+        self.index = index
+        self.count = count
+
+    @classmethod
+    def parse(cls, value: str) -> Shard:
+        """Parse a ``k/n`` shard specification.
+
+        Raises:
+            ValueError: If the value is not in ``k/n`` form.
+        """
+        match = SHARD_PATTERN.match(value)
+        if not match:
+            msg = f"Invalid shard '{value}', expected the form k/n"
+            raise ValueError(msg)
+        return cls(int(match.group(1)), int(match.group(2)))
+
+    def owns_window(self, window_start: datetime) -> bool:
+        """Return True if the month window starting at `window_start` belongs to this shard.
+
+        Months are assigned round-robin, so consecutive months go to different
+        shards and the assignment does not depend on the start date or bookmark.
+        """
+        month_index = window_start.year * 12 + window_start.month - 1
+        return month_index % self.count == self.index - 1
+
+    @property
+    def context(self) -> dict[str, str]:
+        """Return the state partition context of this shard."""
+        return {CONTEXT_KEY: str(self)}
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Shard):
+            return NotImplemented
+        return (self.index, self.count) == (other.index, other.count)
+
+    def __hash__(self) -> int:
+        return hash((self.index, self.count))
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+    def __repr__(self) -> str:
+        return f"Shard({self.index}, {self.count})"
+
+
+def _merge_partition(partitions: t.Sequence[dict]) -> dict:
+    """Merge the states one partition reached in each shard.
+
+    Fields are taken from the shard with the highest replication key value, and
+    the window mismatches of every shard are kept.
+    """
+    merged: dict = {}
+    mismatches: dict[tuple[str, str], dict] = {}
+    for partition in sorted(
+        partitions, key=lambda partition: partition.get("replication_key_value") or ""
+    ):
+        merged.update(partition)
+        for entry in partition.get(WINDOW_MISMATCHES_KEY, []):
+            mismatches[entry["from"], entry["to"]] = entry
+    merged.pop("context", None)
+    merged.pop(WINDOW_MISMATCHES_KEY, None)
+    if mismatches:
+        merged[WINDOW_MISMATCHES_KEY] = [
+            mismatches[window] for window in sorted(mismatches)
+        ]
+    return merged
+
+
+def merge_shard_states(states: t.Sequence[dict]) -> dict:
+    """Merge the final states of all shards into a single state.
+
+    For each stream with shard partitions, the partitions are grouped by their
+    context without the shard key, e.g. per user, and each merged bookmark is
+    the highest replication key value any shard reached for it. This is only
+    valid once every shard has completed, so all ``n`` shards must be present.
+    A stream partitioned by shard alone gets an unpartitioned bookmark. Streams
+    without shard partitions are copied from the first state that contains them.
+
+    Args:
+        states: The final STATE value emitted by each shard.
+
+    Returns:
+        The merged state.
+
+    Raises:
+        ValueError: If a stream is missing some of its shards.
+    """
+    merged: dict[str, dict] = {}
+    shard_bookmarks: dict[str, list[dict]] = {}
+
+    for state in states:
+        for stream_name, stream_state in state.get("bookmarks", {}).items():
+            shard_partitions = [
+                partition
+                for partition in stream_state.get("partitions", [])
+                if CONTEXT_KEY in partition.get("context", {})
+            ]
+            if shard_partitions:
+                shard_bookmarks.setdefault(stream_name, []).extend(shard_partitions)
+            else:
+                merged.setdefault(stream_name, stream_state)
+
+    for stream_name, partitions in shard_bookmarks.items():
+        shards = {
+            Shard.parse(partition["context"][CONTEXT_KEY]) for partition in partitions
+        }
+        counts = {shard.count for shard in shards}
+        indexes = {shard.index for shard in shards}
+        if len(counts) != 1 or indexes != set(range(1, counts.pop() + 1)):
+            found = sorted(str(shard) for shard in shards)
+            msg = f"Stream '{stream_name}' is missing shard states, found {found}"
+            raise ValueError(msg)
+
+        groups: dict[str, tuple[dict, list[dict]]] = {}
+        for partition in partitions:
+            context = {
+                key: value
+                for key, value in partition["context"].items()
+                if key != CONTEXT_KEY
+            }
+            key = json.dumps(context, sort_keys=True)
+            groups.setdefault(key, (context, []))[1].append(partition)
+
+        if list(groups) == ["{}"]:
+            merged[stream_name] = _merge_partition(groups["{}"][1])
+            continue
+        merged[stream_name] = {
+            "partitions": [
+                {"context": context, **_merge_partition(group)}
+                for context, group in groups.values()
+            ]
+        }
+
+    return {"bookmarks": merged}
+
+
+def main(argv: t.Sequence[str] | None = None) -> None:
+    """Merge shard state files and print the merged state as JSON."""
+    parser = argparse.ArgumentParser(
+        description="Merge the state files written by sharded tap-zoomphone runs."
+    )
+    parser.add_argument("states", nargs="+", help="State file of each shard")
+    args = parser.parse_args(argv)
+
+    states = []
+    for path in args.states:
+        with open(path, encoding="utf-8") as state_file:
+            states.append(json.load(state_file))
+
+    json.dump(merge_shard_states(states), sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
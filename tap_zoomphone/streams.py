@@ -2,25 +2,41 @@
 
 from __future__ import annotations
 
-import sys
 import typing as t
+from datetime import datetime, timezone
+from functools import cached_property
 from importlib import resources
-
-if sys.version_info < (3, 12):
-    from typing_extensions import override
-else:
-    from typing import override  # noqa: ICN003
+from itertools import islice
+from pathlib import Path
 
 from dateutil.relativedelta import relativedelta
 
+from tap_zoomphone import rate_limits
+from tap_zoomphone.change_index import RecordHashIndex, record_hash
+from tap_zoomphone.child_queue import (
+    DEFAULT_MAX_PENDING_CHILD_CONTEXTS,
+    ChildFetchQueue,
+)
 from tap_zoomphone.client import ZoomPhoneStream
+from tap_zoomphone.dedupe import (
+    DEFAULT_BLOOM_ERROR_RATE,
+    DEFAULT_MAX_DIGESTS,
+    RecordDeduplicator,
+)
 from tap_zoomphone.pagination import (
-    TokenPaginationStrategy,
-    TokenBasedDateRangePaginationStrategy,
     PageCountBasedDateRangePaginationStrategy,
     SinglePageStrategy,
+    TokenBasedDateRangePaginationStrategy,
+    TokenPaginationStrategy,
 )
-
+from tap_zoomphone.partitions import (
+    DEFAULT_PARTITION_WORKERS,
+    PartitionAbandonedError,
+    PartitionPrefetcher,
+)
+from tap_zoomphone.quota import ChildSpool
+from tap_zoomphone.retry import RecordNotFoundError
+from tap_zoomphone.users_index import UsersIndex, enrichment_properties
 
 SCHEMAS_DIR = resources.files(__package__) / "schemas"
 
@@ -33,12 +49,83 @@ class UsersStream(ZoomPhoneStream):
     primary_keys: t.ClassVar[list[str]] = ["id"]
     replication_key = None
     records_jsonpath = "$.users[*]"
-    
-    schema_filepath = SCHEMAS_DIR / "zoom_phone_users_schema.json"  # noqa: ERA001
-    
+
+    schema_filepath = SCHEMAS_DIR / "zoom_phone_users_schema.json"
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the stream, adding the deletion marker to the schema if needed."""
+        super().__init__(*args, **kwargs)
+        self._users_index: UsersIndex | None = None
+        if self.change_index is not None and self.config.get("users_emit_deletions"):
+            self._schema["properties"]["_sdc_deleted_at"] = {
+                "type": ["string", "null"],
+                "format": "date-time",
+            }
+
     def get_pagination_strategy(self):
         """Return the pagination strategy for this stream."""
-        return TokenPaginationStrategy(page_size=self._page_size)
+        return TokenPaginationStrategy(page_size=self.page_size)
+
+    @cached_property
+    def change_index(self):
+        """Return the index of emitted user hashes, if change detection is enabled."""
+        state_dir = self.config.get("state_dir")
+        if not state_dir or not self.config.get("users_change_detection"):
+            return None
+        return RecordHashIndex(Path(state_dir) / f"{self.name}_index.json")
+
+    def get_users_index(self):
+        """Return the index of every user, listing the users if this run has not."""
+        if self._users_index is None:
+            self._users_index = UsersIndex(self.request_records(None))
+            self.logger.info("Indexed %d users for enrichment", len(self._users_index))
+        return self._users_index
+
+    def start_poll(self):
+        """List users again for the index on every poll."""
+        super().start_poll()
+        self._users_index = None
+
+    def _index_users(self, records):
+        """Index users as they are listed, keeping the index once all are."""
+        index = UsersIndex()
+        for record in records:
+            index.add(record)
+            yield record
+        self._users_index = index
+
+    def get_records(self, context):
+        """Yield only new or changed users when change detection is enabled.
+
+        Users missing from a complete listing are emitted with ``_sdc_deleted_at``
+        if ``users_emit_deletions`` is set. The index is saved once every user
+        has been listed, so an interrupted run re-emits its changes next time.
+        The listing also builds the index used by ``enrich_participants``.
+        """
+        records = super().get_records(context)
+        if self.config.get("enrich_participants") and self._users_index is None:
+            records = self._index_users(records)
+
+        if self.change_index is None:
+            yield from records
+            return
+
+        seen = set()
+        for record in records:
+            seen.add(record["id"])
+            if self.change_index.changed(record["id"], record_hash(record)):
+                yield record
+
+        deleted = [
+            user_id for user_id in self.change_index.keys() if user_id not in seen
+        ]
+        deleted_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        for user_id in deleted:
+            self.change_index.discard(user_id)
+            if self.config.get("users_emit_deletions"):
+                yield {"id": user_id, "_sdc_deleted_at": deleted_at}
+        self.change_index.save()
+
 
 class SmsSessionsStream(ZoomPhoneStream):
     """Define custom stream."""
@@ -48,19 +135,36 @@ class SmsSessionsStream(ZoomPhoneStream):
     primary_keys: t.ClassVar[list[str]] = ["session_id"]
     replication_key = "last_access_time"
     records_jsonpath = "$.sms_sessions[*]"
-    schema_filepath = SCHEMAS_DIR / "zoom_phone_sms_sessions_schema.json"  # noqa: ERA001
-    
+    schema_filepath = SCHEMAS_DIR / "zoom_phone_sms_sessions_schema.json"
+
     _history_window = relativedelta(months=6)
-    
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the stream, adding the enrichment columns if needed."""
+        super().__init__(*args, **kwargs)
+        if self.config.get("enrich_participants"):
+            participant = self._schema["properties"]["participants"]["items"]
+            participant["properties"].update(enrichment_properties([""]))
+
     def get_pagination_strategy(self):
         """Return the pagination strategy for this stream."""
         return TokenBasedDateRangePaginationStrategy(
-            page_size=self._page_size,
+            page_size=self.page_size,
             history_window=self._history_window,
             logger=self.logger,
-            stream=self
+            stream=self,
+            window_filter=self.window_filter,
         )
-    
+
+    def post_process(self, row, context=None):
+        """Fill each participant's site, department and cost center, if enabled."""
+        if self.users_index is not None:
+            for participant in row.get("participants") or []:
+                owner = participant.get("owner") or {}
+                self.users_index.enrich_user(participant, owner.get("id"))
+        return row
+
+
 class CallHistoryStream(ZoomPhoneStream):
     """Define custom stream."""
 
@@ -69,23 +173,344 @@ class CallHistoryStream(ZoomPhoneStream):
     primary_keys: t.ClassVar[list[str]] = ["id"]
     replication_key = "start_time"
     records_jsonpath = "$.call_logs[*]"
-    schema_filepath = SCHEMAS_DIR / "zoom_phone_call_history_schema.json"  # noqa: ERA001
-    
+    schema_filepath = SCHEMAS_DIR / "zoom_phone_call_history_schema.json"
+
     _page_size = 300
+    _max_page_size = 300
     _history_window = relativedelta(months=6)
-    
+    _deferring_children = False
+    _child_spool_drained = False
+    api_category = rate_limits.HEAVY
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the stream, adding the enrichment columns if needed."""
+        super().__init__(*args, **kwargs)
+        if self.config.get("enrich_participants"):
+            self._schema["properties"].update(enrichment_properties())
+
     def get_pagination_strategy(self):
-        """Return the pagination strategy for this stream."""
-        return PageCountBasedDateRangePaginationStrategy(
-            page_size=self._page_size,
+        """Return the pagination strategy for this stream.
+
+        The per-user endpoint pages with a token only, unlike ``/call_history``.
+        """
+        strategy_class = (
+            TokenBasedDateRangePaginationStrategy
+            if self.user_partitioned
+            else PageCountBasedDateRangePaginationStrategy
+        )
+        return strategy_class(
+            page_size=self.page_size,
             history_window=self._history_window,
             logger=self.logger,
-            stream=self
+            stream=self,
+            window_filter=self.window_filter,
         )
-    
+
     def get_child_context(self, record, context):
-        return { "id": record["id"]}
-    
+        """Return the call whose path the child streams request."""
+        return {"id": record["id"]}
+
+    def post_process(self, row, context=None):
+        """Fill in the site, department and cost center of both parties, if enabled."""
+        if self.users_index is not None:
+            self.users_index.enrich_parties(row)
+        return row
+
+    @cached_property
+    def user_partitioned(self):
+        """Return True if call logs are requested per user.
+
+        Enabled with ``call_history_partitioning: user``.
+        """
+        return self.config.get("call_history_partitioning", "account") == "user"
+
+    @property
+    def partitions(self):
+        """Return one partition per user when partitioned by user."""
+        if self.user_partitioned:
+            return self.user_partitions
+        return super().partitions
+
+    @cached_property
+    def user_partitions(self):
+        """Return the partition contexts of every user listed by the users stream.
+
+        The listing is requested directly rather than through the users stream's
+        records, which may be limited to changed users. In repair mode only the
+        users with incomplete windows are synced, so no listing is needed.
+        """
+        if self.repair_partitions is not None:
+            return [
+                context
+                for context, _ in self.repair_partitions
+                if context and "user_id" in context
+            ]
+        shard_context = self.shard.context if self.shard is not None else {}
+        users_stream = self._tap.streams[UsersStream.name]
+        return [
+            {"user_id": user["id"], **shard_context}
+            for user in users_stream.request_records(None)
+        ]
+
+    def get_url(self, context):
+        """Return the per-user endpoint for a user partition."""
+        if context and "user_id" in context:
+            return f"{self.url_base}/users/{context['user_id']}/call_history"
+        return super().get_url(context)
+
+    @property
+    def skip_missing_records(self):
+        """Skip users deleted since they were listed."""
+        return self.user_partitioned or super().skip_missing_records
+
+    @cached_property
+    def deduplicator(self):
+        """Return the duplicate filter, which every user partition shares.
+
+        A call shows up in the partition of each user taking part in it, and
+        each partition starts again at its own bookmark, so the same call can
+        arrive months apart, beyond the month buckets kept exactly. Without the
+        filter it would be emitted, and its path fetched, once per participant.
+        """
+        if not self.user_partitioned:
+            return super().deduplicator
+        return RecordDeduplicator(
+            self.primary_keys,
+            window_key=self.replication_key,
+            bloom_capacity=self.config.get("dedupe_bloom_capacity", 0),
+            bloom_error_rate=self.config.get(
+                "dedupe_bloom_error_rate", DEFAULT_BLOOM_ERROR_RATE
+            ),
+            max_digests=self.config.get("dedupe_max_keys", DEFAULT_MAX_DIGESTS),
+        )
+
+    @cached_property
+    def partition_prefetcher(self):
+        """Return the prefetcher requesting upcoming user partitions concurrently.
+
+        With the async engine one worker fetches batches of partitions on the
+        engine's event loop; otherwise each partition is fetched on its own thread.
+        """
+        workers = self.config.get("user_partition_workers", DEFAULT_PARTITION_WORKERS)
+        if self.http_engine is not None:
+            return PartitionPrefetcher(
+                self.user_partitions,
+                fetch_batch=self.http_engine.stream_many,
+                prepare=self._write_starting_replication_value,
+                workers=1,
+                batch_size=workers,
+            )
+
+        # Cached properties are not locked on Python 3.12+, so the ones the
+        # workers use are created before they start.
+        for name in (
+            "_pagination_strategy",
+            "circuit_breaker",
+            "decode_pool",
+            "metrics_registry",
+            "page_sizer",
+            "quota_ledger",
+            "response_cache",
+            "trace_sink",
+            "window_integrity",
+        ):
+            getattr(self, name)
+        return PartitionPrefetcher(
+            self.user_partitions,
+            fetch_batch=self._fetch_user_partitions,
+            prepare=self._write_starting_replication_value,
+            workers=workers,
+        )
+
+    def _fetch_user_partitions(self, contexts, buffers):
+        """Request the records of user partitions (runs on a prefetch worker)."""
+        with self.concurrent_fetch():
+            for context, buffer in zip(contexts, buffers):
+                try:
+                    self._stream_user_records(context, buffer)
+                except PartitionAbandonedError:
+                    continue
+                except Exception as exc:  # noqa: BLE001
+                    buffer.finish(exc)
+                else:
+                    buffer.finish()
+
+    def _stream_user_records(self, context, buffer):
+        """Put the call logs of a user into `buffer` a page at a time.
+
+        A user that no longer exists has no call logs.
+        """
+        records = iter(super().request_records(context))
+        try:
+            while page := list(islice(records, self.page_size or self._page_size)):
+                buffer.put(page)
+        except RecordNotFoundError as exc:
+            self.logger.warning("Skipping user %s: %s", context["user_id"], exc)
+
+    def start_poll(self):
+        """List users again and retry spooled child contexts on every poll."""
+        super().start_poll()
+        self._child_spool_drained = False
+        if "partition_prefetcher" in self.__dict__:
+            self.__dict__.pop("partition_prefetcher").close()
+        self.__dict__.pop("user_partitions", None)
+
+    def close_http_engine(self):
+        """Stop the partition prefetcher before closing the engine it fetches on."""
+        if "partition_prefetcher" in self.__dict__:
+            self.__dict__.pop("partition_prefetcher").close()
+        super().close_http_engine()
+
+    def request_records(self, context):
+        """Return the prefetched records of a user partition, or request them."""
+        if context and "user_id" in context:
+            yield from self.partition_prefetcher.records(context)
+        else:
+            yield from super().request_records(context)
+
+    @cached_property
+    def child_queue(self):
+        """Return the bounded queue feeding concurrent child fetches."""
+        return ChildFetchQueue(
+            fetch_batch=self._fetch_child_batch,
+            sync_child=self._sync_fetched_children,
+            apply_bookmark=self._apply_bookmark,
+            batch_size=self.http_engine.max_concurrency,
+            max_pending=self.config.get(
+                "max_pending_child_contexts", DEFAULT_MAX_PENDING_CHILD_CONTEXTS
+            ),
+        )
+
+    def _selected_child_streams(self):
+        return [
+            child_stream
+            for child_stream in self.child_streams
+            if child_stream.selected or child_stream.has_selected_descendents
+        ]
+
+    def _fetch_child_batch(self, contexts):
+        """Fetch a batch of child contexts concurrently (runs on the queue worker)."""
+        return list(
+            zip(
+                *(
+                    child.fetch_many(contexts)
+                    for child in self._selected_child_streams()
+                )
+            )
+        )
+
+    def _sync_fetched_children(self, child_context, results):
+        """Sync the children of one call from their fetched records."""
+        for child_stream, records in zip(self._selected_child_streams(), results):
+            child_stream.set_prefetched(child_context, records)
+        super()._sync_children(child_context)
+
+    def _apply_bookmark(self, record, context):
+        super()._increment_stream_state(record, context=context)
+
+    @cached_property
+    def child_spool(self):
+        """Return the spool of call ids whose children were deferred, if enabled."""
+        state_dir = self.config.get("state_dir")
+        if not state_dir:
+            return None
+        return ChildSpool(Path(state_dir) / f"{self.name}_child_spool.jsonl")
+
+    def _defer_children(self, child_context):
+        """Spool the child context if the day's quota is too low to fetch it."""
+        if self.quota_ledger is None or self.child_spool is None:
+            return False
+
+        pending = self.child_queue.pending if self.http_engine is not None else 0
+        if not any(
+            self.quota_ledger.exhausted(child_stream.api_category, pending)
+            for child_stream in self._selected_child_streams()
+        ):
+            return False
+
+        if not self._deferring_children:
+            self._deferring_children = True
+            self.logger.warning(
+                "Daily quota reserve reached, deferring child fetches to %s",
+                self.child_spool.path,
+            )
+        self.child_spool.put(child_context)
+        return True
+
+    def _drain_child_spool(self):
+        """Sync the children deferred by earlier runs, re-spooling any still over quota.
+
+        A failing child leaves only the deferred contexts not yet synced in the
+        spool, including those the async engine had queued behind it.
+        """
+        pending = len(self.child_spool)
+        if pending:
+            self.logger.info("Syncing %d deferred child contexts", pending)
+        if self.http_engine is None:
+            self.child_spool.drain(self._sync_children)
+            return
+        queue = self.child_queue
+        start = queue.synced
+        self.child_spool.drain(
+            self._sync_children,
+            flush=queue.join,
+            progress=lambda: queue.synced - start,
+        )
+
+    def _sync_children(self, child_context):
+        """Queue child contexts so the async engine can fetch them concurrently.
+
+        Children are spooled instead when the daily quota reserve is reached.
+        """
+        if (
+            child_context is not None
+            and self._selected_child_streams()
+            and self._defer_children(child_context)
+        ):
+            return
+
+        if (
+            self.http_engine is None
+            or child_context is None
+            or not self._selected_child_streams()
+        ):
+            super()._sync_children(child_context)
+            return
+
+        self.child_queue.put_child(child_context)
+
+    def _increment_stream_state(self, latest_record, *, context=None):
+        """Hold bookmark updates until the children of earlier calls are synced."""
+        if self.http_engine is None or not self.replication_key:
+            super()._increment_stream_state(latest_record, context=context)
+            return
+
+        self.child_queue.put_bookmark(
+            {self.replication_key: latest_record[self.replication_key]}, context
+        )
+
+    def get_records(self, context):
+        """Yield parent records, then sync any child contexts still queued.
+
+        Child contexts spooled by an earlier run are synced first. The queue's
+        worker thread is stopped once the records are done, even on failure.
+        """
+        try:
+            if (
+                self.child_spool is not None
+                and not self._child_spool_drained
+                and self._selected_child_streams()
+            ):
+                self._child_spool_drained = True
+                self._drain_child_spool()
+            yield from super().get_records(context)
+            if self.http_engine is not None:
+                self.child_queue.join()
+        finally:
+            if "child_queue" in self.__dict__:
+                self.child_queue.close()
+
+
 class CallHistoryPathStream(ZoomPhoneStream):
     """Define custom stream."""
 
@@ -93,46 +518,146 @@ class CallHistoryPathStream(ZoomPhoneStream):
     path = "/call_history"
     primary_keys: t.ClassVar[list[str]] = ["id"]
     records_jsonpath = "$"
-    schema_filepath = SCHEMAS_DIR / "zoom_phone_call_history_path_schema.json"  # noqa: ERA001
+    schema_filepath = SCHEMAS_DIR / "zoom_phone_call_history_path_schema.json"
     parent_stream_type = CallHistoryStream
     ignore_parent_replication_key = False
-    
+
     state_partitioning_keys = []
+    api_category = rate_limits.HEAVY
     _page_size = None
     _LOG_REQUEST_METRICS = False
-    
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the stream with an empty prefetch buffer."""
+        super().__init__(*args, **kwargs)
+        self._prefetched: dict[str, list[dict]] = {}
+        if self.config.get("enrich_participants"):
+            properties = self._schema["properties"]
+            properties.update(enrichment_properties())
+            properties["call_path"]["items"]["properties"].update(
+                enrichment_properties()
+            )
+
     def get_pagination_strategy(self):
         """Return the pagination strategy for this stream."""
         return SinglePageStrategy()
 
-    
+    def fetch_many(self, contexts):
+        """Fetch the call paths of many calls, concurrently with the async engine.
+
+        Returns one list of records per context, in order.
+        """
+        if self.http_engine is not None:
+            return self.http_engine.fetch_many(contexts)
+        return [self._request_or_skip(context) for context in contexts]
+
+    def _request_or_skip(self, context):
+        """Request the records of a call, or none if the call no longer exists."""
+        try:
+            return list(self.request_records(context))
+        except RecordNotFoundError as exc:
+            self.logger.warning("Skipping call %s: %s", context["id"], exc)
+            return []
+
+    def set_prefetched(self, context, records):
+        """Hold fetched records until `get_records` is called for the context."""
+        self._prefetched[context["id"]] = records
+
+    def get_child_context(self, record, context):
+        """Hand the call path to the legs stream, which flattens it locally."""
+        for child_stream in self.child_streams:
+            if child_stream.selected:
+                child_stream.set_call_path(record["id"], record.get("call_path") or [])
+        return {"id": record["id"]}
+
+    def get_records(self, context):
+        """Return prefetched records for the context, or request them directly."""
+        prefetched = self._prefetched.pop(context["id"], None) if context else None
+        if prefetched is None:
+            yield from self._request_or_skip(context)
+        else:
+            yield from prefetched
+
     def get_url(self, context):
+        """Return the URL of the call's path."""
         url = super().get_url(context)
         id = context["id"]
-        return  f"{url}/{id}"
+        return f"{url}/{id}"
 
     def _log_metric(self, point):
         """Override to disable all metrics logging."""
-        pass
-    
+
     def _write_request_duration_log(self, endpoint, response, context, extra_tags):
         """Override to disable request duration logging."""
-        pass
-    
-    def post_process(self, row, context = None):
+
+    def post_process(self, row, context=None):
         """Zoom API has been returning items outside schema with training spaces"""
-        
-        result_reason = row.get('result_reason')
-        row['result_reason'] = result_reason.strip() if result_reason else None
+        result_reason = row.get("result_reason")
+        row["result_reason"] = result_reason.strip() if result_reason else None
 
         # Also clean up result_reason in each item of call_path array, if present
-        call_path = row.get('call_path')
+        call_path = row.get("call_path")
         if isinstance(call_path, list):
             for i, item in enumerate(call_path):
                 if isinstance(item, dict):
-                    rr = item.get('result_reason')
+                    rr = item.get("result_reason")
                     if rr is not None and isinstance(rr, str):
-                        item['result_reason'] = rr.strip()
+                        item["result_reason"] = rr.strip()
             # The list is already updated in-place, but to be explicit:
-            row['call_path'] = call_path
+            row["call_path"] = call_path
+
+        if self.users_index is not None:
+            self.users_index.enrich_parties(row)
+            for item in call_path or []:
+                if isinstance(item, dict):
+                    self.users_index.enrich_parties(item)
         return row
+
+
+class CallHistoryPathLegsStream(ZoomPhoneStream):
+    """One record per item of a call's ``call_path``.
+
+    The legs are taken from the ``call_history_path`` record of the same call,
+    so no request is made, and the stream never sets up a session or paginator.
+    Deselect ``call_history_path`` to get the legs without the nested rows.
+    """
+
+    name = "call_history_path_legs"
+    path = "/call_history"
+    primary_keys: t.ClassVar[list[str]] = ["call_history_id", "leg_index"]
+    schema_filepath = SCHEMAS_DIR / "zoom_phone_call_history_path_legs_schema.json"
+    parent_stream_type = CallHistoryPathStream
+    ignore_parent_replication_key = False
+
+    state_partitioning_keys = []
+    _LOG_REQUEST_METRICS = False
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the stream with no call paths pending.
+
+        The enrichment columns are filled on the legs by ``call_history_path``.
+        """
+        super().__init__(*args, **kwargs)
+        self._call_path: tuple[str, list[dict]] | None = None
+        if self.config.get("enrich_participants"):
+            self._schema["properties"].update(enrichment_properties())
+
+    def set_call_path(self, call_id, call_path):
+        """Hold a call's path until `get_records` is called for the call.
+
+        Only the latest call's path is held, so the path of a call whose legs
+        are not synced, e.g. one a stream map filters out, is dropped with the
+        next call rather than kept for the rest of the run.
+        """
+        self._call_path = (call_id, call_path)
+
+    def get_records(self, context):
+        """Yield the legs of the call, tagged with the call id and their position."""
+        call_id = context["id"]
+        held, self._call_path = self._call_path, None
+        call_path = held[1] if held is not None and held[0] == call_id else []
+        for leg_index, leg in enumerate(call_path):
+            yield {**leg, "call_history_id": call_id, "leg_index": leg_index}
+
+    def _log_metric(self, point):
+        """Override to disable all metrics logging."""
@@ -2,12 +2,24 @@
 
 from __future__ import annotations
 
+import atexit
 import logging
+import weakref
 
 from singer_sdk import Tap, metrics
 from singer_sdk import typing as th  # JSON schema typing helpers
+from singer_sdk.helpers._state import StateWriter
 
 from tap_zoomphone import streams
+from tap_zoomphone.client import ZoomPhoneStream
+from tap_zoomphone.decoding import shutdown_decode_pools
+from tap_zoomphone.quota import flush_quota_ledgers
+from tap_zoomphone.session import close_http_adapters
+from tap_zoomphone.writer import (
+    DEFAULT_WRITER_FLUSH_BYTES,
+    DEFAULT_WRITER_FLUSH_INTERVAL_SECONDS,
+    BufferedSingerWriter,
+)
 
 
 class TapZoomPhone(Tap):
@@ -15,13 +27,12 @@ class TapZoomPhone(Tap):
 
     name = "tap-zoomphone"
 
-    
     config_jsonschema = th.PropertiesList(
         th.Property(
             "client_id",
             th.StringType,
             required=True,
-            secret=False, 
+            secret=False,
             title="oAuth Client ID",
             description="The Client ID for the account_credentials oAuth flow",
         ),
@@ -45,20 +56,516 @@ class TapZoomPhone(Tap):
             th.DateTimeType,
             description="The earliest record date to sync",
         ),
+        th.Property(
+            "shard",
+            th.StringType,
+            title="Shard",
+            description=(
+                "Limit call_history and sms_sessions to the month windows of shard "
+                "k of n, given as 'k/n'. Each shard keeps its bookmark in its own "
+                "state partition; merge them with tap-zoomphone-merge-shards"
+            ),
+        ),
+        th.Property(
+            "http_engine",
+            th.StringType,
+            default="requests",
+            allowed_values=["requests", "async"],
+            title="HTTP Engine",
+            description=(
+                "'requests' for the SDK's synchronous request loop, or 'async' to send "
+                "requests through an asyncio engine (requires the 'async' extra)"
+            ),
+        ),
+        th.Property(
+            "max_concurrent_requests",
+            th.IntegerType,
+            default=100,
+            title="Max Concurrent Requests",
+            description=(
+                "Maximum number of requests in flight at once when using the async "
+                "engine, also the size of each concurrent call_history_path batch"
+            ),
+        ),
+        th.Property(
+            "page_sizes",
+            th.ObjectType(
+                th.Property("users", th.IntegerType),
+                th.Property("sms_sessions", th.IntegerType),
+                th.Property("call_history", th.IntegerType),
+            ),
+            title="Page Sizes",
+            description=(
+                "Records requested per page for each stream, up to the endpoint's "
+                "maximum (100, and 300 for call_history). Defaults to the maximum"
+            ),
+        ),
+        th.Property(
+            "adaptive_page_size",
+            th.BooleanType,
+            default=False,
+            title="Adaptive Page Size",
+            description=(
+                "Shrink page sizes when pages are slow, large or time out, and grow "
+                "them back while full pages stay fast and small"
+            ),
+        ),
+        th.Property(
+            "adaptive_page_size_target_seconds",
+            th.NumberType,
+            default=5,
+            title="Adaptive Page Size Target Seconds",
+            description="Longest a page may take before adaptive_page_size shrinks it",
+        ),
+        th.Property(
+            "adaptive_page_size_max_bytes",
+            th.IntegerType,
+            default=4194304,
+            title="Adaptive Page Size Max Bytes",
+            description="Largest a page may be before adaptive_page_size shrinks it",
+        ),
+        th.Property(
+            "http_pool_size",
+            th.IntegerType,
+            title="HTTP Pool Size",
+            description=(
+                "Connections to api.zoom.us kept open for reuse by the requests "
+                "engine. Defaults to user_partition_workers + 2, at least 10"
+            ),
+        ),
+        th.Property(
+            "max_pending_child_contexts",
+            th.IntegerType,
+            default=10000,
+            title="Max Pending Child Contexts",
+            description=(
+                "Number of call_history_path fetches that may be queued behind the "
+                "call_history stream before its pagination pauses. Only the async "
+                "engine queues fetches; the requests engine fetches each path inline"
+            ),
+        ),
+        th.Property(
+            "call_history_partitioning",
+            th.StringType,
+            default="account",
+            allowed_values=["account", "user"],
+            title="Call History Partitioning",
+            description=(
+                "'account' to page through /call_history, or 'user' to request the "
+                "call logs of every user listed by the users stream as a separate "
+                "partition with its own bookmark"
+            ),
+        ),
+        th.Property(
+            "user_partition_workers",
+            th.IntegerType,
+            default=8,
+            title="User Partition Workers",
+            description=(
+                "Number of users whose call logs are requested concurrently when "
+                "call_history_partitioning is 'user'"
+            ),
+        ),
+        th.Property(
+            "poll_interval_seconds",
+            th.NumberType,
+            default=60,
+            title="Poll Interval Seconds",
+            description=(
+                "Seconds between the starts of two polls of tap-zoomphone-daemon"
+            ),
+        ),
+        th.Property(
+            "page_prefetch",
+            th.BooleanType,
+            default=False,
+            title="Page Prefetch",
+            description=(
+                "Request the next page of paginated streams in the background while "
+                "the records of the current page are processed"
+            ),
+        ),
+        th.Property(
+            "decode_workers",
+            th.IntegerType,
+            default=0,
+            title="Decode Workers",
+            description=(
+                "Number of worker processes used to decode large JSON responses "
+                "while other pages are in flight (page_prefetch, per-user "
+                "partitions or the async engine), 0 to decode in the main process"
+            ),
+        ),
+        th.Property(
+            "decode_min_bytes",
+            th.IntegerType,
+            default=65536,
+            title="Decode Minimum Bytes",
+            description=(
+                "Responses smaller than this are decoded in the main process even "
+                "when decode_workers is set"
+            ),
+        ),
+        th.Property(
+            "lookback_hours",
+            th.NumberType,
+            default=0,
+            title="Lookback Hours",
+            description=(
+                "Hours before the bookmark that call_history and sms_sessions rescan "
+                "to pick up late records. With state_dir set, rescanned records that "
+                "did not change are not emitted again"
+            ),
+        ),
+        th.Property(
+            "dedupe_records",
+            th.BooleanType,
+            default=False,
+            title="Dedupe Records",
+            description=(
+                "Drop records whose primary key was already emitted in the current "
+                "or previous month window, along with their child fetches. "
+                "call_history partitioned by user always drops every repeated call id"
+            ),
+        ),
+        th.Property(
+            "dedupe_bloom_capacity",
+            th.IntegerType,
+            default=0,
+            title="Dedupe Bloom Capacity",
+            description=(
+                "Expected number of records per stream for a Bloom filter that also "
+                "drops duplicates further apart. 0 disables the filter"
+            ),
+        ),
+        th.Property(
+            "dedupe_bloom_error_rate",
+            th.NumberType,
+            default=0.0001,
+            title="Dedupe Bloom Error Rate",
+            description=(
+                "False positive rate of the dedupe Bloom filter, i.e. the share of "
+                "unique records it may drop"
+            ),
+        ),
+        th.Property(
+            "dedupe_max_keys",
+            th.IntegerType,
+            default=2_000_000,
+            title="Dedupe Max Keys",
+            description=(
+                "Number of call ids call_history partitioned by user remembers to "
+                "drop calls repeated in another user's partition, at 12 to 24 bytes "
+                "each. Past it, repeats are only dropped within recent month windows"
+            ),
+        ),
+        th.Property(
+            "verify_windows",
+            th.BooleanType,
+            default=True,
+            title="Verify Windows",
+            description=(
+                "Compare the records received for each call_history and sms_sessions "
+                "window with the total_records Zoom reports, and keep the windows "
+                "that differ in state"
+            ),
+        ),
+        th.Property(
+            "repair_windows",
+            th.BooleanType,
+            default=False,
+            title="Repair Windows",
+            description=(
+                "Only request the windows recorded in state as incomplete, leaving "
+                "the bookmark where it is"
+            ),
+        ),
+        th.Property(
+            "users_change_detection",
+            th.BooleanType,
+            default=False,
+            title="Users Change Detection",
+            description=(
+                "Only emit users that are new or changed since the last run, using "
+                "an index of record hashes kept in state_dir"
+            ),
+        ),
+        th.Property(
+            "users_emit_deletions",
+            th.BooleanType,
+            default=False,
+            title="Users Emit Deletions",
+            description=(
+                "With users_change_detection, emit users that are no longer listed "
+                "with _sdc_deleted_at set"
+            ),
+        ),
+        th.Property(
+            "enrich_participants",
+            th.BooleanType,
+            default=False,
+            title="Enrich Participants",
+            description=(
+                "Add the site name, department and cost center of the users taking "
+                "part in calls and SMS sessions, looked up in an index of users "
+                "listed once per run"
+            ),
+        ),
+        th.Property(
+            "response_cache_dir",
+            th.StringType,
+            title="Response Cache Directory",
+            description=(
+                "Directory of a compressed on-disk cache of call_history and "
+                "sms_sessions pages for windows older than immutability_horizon_days. "
+                "Entries are keyed by account, so taps of several accounts can share it"
+            ),
+        ),
+        th.Property(
+            "response_cache_max_bytes",
+            th.IntegerType,
+            default=1073741824,
+            title="Response Cache Max Bytes",
+            description=(
+                "Compressed size of the response cache above which the least "
+                "recently used entries are evicted"
+            ),
+        ),
+        th.Property(
+            "response_cache_ttl_days",
+            th.NumberType,
+            default=30,
+            title="Response Cache TTL Days",
+            description="Days a cached response is used before it is fetched again",
+        ),
+        th.Property(
+            "immutability_horizon_days",
+            th.NumberType,
+            default=3,
+            title="Immutability Horizon Days",
+            description=(
+                "Windows ending more than this many days ago are assumed not to "
+                "change and may be served from the response cache"
+            ),
+        ),
+        th.Property(
+            "max_retry_after",
+            th.NumberType,
+            default=300,
+            title="Max Retry-After",
+            description=(
+                "Longest Retry-After wait in seconds a rate limited request is "
+                "retried after. Longer waits, such as an exhausted daily quota, fail"
+            ),
+        ),
+        th.Property(
+            "circuit_breaker_threshold",
+            th.NumberType,
+            default=0.5,
+            title="Circuit Breaker Threshold",
+            description=(
+                "Share of recent requests to an endpoint failing with server or "
+                "connection errors that pauses further requests to it"
+            ),
+        ),
+        th.Property(
+            "circuit_breaker_cooldown",
+            th.NumberType,
+            default=30,
+            title="Circuit Breaker Cooldown",
+            description="Seconds requests to an endpoint are paused once its breaker opens",
+        ),
+        th.Property(
+            "rate_limits",
+            th.ObjectType(
+                th.Property("light", th.NumberType),
+                th.Property("medium", th.NumberType),
+                th.Property("heavy", th.NumberType),
+            ),
+            title="Rate Limits",
+            description=(
+                "Requests per second allowed for each Zoom rate limit category, "
+                "used to estimate backfill durations. Defaults to the Pro plan limits"
+            ),
+        ),
+        th.Property(
+            "daily_quotas",
+            th.ObjectType(
+                th.Property("light", th.IntegerType),
+                th.Property("medium", th.IntegerType),
+                th.Property("heavy", th.IntegerType),
+            ),
+            title="Daily Quotas",
+            description=(
+                "Requests per day allowed for each Zoom rate limit category. "
+                "Defaults to 30000 heavy requests"
+            ),
+        ),
+        th.Property(
+            "trace_file",
+            th.StringType,
+            title="Trace File",
+            description=(
+                "Append one JSON line per request to this file, with the stream, "
+                "window, page, status, latency, size and record count. Summarize "
+                "it with tap-zoomphone-trace-summary"
+            ),
+        ),
+        th.Property(
+            "metrics_textfile",
+            th.StringType,
+            title="Metrics Textfile",
+            description=(
+                "Path of a Prometheus textfile collector file rewritten with the "
+                "tap's runtime metrics every metrics_interval_seconds"
+            ),
+        ),
+        th.Property(
+            "metrics_interval_seconds",
+            th.NumberType,
+            default=15,
+            title="Metrics Interval Seconds",
+            description="Seconds between rewrites of metrics_textfile",
+        ),
+        th.Property(
+            "metrics_port",
+            th.IntegerType,
+            title="Metrics Port",
+            description="Serve the tap's runtime metrics at /metrics on this port",
+        ),
+        th.Property(
+            "metrics_host",
+            th.StringType,
+            default="127.0.0.1",
+            title="Metrics Host",
+            description="Address the metrics_port endpoint listens on",
+        ),
+        th.Property(
+            "memory_profile",
+            th.BooleanType,
+            default=False,
+            title="Memory Profile",
+            description=(
+                "Trace allocations with tracemalloc and print a report of the memory "
+                "held per component, per stream and per allocation site at exit"
+            ),
+        ),
+        th.Property(
+            "memory_profile_interval_seconds",
+            th.NumberType,
+            default=60,
+            title="Memory Profile Interval Seconds",
+            description="Seconds between memory snapshots logged while profiling",
+        ),
+        th.Property(
+            "memory_profile_top",
+            th.IntegerType,
+            default=20,
+            title="Memory Profile Top",
+            description="Rows per table of the memory profile report",
+        ),
+        th.Property(
+            "buffered_writer",
+            th.BooleanType,
+            default=False,
+            title="Buffered Writer",
+            description=(
+                "Serialise messages with orjson, if installed, and write them to "
+                "stdout through a buffer that is flushed after every STATE message"
+            ),
+        ),
+        th.Property(
+            "writer_flush_bytes",
+            th.IntegerType,
+            default=DEFAULT_WRITER_FLUSH_BYTES,
+            title="Writer Flush Bytes",
+            description="Size at which the buffered writer's buffer is written out",
+        ),
+        th.Property(
+            "writer_flush_interval_seconds",
+            th.NumberType,
+            default=DEFAULT_WRITER_FLUSH_INTERVAL_SECONDS,
+            title="Writer Flush Interval Seconds",
+            description=(
+                "Longest time the buffered writer holds messages, checked whenever a "
+                "message is written"
+            ),
+        ),
+        th.Property(
+            "state_dir",
+            th.StringType,
+            title="State Directory",
+            description=(
+                "Directory for files kept between runs, such as the daily quota "
+                "ledger and the spool of deferred call_history_path fetches"
+            ),
+        ),
+        th.Property(
+            "quota_reserve",
+            th.IntegerType,
+            default=0,
+            title="Quota Reserve",
+            description=(
+                "Daily quota requests to leave unused. Once only this many heavy "
+                "requests remain, call_history_path fetches are spooled to state_dir "
+                "and retried on the next run (requires state_dir)"
+            ),
+        ),
+        th.Property(
+            "backfill_plan",
+            th.StringType,
+            title="Backfill Plan",
+            description=(
+                "Path to a plan written by tap-zoomphone-plan. Planned windows without "
+                "records are skipped"
+            ),
+        ),
     ).to_dict()
 
+    def __init__(self, *args, **kwargs):
+        """Initialize the tap, writing through the buffered writer if enabled.
+
+        What the streams share is released when the process exits.
+        """
+        super().__init__(*args, **kwargs)
+        atexit.register(_release_resources, weakref.ref(self))
+        if self.config.get("buffered_writer") and kwargs.get("message_writer") is None:
+            self.message_writer = BufferedSingerWriter(
+                flush_bytes=self.config.get(
+                    "writer_flush_bytes", DEFAULT_WRITER_FLUSH_BYTES
+                ),
+                flush_interval=self.config.get(
+                    "writer_flush_interval_seconds",
+                    DEFAULT_WRITER_FLUSH_INTERVAL_SECONDS,
+                ),
+            )
+            self._state_writer = StateWriter(self.message_writer)
+
+    def release_resources(self) -> None:
+        """Release what the streams share: engines, connections, decoders, quotas.
+
+        Called when the process exits and when the polling daemon stops.
+        """
+        for stream in self.streams.values():
+            if isinstance(stream, ZoomPhoneStream):
+                stream.close_http_engine()
+        close_http_adapters()
+        shutdown_decode_pools()
+        flush_quota_ledgers()
+
     def configure_logging(self) -> None:
         """Configure logging with metric exclusions for specific streams."""
         super().configure_logging()
-        
+
         # Get the metrics logger
         metrics_logger = logging.getLogger(metrics.METRICS_LOGGER_NAME)
-        
-        # Add a filter to exclude metrics for call_history_path stream
-        exclusion_filter = metrics.MetricExclusionFilter(
-            tags={"stream": "call_history_path"}
-        )
-        metrics_logger.addFilter(exclusion_filter)
+
+        # Add filters to exclude metrics for the per-call child streams
+        for stream_name in ("call_history_path", "call_history_path_legs"):
+            exclusion_filter = metrics.MetricExclusionFilter(
+                tags={"stream": stream_name}
+            )
+            metrics_logger.addFilter(exclusion_filter)
 
     def discover_streams(self) -> list[streams.ZoomPhoneStream]:
         """Return a list of discovered streams.
@@ -71,8 +578,16 @@ class TapZoomPhone(Tap):
             streams.SmsSessionsStream(self),
             streams.CallHistoryStream(self),
             streams.CallHistoryPathStream(self),
+            streams.CallHistoryPathLegsStream(self),
         ]
 
 
+def _release_resources(tap_ref: weakref.ref[TapZoomPhone]) -> None:
+    """Release the resources of a tap that still exists when the process exits."""
+    tap = tap_ref()
+    if tap is not None:
+        tap.release_resources()
+
+
 if __name__ == "__main__":
     TapZoomPhone.cli()
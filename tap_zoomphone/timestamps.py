@@ -0,0 +1,71 @@
+"""Parsing and formatting of Zoom timestamps.
+
+Zoom writes timestamps as ``YYYY-MM-DDTHH:MM:SSZ``. Strings of that exact
+shape sort like the instants they denote, so replication keys can be compared
+as strings without parsing them; ``timestamp_key`` only parses values of any
+other shape. ``parse_timestamp`` uses the C ``datetime.fromisoformat``, with a
+fixed-format path for Zoom's shape on Python 3.10, and falls back to a full
+ISO-8601 parser for anything it rejects.
+
+Formatting is cached: the same few window bounds are formatted on every page
+and every run, whereas record timestamps are nearly all distinct, so parsing
+them is not.
+"""
+
+from __future__ import annotations
+
+import sys
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from dateutil.parser import isoparse
+
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def is_zoom_timestamp(value: str) -> bool:
+    """Check whether `value` has the ``YYYY-MM-DDTHH:MM:SSZ`` shape."""
+    return len(value) == 20 and value[19] == "Z" and value[10] == "T"
+
+
+if sys.version_info >= (3, 11):
+    _fromisoformat = datetime.fromisoformat
+else:
+
+    def _fromisoformat(value: str) -> datetime:
+        # fromisoformat only accepts a trailing "Z" from Python 3.11 on
+        if is_zoom_timestamp(value):
+            return datetime.fromisoformat(value[:19] + "+00:00")
+        return datetime.fromisoformat(value)
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse a timestamp into a timezone-aware datetime; naive values are UTC.
+
+    Raises:
+        ValueError: If `value` is not an ISO-8601 timestamp.
+    """
+    try:
+        result = _fromisoformat(value)
+    except ValueError:
+        result = isoparse(value)
+    return result if result.tzinfo else result.replace(tzinfo=timezone.utc)
+
+
+@lru_cache(maxsize=4096)
+def format_timestamp(value: datetime) -> str:
+    """Format a datetime in Zoom's shape, converting aware values to UTC."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime(TIMESTAMP_FORMAT)
+
+
+def timestamp_key(value: str) -> str:
+    """Return `value` in Zoom's shape, so that keys compare like their instants.
+
+    Values already in that shape are returned as they are. Others are parsed
+    and reformatted in UTC, dropping any fraction of a second.
+    """
+    if is_zoom_timestamp(value):
+        return value
+    return format_timestamp(parse_timestamp(value))
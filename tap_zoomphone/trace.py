@@ -0,0 +1,273 @@
+"""Per-request trace log and its offline summary.
+
+With ``trace_file`` set, every request a stream sends is appended to a JSONL
+file as one compact line::
+
+    {"ts": 1718000000.1, "stream": "call_history", "path": "/v2/phone/call_history",
+     "from": "2024-01-01T00:00:00Z", "to": "2024-02-01T00:00:00Z", "token": true,
+     "status": 200, "latency_ms": 812.4, "bytes": 214530, "records": 300,
+     "cached": false, "page": 3}
+
+Failed attempts are written with ``"error"`` set to the exception class and no
+``page`` or ``records``, so retries show up as extra lines for the same window.
+``page`` counts the successful pages of a window, i.e. its position in the token
+chain. A chain is forgotten once its last page is written, so the sink only
+holds the chains in flight.
+
+``tap-zoomphone-trace-summary TRACE`` reads such a file and reports the slowest
+windows, the longest token chains, retry hot spots and latency percentiles per
+endpoint. Endpoints are grouped by path template, with the id segments of
+paths such as ``/call_history/{id}`` replaced, so the thousands of per-call
+child requests of a run add up to one row.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import re
+import sys
+import threading
+import time
+import typing as t
+from collections import defaultdict
+from urllib import parse
+
+from tap_zoomphone.cache import is_last_page
+from tap_zoomphone.integrity import request_window
+
+DEFAULT_TOP = 10
+
+# Fixed path segments of the Zoom API are lowercase words, e.g. call_history.
+STATIC_SEGMENT = re.compile(r"^(?:[a-z_]+|v\d+)$")
+
+
+class TraceSink:
+    """Append request events to a JSONL file."""
+
+    def __init__(self, path: str):
+        """Open the trace file for appending."""
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")  # noqa: SIM115
+        self._pages: dict[tuple[str, str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def request(
+        self,
+        stream: str,
+        url: str,
+        *,
+        status: int | None,
+        latency: float,
+        size: int | None = None,
+        records: int | None = None,
+        cached: bool = False,
+        error: str | None = None,
+        content: bytes | None = None,
+    ) -> None:
+        """Write one request event.
+
+        Args:
+            stream: Name of the stream that sent the request.
+            url: The request URL.
+            status: HTTP status, or None if no response was received.
+            latency: Seconds until the response arrived.
+            size: Response body size in bytes.
+            records: Number of records parsed from the response.
+            cached: Whether the response came from the response cache.
+            error: Exception class name of a failed attempt.
+            content: Response body of a page, which tells whether the page
+                ends its token chain.
+        """
+        split = parse.urlsplit(url)
+        query = parse.parse_qs(split.query)
+        event: dict[str, t.Any] = {
+            "ts": round(time.time(), 3),
+            "stream": stream,
+            "path": split.path,
+        }
+        window = request_window(url)
+        if window is not None:
+            event["from"], event["to"] = window
+        event["token"] = bool(query.get("next_page_token", [""])[0])
+        event["status"] = status
+        event["latency_ms"] = round(latency * 1000, 1)
+        if size is not None:
+            event["bytes"] = size
+        if error is None:
+            event["records"] = records
+            event["cached"] = cached
+        else:
+            event["error"] = error
+
+        with self._lock:
+            if error is None:
+                key = (split.path, event.get("from", ""), event.get("to", ""))
+                page = event["page"] = self._pages.pop(key, 0) + 1
+                if content is None or not is_last_page(content, page):
+                    self._pages[key] = page
+            self._file.write(json.dumps(event, separators=(",", ":")) + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        """Close the trace file."""
+        with self._lock:
+            self._file.close()
+
+
+_sinks: dict[str, TraceSink] = {}
+
+
+def get_trace_sink(path: str) -> TraceSink:
+    """Return the process-wide sink writing to `path`, shared by all streams."""
+    sink = _sinks.get(path)
+    if sink is None:
+        sink = _sinks[path] = TraceSink(path)
+    return sink
+
+
+def path_template(path: str) -> str:
+    """Return `path` with every id segment replaced by ``{id}``."""
+    return "/".join(
+        segment if not segment or STATIC_SEGMENT.match(segment) else "{id}"
+        for segment in path.split("/")
+    )
+
+
+def percentile(values: t.Sequence[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of sorted `values`."""
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+
+def read_events(lines: t.Iterable[str]) -> t.Iterator[dict]:
+    """Yield the events of a trace file, skipping blank or truncated lines."""
+    for line in lines:
+        try:
+            yield json.loads(line)
+        except ValueError:
+            continue
+
+
+def summarize(events: t.Iterable[dict], top: int = DEFAULT_TOP) -> dict[str, list]:
+    """Aggregate trace events into the summary tables.
+
+    Returns:
+        ``slowest_windows``, ``longest_chains``, ``retry_hot_spots`` and
+        ``latency``, each a list of rows sorted by relevance.
+    """
+    windows: dict[tuple, dict[str, t.Any]] = {}
+    retries: dict[tuple, dict[str, t.Any]] = {}
+    latencies: dict[str, list[float]] = defaultdict(list)
+
+    for event in events:
+        template = path_template(event["path"])
+        # Requests without a window, such as child paths, are grouped per endpoint.
+        path = event["path"] if event.get("from") else template
+        key = (event["stream"], path, event.get("from"), event.get("to"))
+        if not event.get("cached"):
+            latencies[template].append(event["latency_ms"])
+        if "error" in event:
+            hot_spot = retries.setdefault(
+                key, {"failures": 0, "statuses": defaultdict(int)}
+            )
+            hot_spot["failures"] += 1
+            hot_spot["statuses"][str(event["status"] or event["error"])] += 1
+            continue
+        window = windows.setdefault(key, {"pages": 0, "records": 0, "latency_ms": 0.0})
+        window["pages"] = max(window["pages"], event.get("page", 0))
+        window["records"] += event.get("records") or 0
+        window["latency_ms"] += event["latency_ms"]
+
+    for values in latencies.values():
+        values.sort()
+
+    def row(key: tuple, values: dict) -> dict:
+        stream, path, window_from, window_to = key
+        return {
+            "stream": stream,
+            "path": path,
+            "from": window_from,
+            "to": window_to,
+            **values,
+        }
+
+    by_latency = sorted(windows.items(), key=lambda item: -item[1]["latency_ms"])
+    by_pages = sorted(windows.items(), key=lambda item: -item[1]["pages"])
+    by_failures = sorted(retries.items(), key=lambda item: -item[1]["failures"])
+    return {
+        "slowest_windows": [row(key, values) for key, values in by_latency[:top]],
+        "longest_chains": [row(key, values) for key, values in by_pages[:top]],
+        "retry_hot_spots": [
+            row(key, {**values, "statuses": dict(values["statuses"])})
+            for key, values in by_failures[:top]
+        ],
+        "latency": [
+            {
+                "path": path,
+                "requests": len(values),
+                "p50_ms": percentile(values, 0.5),
+                "p95_ms": percentile(values, 0.95),
+                "p99_ms": percentile(values, 0.99),
+            }
+            for path, values in sorted(latencies.items())
+            if values
+        ],
+    }
+
+
+def format_summary(summary: dict[str, list]) -> str:
+    """Render a summary as plain-text tables."""
+
+    def window(row: dict) -> str:
+        if row["from"] is None:
+            return f"{row['stream']} {row['path']}"
+        return f"{row['stream']} {row['from']} .. {row['to']}"
+
+    lines = ["Slowest windows:"]
+    lines.extend(
+        f"  {window(row)}  {row['latency_ms'] / 1000:.1f}s  "
+        f"{row['pages']} pages  {row['records']} records"
+        for row in summary["slowest_windows"]
+    )
+    lines.append("Longest token chains:")
+    lines.extend(
+        f"  {window(row)}  {row['pages']} pages" for row in summary["longest_chains"]
+    )
+    lines.append("Retry hot spots:")
+    lines.extend(
+        f"  {window(row)}  {row['failures']} failures  "
+        + ", ".join(f"{status} x{count}" for status, count in row["statuses"].items())
+        for row in summary["retry_hot_spots"]
+    )
+    lines.append("Latency per endpoint:")
+    lines.extend(
+        f"  {row['path']}  {row['requests']} requests  p50 {row['p50_ms']:.0f}ms  "
+        f"p95 {row['p95_ms']:.0f}ms  p99 {row['p99_ms']:.0f}ms"
+        for row in summary["latency"]
+    )
+    return "\n".join(lines)
+
+
+def main(argv: t.Sequence[str] | None = None) -> None:
+    """Print the summary of a trace file."""
+    parser = argparse.ArgumentParser(
+        description="Summarize a tap-zoomphone request trace."
+    )
+    parser.add_argument("trace", help="JSONL trace written with trace_file")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Rows per table")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    with open(args.trace, encoding="utf-8") as trace_file:
+        summary = summarize(read_events(trace_file), top=args.top)
+
+    if args.json:
+        json.dump(summary, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        sys.stdout.write(format_summary(summary) + "\n")
+
+
+if __name__ == "__main__":
+    main()
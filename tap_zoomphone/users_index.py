@@ -0,0 +1,103 @@
+"""In-memory index of users, used to enrich the participants of calls and SMS.
+
+The index maps each user's ``id``, ``extension_id`` and ``extension_number`` to
+the user's site name, department and cost center. Users sharing all three
+share one tuple, so the index holds little more than three dictionaries of
+keys. It is built from one listing of the users per run: the users stream's
+own sync when it comes first, or a listing made for the index otherwise.
+"""
+
+from __future__ import annotations
+
+import typing as t
+
+ENRICHMENT_FIELDS = ("site_name", "department", "cost_center")
+PARTIES = ("caller", "callee")
+
+_MISSING = (None,) * len(ENRICHMENT_FIELDS)
+_PARTY_KEYS = {
+    party: (
+        f"{party}_ext_id",
+        f"{party}_ext_number",
+        tuple(f"{party}_{field}" for field in ENRICHMENT_FIELDS),
+    )
+    for party in PARTIES
+}
+
+
+def enrichment_properties(prefixes: t.Iterable[str] = PARTIES) -> dict[str, dict]:
+    """Return the schema properties of the enrichment columns.
+
+    An empty prefix gives the unprefixed ``site_name``, ``department`` and
+    ``cost_center`` of a participant.
+    """
+    return {
+        f"{prefix}_{field}" if prefix else field: {"type": ["string", "null"]}
+        for prefix in prefixes
+        for field in ENRICHMENT_FIELDS
+    }
+
+
+class UsersIndex:
+    """Site name, department and cost center of users by id and extension."""
+
+    __slots__ = ("_attributes", "_by_extension_id", "_by_extension_number", "_by_id")
+
+    def __init__(self, users: t.Iterable[t.Mapping[str, t.Any]] = ()):
+        """Initialize the index with `users`."""
+        self._by_id: dict[str, tuple] = {}
+        self._by_extension_id: dict[str, tuple] = {}
+        self._by_extension_number: dict[str, tuple] = {}
+        self._attributes: dict[tuple, tuple] = {}
+        for user in users:
+            self.add(user)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def add(self, user: t.Mapping[str, t.Any]) -> None:
+        """Index a user record."""
+        attributes = tuple(user.get(field) for field in ENRICHMENT_FIELDS)
+        attributes = self._attributes.setdefault(attributes, attributes)
+        if user.get("id"):
+            self._by_id[user["id"]] = attributes
+        if user.get("extension_id"):
+            self._by_extension_id[user["extension_id"]] = attributes
+        if user.get("extension_number") is not None:
+            self._by_extension_number[str(user["extension_number"])] = attributes
+
+    def lookup(
+        self,
+        *,
+        user_id: str | None = None,
+        extension_id: str | None = None,
+        extension_number: str | int | None = None,
+    ) -> tuple | None:
+        """Return the attributes of the user matching any of the keys given.
+
+        Keys are tried in the order of the arguments.
+        """
+        attributes = None
+        if user_id:
+            attributes = self._by_id.get(user_id)
+        if attributes is None and extension_id:
+            attributes = self._by_extension_id.get(extension_id)
+        if attributes is None and extension_number is not None:
+            attributes = self._by_extension_number.get(str(extension_number))
+        return attributes
+
+    def enrich_parties(self, record: dict) -> None:
+        """Set the caller's and callee's attributes from their extension."""
+        for ext_id_key, ext_number_key, keys in _PARTY_KEYS.values():
+            attributes = self.lookup(
+                extension_id=record.get(ext_id_key),
+                extension_number=record.get(ext_number_key),
+            )
+            for key, value in zip(keys, attributes or _MISSING):
+                record[key] = value
+
+    def enrich_user(self, record: dict, user_id: str | None) -> None:
+        """Set the unprefixed attributes of the user `user_id` on `record`."""
+        attributes = self.lookup(user_id=user_id) or _MISSING
+        for field, value in zip(ENRICHMENT_FIELDS, attributes):
+            record[field] = value
@@ -0,0 +1,121 @@
+"""Buffered Singer message writer.
+
+The SDK's writer turns each message into a dict with ``dataclasses.asdict``,
+which deep-copies the record, serialises it with ``simplejson`` and flushes
+stdout after every line. ``BufferedSingerWriter`` builds RECORD messages from
+the record as it is, serialises them with ``orjson`` when it is installed (the
+``fast`` extra) and collects the lines in a buffer. The buffer is written to
+stdout once it holds ``flush_bytes``, when a message is written
+``flush_interval`` seconds or more after the last flush, at exit, and after
+every STATE message: a target never sees a state before the records it covers.
+
+``orjson`` writes datetimes like the SDK does. Finite Decimals are written as
+their own text, as the SDK's ``simplejson`` encoder writes them, so ``60`` stays
+an integer and ``0.10`` keeps its trailing zero. A message holding any other
+value ``orjson`` cannot encode (such as an integer over 64 bits) is serialised
+by the SDK's encoder instead.
+"""
+
+from __future__ import annotations
+
+import atexit
+import decimal
+import sys
+import time
+import typing as t
+
+from singer_sdk.singerlib.encoding.base import GenericSingerWriter, SingerMessageType
+from singer_sdk.singerlib.json import serialize_json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+if t.TYPE_CHECKING:
+    from singer_sdk.singerlib.encoding.simple import Message
+
+DEFAULT_WRITER_FLUSH_BYTES = 1024 * 1024
+DEFAULT_WRITER_FLUSH_INTERVAL_SECONDS = 1.0
+
+
+def _encode_default(value: t.Any) -> t.Any:  # noqa: ANN401
+    """Encode a value orjson does not support, or raise to fall back."""
+    if isinstance(value, decimal.Decimal) and value.is_finite():
+        return orjson.Fragment(str(value))
+    raise TypeError
+
+
+def serialize_line(message: dict) -> bytes:
+    """Serialise a message as one line of JSON, ending with a newline."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                message, default=_encode_default, option=orjson.OPT_APPEND_NEWLINE
+            )
+        except orjson.JSONEncodeError:
+            pass
+    return (serialize_json(message) + "\n").encode()
+
+
+def message_dict(message: Message) -> dict:
+    """Return a message as a dict, without copying a RECORD message's record."""
+    if message.type is not SingerMessageType.RECORD:
+        return message.to_dict()
+    result = {"type": "RECORD", "stream": message.stream, "record": message.record}
+    if message.version is not None:
+        result["version"] = message.version
+    if message.time_extracted is not None:
+        result["time_extracted"] = message.time_extracted
+    return result
+
+
+class BufferedSingerWriter(GenericSingerWriter[bytes, "Message"]):
+    """Write Singer messages to stdout through a buffer, flushed on STATE."""
+
+    def __init__(
+        self,
+        flush_bytes: int = DEFAULT_WRITER_FLUSH_BYTES,
+        flush_interval: float = DEFAULT_WRITER_FLUSH_INTERVAL_SECONDS,
+    ):
+        """Initialize the writer and flush it at interpreter exit.
+
+        Args:
+            flush_bytes: Write the buffer to stdout once it holds this many bytes.
+            flush_interval: Write the buffer to stdout when a message is written
+                this many seconds or more after the last flush.
+        """
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self._buffer = bytearray()
+        self._flushed_at = time.monotonic()
+        atexit.register(self.flush)
+
+    def serialize_message(self, message: Message) -> bytes:
+        """Serialise a message as one line of JSON."""
+        return serialize_line(message_dict(message))
+
+    def write_message(self, message: Message) -> None:
+        """Add a message to the buffer, flushing it when due or after a STATE."""
+        self._buffer += self.serialize_message(message)
+        if (
+            message.type is SingerMessageType.STATE
+            or len(self._buffer) >= self.flush_bytes
+            or time.monotonic() - self._flushed_at >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffer to stdout."""
+        self._flushed_at = time.monotonic()
+        if not self._buffer:
+            return
+        # Anything written to the text layer so far goes first
+        sys.stdout.flush()
+        output = getattr(sys.stdout, "buffer", None)
+        if output is None:
+            sys.stdout.write(self._buffer.decode())
+        else:
+            output.write(self._buffer)
+            output.flush()
+        self._buffer.clear()
@@ -0,0 +1,165 @@
+"""Tests for the asyncio request engine."""
+
+import json
+from unittest.mock import Mock
+
+import httpx
+import pytest
+from singer_sdk.exceptions import FatalAPIError
+
+from tap_zoomphone.async_engine import AsyncRequestEngine
+from tap_zoomphone.partitions import PartitionBuffer
+from tap_zoomphone.streams import CallHistoryPathStream, UsersStream
+from tap_zoomphone.tap import TapZoomPhone
+
+
+def make_stream(stream_class, **config):
+    """Create a stream with a mocked tap and no authenticator."""
+    mock_tap = Mock()
+    mock_tap.config = {
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "account_id": "test_account_id",
+        **config,
+    }
+    stream = stream_class(mock_tap)
+    stream.authenticator = None
+    stream.backoff_wait_generator = no_wait
+    return stream
+
+
+def no_wait():
+    """Backoff wait generator that never sleeps."""
+    while True:
+        yield 0
+
+
+class TestAsyncRequestEngine:
+    """Test the async request engine."""
+
+    def test_stream_uses_requests_by_default(self):
+        """Test that the async engine is opt-in."""
+        stream = make_stream(UsersStream)
+
+        assert stream.http_engine is None
+
+    def test_stream_creates_engine_from_config(self):
+        """Test that http_engine and max_concurrent_requests configure the engine."""
+        stream = make_stream(UsersStream, http_engine="async", max_concurrent_requests=7)
+
+        assert isinstance(stream.http_engine, AsyncRequestEngine)
+        assert stream.http_engine.max_concurrency == 7
+
+    def test_request_records_parses_pages(self):
+        """Test that the stream's request params and parser run through the engine."""
+        requested_params = []
+
+        def handler(request):
+            requested_params.append(dict(request.url.params))
+            return httpx.Response(
+                200, json={"users": [{"id": "1"}, {"id": "2"}], "next_page_token": ""}
+            )
+
+        stream = make_stream(UsersStream)
+        engine = AsyncRequestEngine(stream, transport=httpx.MockTransport(handler))
+
+        records = list(engine.request_records(None))
+        engine.close()
+
+        assert [record["id"] for record in records] == ["1", "2"]
+        assert requested_params == [{"page_size": "100"}]
+
+    def test_fetch_many_preserves_context_order(self):
+        """Test that concurrent child fetches come back in context order."""
+
+        def handler(request):
+            call_id = request.url.path.rsplit("/", 1)[-1]
+            return httpx.Response(200, content=json.dumps({"id": call_id}).encode())
+
+        stream = make_stream(CallHistoryPathStream)
+        engine = AsyncRequestEngine(
+            stream, max_concurrency=3, transport=httpx.MockTransport(handler)
+        )
+        contexts = [{"id": str(i)} for i in range(10)]
+
+        results = engine.fetch_many(contexts)
+        engine.close()
+
+        assert [records[0]["id"] for records in results] == [str(i) for i in range(10)]
+
+    def test_stream_many_fills_each_buffer(self):
+        """Test that streamed pages land in their context's buffer and finish it."""
+
+        def handler(request):
+            call_id = request.url.path.rsplit("/", 1)[-1]
+            if call_id == "gone":
+                return httpx.Response(404, json={"code": 404})
+            return httpx.Response(200, content=json.dumps({"id": call_id}).encode())
+
+        stream = make_stream(CallHistoryPathStream)
+        engine = AsyncRequestEngine(stream, transport=httpx.MockTransport(handler))
+        buffers = [PartitionBuffer() for _ in range(3)]
+
+        engine.stream_many([{"id": "a"}, {"id": "gone"}, {"id": "b"}], buffers)
+        engine.close()
+
+        assert [list(buffer) for buffer in buffers] == [[{"id": "a"}], [], [{"id": "b"}]]
+
+    def test_retriable_errors_are_retried(self):
+        """Test that 5xx replies are retried with the stream's backoff settings."""
+        replies = iter([httpx.Response(503), httpx.Response(200, json={"id": "1"})])
+        stream = make_stream(CallHistoryPathStream)
+        engine = AsyncRequestEngine(
+            stream, transport=httpx.MockTransport(lambda request: next(replies))
+        )
+
+        results = engine.fetch_many([{"id": "1"}])
+        engine.close()
+
+        assert results == [[{"id": "1"}]]
+
+    def test_fatal_errors_are_raised(self):
+        """Test that 4xx replies surface as FatalAPIError."""
+        stream = make_stream(CallHistoryPathStream)
+        engine = AsyncRequestEngine(
+            stream, transport=httpx.MockTransport(lambda request: httpx.Response(400))
+        )
+
+        with pytest.raises(FatalAPIError):
+            engine.fetch_many([{"id": "1"}])
+        engine.close()
+
+    def test_call_history_path_uses_prefetched_records(self):
+        """Test that prefetched child records are served without a new request."""
+        stream = make_stream(CallHistoryPathStream)
+        stream._prefetched["abc"] = [{"id": "abc"}]
+
+        assert list(stream.get_records({"id": "abc"})) == [{"id": "abc"}]
+        assert "abc" not in stream._prefetched
+
+    def test_engine_is_closed_with_the_tap_resources(self, capsys):
+        """Test that the engine stays open between syncs until the tap releases it."""
+        tap = TapZoomPhone(
+            config={
+                "client_id": "test_client_id",
+                "client_secret": "test_client_secret",
+                "account_id": "test_account_id",
+                "http_engine": "async",
+            },
+            parse_env_config=False,
+        )
+        stream = tap.streams["users"]
+        stream.authenticator = None
+        engine = stream.http_engine
+        engine._transport = httpx.MockTransport(
+            lambda request: httpx.Response(
+                200, json={"users": [{"id": "1"}], "next_page_token": ""}
+            )
+        )
+
+        stream.sync()
+        assert engine._client is not None
+
+        tap.release_resources()
+        assert engine._loop is None and engine._client is None
+        assert '"record":{"id":"1"}' in capsys.readouterr().out
@@ -0,0 +1,216 @@
+"""Tests for the on-disk response cache."""
+
+import os
+import time
+from unittest.mock import Mock, patch
+
+import requests
+
+from tap_zoomphone.cache import ResponseCache, cache_key, pack_pages, unpack_pages
+from tap_zoomphone.streams import CallHistoryStream
+
+
+class TestResponseCache:
+    """Test cache keys, storage and eviction."""
+
+    def test_key_ignores_query_order(self):
+        """Test that equivalent URLs share a key."""
+        url = "https://api.zoom.us/v2/phone/call_history?from=a&to=b&page_size=300"
+        reordered = "https://API.zoom.us/v2/phone/call_history?page_size=300&to=b&from=a"
+
+        assert cache_key("GET", url, "acct") == cache_key("get", reordered, "acct")
+        other_window = url.replace("to=b", "to=c")
+        assert cache_key("GET", url, "acct") != cache_key("GET", other_window, "acct")
+
+    def test_pages_of_a_window_share_a_key(self):
+        """Test that the page token is left out of the key."""
+        url = "https://api.zoom.us/v2/phone/call_history?from=a&to=b&page_size=300"
+
+        next_page = url + "&next_page_token=x"
+        assert cache_key("GET", url, "acct") == cache_key("GET", next_page, "acct")
+
+    def test_key_depends_on_account(self):
+        """Test that two accounts sharing a cache directory never share entries."""
+        url = "https://api.zoom.us/v2/phone/call_history?from=a&to=b&page_size=300"
+
+        assert cache_key("GET", url, "acct-1") != cache_key("GET", url, "acct-2")
+
+    def test_pages_round_trip(self):
+        """Test that packed pages unpack to the same bodies."""
+        pages = [b'{"next_page_token": "t1"}', b"", b'{"call_logs": []}\n']
+
+        assert unpack_pages(pack_pages(pages)) == pages
+
+    def test_round_trip_is_compressed(self, tmp_path):
+        """Test that bodies are stored compressed and read back intact."""
+        cache = ResponseCache(tmp_path)
+        body = b'{"call_logs": []}' * 100
+
+        cache.put("ab" * 32, body)
+
+        assert cache.get("ab" * 32) == body
+        assert cache.total_bytes < len(body)
+        assert cache.get("cd" * 32) is None
+
+    def test_expired_entries_are_dropped(self, tmp_path):
+        """Test that entries older than the TTL are not served."""
+        cache = ResponseCache(tmp_path, ttl=60)
+        cache.put("ab" * 32, b"{}")
+        path = next(tmp_path.glob("*/*.gz"))
+        old = time.time() - 120
+        os.utime(path, (old, old))
+
+        assert cache.get("ab" * 32) is None
+        assert not path.exists()
+        assert cache.total_bytes == 0
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        """Test that the cache evicts the entries read longest ago."""
+        body = os.urandom(1000)
+        cache = ResponseCache(tmp_path, max_bytes=2500)
+        cache.put("aa" * 32, body)
+        cache.put("bb" * 32, body)
+        now = time.time()
+        for index, key in enumerate(["bb" * 32, "aa" * 32]):
+            path = tmp_path / key[:2] / f"{key}.gz"
+            os.utime(path, (now - 100 + index, now))
+
+        cache.put("cc" * 32, body)
+
+        assert cache.get("bb" * 32) is None
+        assert cache.get("aa" * 32) == body
+        assert cache.get("cc" * 32) == body
+
+    def test_existing_entries_are_indexed(self, tmp_path):
+        """Test that a new cache instance accounts for entries on disk."""
+        ResponseCache(tmp_path).put("ab" * 32, b"{}")
+
+        assert ResponseCache(tmp_path).total_bytes > 0
+
+
+class TestStreamResponseCache:
+    """Test that streams only cache windows past the immutability horizon."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.sent = 0
+        self.pages = 1
+
+    def make_stream(self, tmp_path):
+        mock_tap = Mock()
+        mock_tap.config = {
+            "client_id": "test_client_id",
+            "client_secret": "test_client_secret",
+            "account_id": "test_account_id",
+            "response_cache_dir": str(tmp_path),
+            "immutability_horizon_days": 3,
+        }
+        mock_tap.state = {}
+        stream = CallHistoryStream(mock_tap)
+        stream.authenticator = None
+        return stream
+
+    def send(self, prepared_request, **kwargs):
+        self.sent += 1
+        response = requests.Response()
+        response.status_code = 200
+        if "next_page_token" in prepared_request.url:
+            response._content = b'{"call_logs": [{"id": "2"}], "page_count": 2}'
+        elif self.pages == 2:
+            response._content = (
+                b'{"next_page_token": "t1", "page_count": 2, "call_logs": [{"id": "1"}]}'
+            )
+        else:
+            response._content = b'{"call_logs": [{"id": "1"}], "page_count": 1}'
+        response.url = prepared_request.url
+        return response
+
+    def request(self, stream, window_to, token=None):
+        params = {"from": "2024-01-01T00:00:00Z", "to": window_to, "page_size": 300}
+        if token:
+            params["next_page_token"] = token
+        prepared_request = stream.build_prepared_request(
+            method="GET",
+            url=stream.get_url(None),
+            params=params,
+            headers={},
+        )
+        with patch.object(stream.requests_session, "send", side_effect=self.send):
+            return stream._request(prepared_request, None)
+
+    def test_immutable_window_is_served_from_cache(self, tmp_path):
+        """Test that a second request for an old window does not hit the API."""
+        stream = self.make_stream(tmp_path)
+
+        first = self.request(stream, "2024-02-01T00:00:00Z")
+        second = self.request(stream, "2024-02-01T00:00:00Z")
+
+        assert self.sent == 1
+        assert second.json() == first.json()
+        assert second.from_cache
+        assert stream.calculate_sync_cost(None, second, None) == {"heavy": 0}
+
+    def test_recent_window_is_not_cached(self, tmp_path):
+        """Test that windows within the horizon are always fetched."""
+        stream = self.make_stream(tmp_path)
+        recent = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+        self.request(stream, recent)
+        self.request(stream, recent)
+
+        assert self.sent == 2
+
+    def test_multi_page_window_is_replayed_from_its_first_page(self, tmp_path):
+        """Test that later pages are served by the token of the cached page before."""
+        stream = self.make_stream(tmp_path)
+        self.pages = 2
+
+        first = self.request(stream, "2024-02-01T00:00:00Z")
+        self.request(stream, "2024-02-01T00:00:00Z", first.json()["next_page_token"])
+        replay = self.request(stream, "2024-02-01T00:00:00Z")
+        second = self.request(
+            stream, "2024-02-01T00:00:00Z", replay.json()["next_page_token"]
+        )
+
+        assert self.sent == 2
+        assert replay.from_cache
+        assert second.from_cache
+        assert second.json()["call_logs"] == [{"id": "2"}]
+
+    def test_incomplete_window_is_not_cached(self, tmp_path):
+        """Test that a window is only cached once its last page was received."""
+        stream = self.make_stream(tmp_path)
+        self.pages = 2
+
+        self.request(stream, "2024-02-01T00:00:00Z")
+        self.request(stream, "2024-02-01T00:00:00Z")
+
+        assert self.sent == 2
+
+    def test_later_page_is_not_served_without_its_window(self, tmp_path):
+        """Test that a page token alone never hits the cache."""
+        stream = self.make_stream(tmp_path)
+        self.pages = 2
+        first = self.request(stream, "2024-02-01T00:00:00Z")
+        self.request(stream, "2024-02-01T00:00:00Z", first.json()["next_page_token"])
+        stream._cached_windows.clear()
+
+        self.request(stream, "2024-02-01T00:00:00Z", "t1")
+
+        assert self.sent == 3
+
+    def test_abandoned_replay_is_forgotten(self, tmp_path):
+        """Test that a replay stopped midway does not outlive its request loop."""
+        stream = self.make_stream(tmp_path)
+        self.pages = 2
+        first = self.request(stream, "2024-02-01T00:00:00Z")
+        self.request(stream, "2024-02-01T00:00:00Z", first.json()["next_page_token"])
+
+        with stream.window_replay_scope():
+            with stream.window_replay_scope():
+                self.request(stream, "2024-02-01T00:00:00Z")
+            assert stream._cached_windows
+        assert stream._cached_windows == {}
+
+        self.request(stream, "2024-02-01T00:00:00Z", "t1")
+        assert self.sent == 3
@@ -0,0 +1,83 @@
+"""Tests for the flattened call path legs stream."""
+
+import json
+from unittest.mock import patch
+
+from tap_zoomphone.streams import CallHistoryPathStream
+from tap_zoomphone.tap import TapZoomPhone
+
+SAMPLE_CONFIG = {
+    "client_id": "test_client_id",
+    "client_secret": "test_client_secret",
+    "account_id": "test_account_id",
+}
+
+CALL = {
+    "id": "call-1",
+    "start_time": "2024-01-05T10:00:00Z",
+    "call_path": [
+        {"id": "leg-a", "call_id": "1", "result_reason": "answered "},
+        {"id": "leg-b", "call_id": "1", "result_reason": None},
+    ],
+}
+
+
+def records_by_stream(output):
+    records = {}
+    for line in output.splitlines():
+        message = json.loads(line)
+        if message["type"] == "RECORD":
+            records.setdefault(message["stream"], []).append(message["record"])
+    return records
+
+
+class TestCallHistoryPathLegs:
+    """Test that legs are flattened from the call path records."""
+
+    def sync_call(self, tap):
+        path_stream = tap.streams["call_history_path"]
+        call = json.loads(json.dumps(CALL))
+        with patch.object(
+            CallHistoryPathStream, "get_records", return_value=iter([call])
+        ) as get_records:
+            list(path_stream._sync_records({"id": "call-1"}))
+        assert get_records.call_count == 1
+
+    def test_one_record_per_leg(self, capsys):
+        """Test that each leg is emitted with the call id and its position."""
+        tap = TapZoomPhone(config=SAMPLE_CONFIG, parse_env_config=False)
+
+        self.sync_call(tap)
+
+        legs = records_by_stream(capsys.readouterr().out)["call_history_path_legs"]
+        assert [(leg["call_history_id"], leg["leg_index"], leg["id"]) for leg in legs] == [
+            ("call-1", 0, "leg-a"),
+            ("call-1", 1, "leg-b"),
+        ]
+        assert legs[0]["result_reason"] == "answered"
+        legs_stream = tap.streams["call_history_path_legs"]
+        assert legs_stream._call_path is None
+        assert "_pagination_strategy" not in legs_stream.__dict__
+        assert not legs_stream._session_pooled
+
+    def test_paths_of_unsynced_calls_are_not_kept(self):
+        """Test that a path whose legs were never synced is replaced, not kept."""
+        tap = TapZoomPhone(config=SAMPLE_CONFIG, parse_env_config=False)
+        legs_stream = tap.streams["call_history_path_legs"]
+
+        legs_stream.set_call_path("filtered", CALL["call_path"])
+        legs_stream.set_call_path("call-1", CALL["call_path"])
+
+        assert list(legs_stream.get_records({"id": "filtered"})) == []
+        assert legs_stream._call_path is None
+
+    def test_legs_without_nested_rows(self, capsys):
+        """Test that the legs are still emitted when call_history_path is deselected."""
+        tap = TapZoomPhone(config=SAMPLE_CONFIG, parse_env_config=False)
+        tap.streams["call_history_path"].selected = False
+
+        self.sync_call(tap)
+
+        records = records_by_stream(capsys.readouterr().out)
+        assert "call_history_path" not in records
+        assert len(records["call_history_path_legs"]) == 2
@@ -0,0 +1,111 @@
+"""Tests for change detection on the users stream."""
+
+import json
+from unittest.mock import Mock, patch
+
+import requests
+
+from tap_zoomphone.change_index import RecordHashIndex, record_hash
+from tap_zoomphone.client import ZoomPhoneStream
+from tap_zoomphone.streams import UsersStream
+
+
+def make_users_stream(tmp_path, **config):
+    mock_tap = Mock()
+    mock_tap.config = {
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "account_id": "test_account_id",
+        "state_dir": str(tmp_path),
+        "users_change_detection": True,
+        **config,
+    }
+    mock_tap.state = {}
+    stream = UsersStream(mock_tap)
+    stream.authenticator = None
+    return stream
+
+
+def sync(stream, users):
+    with patch.object(ZoomPhoneStream, "get_records", return_value=iter(users)):
+        return list(stream.get_records(None))
+
+
+class TestRecordHashIndex:
+    """Test record hashing and the persisted index."""
+
+    def test_hash_ignores_key_order(self):
+        """Test that reordered keys hash the same and changed values do not."""
+        assert record_hash({"a": 1, "b": 2}) == record_hash({"b": 2, "a": 1})
+        assert record_hash({"a": 1}) != record_hash({"a": 2})
+
+    def test_changed_and_persisted(self, tmp_path):
+        """Test that only new or different hashes count as changed."""
+        index = RecordHashIndex(tmp_path / "index.json")
+
+        assert index.changed("1", "h1")
+        assert not index.changed("1", "h1")
+        assert index.changed("1", "h2")
+        index.save()
+
+        assert not RecordHashIndex(tmp_path / "index.json").changed("1", "h2")
+
+
+class TestUsersChangeDetection:
+    """Test that the users stream only emits what changed."""
+
+    def test_disabled_by_default(self, tmp_path):
+        """Test that every user is emitted without change detection."""
+        stream = make_users_stream(tmp_path, users_change_detection=False)
+
+        assert stream.change_index is None
+        assert len(sync(stream, [{"id": "1"}, {"id": "1"}])) == 2
+
+    def test_only_new_or_changed_users_are_emitted(self, tmp_path):
+        """Test that a second run emits only the changed user."""
+        users = [{"id": "1", "name": "a"}, {"id": "2", "name": "b"}]
+        assert sync(make_users_stream(tmp_path), users) == users
+
+        users[1] = {"id": "2", "name": "c"}
+        assert sync(make_users_stream(tmp_path), users) == [users[1]]
+
+    def test_deleted_users_are_emitted_when_enabled(self, tmp_path):
+        """Test that users missing from a listing are emitted as deleted."""
+        sync(make_users_stream(tmp_path), [{"id": "1"}, {"id": "2"}])
+
+        stream = make_users_stream(tmp_path, users_emit_deletions=True)
+        records = sync(stream, [{"id": "1"}])
+
+        assert [record["id"] for record in records] == ["2"]
+        assert records[0]["_sdc_deleted_at"]
+        assert "_sdc_deleted_at" in stream.schema["properties"]
+        assert json.loads((tmp_path / "users_index.json").read_text()).keys() == {"1"}
+
+
+class TestUsersPagination:
+    """Test that the users listing follows every next_page_token."""
+
+    def test_all_pages_are_requested(self, tmp_path):
+        """Test that pagination continues until the token is empty."""
+        pages = iter(
+            [
+                {"next_page_token": "t1", "users": [{"id": "1"}]},
+                {"next_page_token": "", "users": [{"id": "2"}]},
+            ]
+        )
+        requested = []
+
+        def send(prepared_request, **kwargs):
+            requested.append(prepared_request.url)
+            response = requests.Response()
+            response.status_code = 200
+            response._content = json.dumps(next(pages)).encode()
+            response.request = prepared_request
+            return response
+
+        stream = make_users_stream(tmp_path, users_change_detection=False)
+        with patch.object(stream.requests_session, "send", side_effect=send):
+            records = list(stream.request_records(None))
+
+        assert [record["id"] for record in records] == ["1", "2"]
+        assert "next_page_token=t1" in requested[1]
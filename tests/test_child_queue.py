@@ -0,0 +1,147 @@
+"""Tests for the bounded parent/child fetch queue."""
+
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+from singer_sdk.streams import RESTStream
+
+from tap_zoomphone.child_queue import ChildFetchQueue
+from tap_zoomphone.streams import CallHistoryStream
+
+
+class Recorder:
+    """Collect the calls made by the queue in order."""
+
+    def __init__(self):
+        self.events = []
+        self.fetched = []
+
+    def fetch_batch(self, contexts):
+        self.fetched.append([context["id"] for context in contexts])
+        return [f"records-{context['id']}" for context in contexts]
+
+    def sync_child(self, context, result):
+        self.events.append(("child", context["id"], result))
+
+    def apply_bookmark(self, record, context):
+        self.events.append(("bookmark", record["start_time"]))
+
+
+class TestChildFetchQueue:
+    """Test ordering, batching and backpressure of the queue."""
+
+    def make_queue(self, recorder, batch_size=2, max_pending=4):
+        return ChildFetchQueue(
+            fetch_batch=recorder.fetch_batch,
+            sync_child=recorder.sync_child,
+            apply_bookmark=recorder.apply_bookmark,
+            batch_size=batch_size,
+            max_pending=max_pending,
+        )
+
+    def test_bookmarks_wait_for_earlier_children(self):
+        """Test that a bookmark is applied only after the children queued before it."""
+        recorder = Recorder()
+        queue = self.make_queue(recorder, batch_size=10)
+
+        queue.put_child({"id": "a"})
+        queue.put_bookmark({"start_time": "t1"}, None)
+        queue.put_child({"id": "b"})
+        queue.put_bookmark({"start_time": "t2"}, None)
+        assert recorder.events == []
+
+        queue.join()
+        queue.close()
+
+        assert recorder.events == [
+            ("child", "a", "records-a"),
+            ("bookmark", "t1"),
+            ("child", "b", "records-b"),
+            ("bookmark", "t2"),
+        ]
+
+    def test_bookmark_applied_immediately_when_nothing_pending(self):
+        """Test that bookmarks are not delayed when no children are outstanding."""
+        recorder = Recorder()
+        queue = self.make_queue(recorder)
+
+        queue.put_bookmark({"start_time": "t1"}, None)
+
+        assert recorder.events == [("bookmark", "t1")]
+
+    def test_children_fetched_in_batches(self):
+        """Test that contexts are grouped into batches of batch_size."""
+        recorder = Recorder()
+        queue = self.make_queue(recorder, batch_size=2, max_pending=10)
+
+        for call_id in "abcde":
+            queue.put_child({"id": call_id})
+        queue.join()
+        queue.close()
+
+        assert recorder.fetched == [["a", "b"], ["c", "d"], ["e"]]
+        assert [event[1] for event in recorder.events] == list("abcde")
+        assert queue.synced == 5
+
+    def test_producer_blocks_when_queue_is_full(self):
+        """Test that pending children never exceed max_pending."""
+        recorder = Recorder()
+        release = threading.Event()
+        fetch_batch = recorder.fetch_batch
+
+        def slow_fetch(contexts):
+            release.wait(timeout=5)
+            return fetch_batch(contexts)
+
+        recorder.fetch_batch = slow_fetch
+        queue = self.make_queue(recorder, batch_size=2, max_pending=4)
+        for call_id in "abcd":
+            queue.put_child({"id": call_id})
+        assert queue.pending == 4
+
+        release.set()
+        queue.put_child({"id": "e"})
+
+        assert queue.pending <= 4
+        assert ("child", "a", "records-a") in recorder.events
+        queue.join()
+        queue.close()
+        assert queue.pending == 0
+
+
+class TestCallHistoryChildQueue:
+    """Test that call_history stops the queue's worker when its records are done."""
+
+    def make_stream(self):
+        mock_tap = Mock()
+        mock_tap.config = {
+            "client_id": "test_client_id",
+            "client_secret": "test_client_secret",
+            "account_id": "test_account_id",
+            "http_engine": "async",
+        }
+        mock_tap.state = {}
+        stream = CallHistoryStream(mock_tap)
+        stream.child_queue = Mock()
+        return stream
+
+    def test_closed_after_join(self):
+        """Test that the queue is joined, then closed."""
+        stream = self.make_stream()
+
+        with patch.object(RESTStream, "get_records", return_value=iter([{"id": "a"}])):
+            assert list(stream.get_records(None)) == [{"id": "a"}]
+
+        assert [call[0] for call in stream.child_queue.method_calls] == ["join", "close"]
+
+    def test_closed_on_failure(self):
+        """Test that the queue is closed when requesting records fails."""
+        stream = self.make_stream()
+
+        with patch.object(RESTStream, "get_records", side_effect=RuntimeError), (
+            pytest.raises(RuntimeError)
+        ):
+            list(stream.get_records(None))
+
+        stream.child_queue.close.assert_called_once_with()
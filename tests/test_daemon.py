@@ -0,0 +1,146 @@
+"""Tests for the polling daemon."""
+
+import json
+from unittest.mock import patch
+from urllib import parse
+
+import httpx
+import pytest
+import requests
+
+from tap_zoomphone.daemon import PollingDaemon
+from tap_zoomphone.tap import TapZoomPhone
+
+SAMPLE_CONFIG = {
+    "client_id": "test_client_id",
+    "client_secret": "test_client_secret",
+    "account_id": "test_account_id",
+    "start_date": "2024-01-01T00:00:00Z",
+    "verify_windows": False,
+}
+
+
+def make_tap(**config):
+    tap = TapZoomPhone(config={**SAMPLE_CONFIG, **config}, parse_env_config=False)
+    for stream in tap.streams.values():
+        stream.authenticator = None
+    return tap
+
+
+def sms_send(pages, requested_from):
+    """Return a fake `send` answering each request with the next page of sessions."""
+
+    def send(prepared_request, **kwargs):
+        query = parse.parse_qs(parse.urlsplit(prepared_request.url).query)
+        requested_from.append(query["from"][0])
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(
+            {"sms_sessions": next(pages), "next_page_token": ""}
+        ).encode()
+        response.request = prepared_request
+        return response
+
+    return send
+
+
+def poll_sms_sessions(tap, pages, polls=2):
+    """Poll the sms_sessions stream, returning the start of every requested window."""
+    requested_from = []
+    with patch.object(tap.streams["call_history"], "sync"), patch.object(
+        tap.streams["sms_sessions"].requests_session,
+        "send",
+        side_effect=sms_send(iter(pages), requested_from),
+    ), patch(
+        "tap_zoomphone.pagination.DateRangePaginationStrategy.has_window_after",
+        return_value=False,
+    ):
+        PollingDaemon(tap, interval=0).run(max_polls=polls)
+    return requested_from
+
+
+class TestPollingDaemon:
+    """Test polling from bookmarks and stopping."""
+
+    def test_polls_date_range_streams(self):
+        """Test that only the top-level date-range streams are polled."""
+        daemon = PollingDaemon(make_tap())
+
+        assert {stream.name for stream in daemon.streams()} == {
+            "call_history",
+            "sms_sessions",
+        }
+
+    def test_each_poll_starts_at_the_bookmark(self, capsys):
+        """Test that the second poll requests the window after the first poll's records."""
+        tap = make_tap()
+
+        requested_from = poll_sms_sessions(
+            tap,
+            [
+                [{"session_id": "a", "last_access_time": "2024-01-05T10:00:00Z"}],
+                [{"session_id": "b", "last_access_time": "2024-01-05T10:01:00Z"}],
+            ],
+        )
+
+        assert requested_from == ["2024-01-01T00:00:00Z", "2024-01-05T10:00:00Z"]
+        assert (
+            tap.state["bookmarks"]["sms_sessions"]["replication_key_value"]
+            == "2024-01-05T10:01:00Z"
+        )
+        assert '"type":"STATE"' in capsys.readouterr().out.replace(" ", "")
+
+    def test_stop_finishes_current_poll(self):
+        """Test that a signal stops the loop and a second one interrupts it."""
+        daemon = PollingDaemon(make_tap(), interval=0)
+        daemon.stop()
+
+        with patch.object(PollingDaemon, "poll") as poll:
+            daemon.run()
+        poll.assert_not_called()
+
+        with pytest.raises(KeyboardInterrupt):
+            daemon.stop()
+
+    def test_updated_record_is_emitted_on_the_next_poll(self, capsys):
+        """Test that a record updated since the last poll is not dropped as a duplicate."""
+        tap = make_tap(dedupe_records=True)
+
+        poll_sms_sessions(
+            tap,
+            [
+                [{"session_id": "a", "last_access_time": "2024-01-05T10:00:00Z"}],
+                [{"session_id": "a", "last_access_time": "2024-01-05T10:05:00Z"}],
+            ],
+        )
+
+        records = [
+            message["record"]
+            for message in map(json.loads, capsys.readouterr().out.splitlines())
+            if message["type"] == "RECORD"
+        ]
+        assert [record["last_access_time"] for record in records] == [
+            "2024-01-05T10:00:00Z",
+            "2024-01-05T10:05:00Z",
+        ]
+
+    def test_engine_stays_open_between_polls(self, capsys):
+        """Test that the async engine is reused by every poll and closed on shutdown."""
+        tap = make_tap(http_engine="async")
+        engine = tap.streams["sms_sessions"].http_engine
+        clients = []
+
+        def handler(request):
+            clients.append(engine._client)
+            return httpx.Response(200, json={"sms_sessions": [], "next_page_token": ""})
+
+        engine._transport = httpx.MockTransport(handler)
+        with patch.object(tap.streams["call_history"], "sync"), patch(
+            "tap_zoomphone.pagination.DateRangePaginationStrategy.has_window_after",
+            return_value=False,
+        ):
+            PollingDaemon(tap, interval=0).run(max_polls=2)
+
+        assert len(clients) == 2
+        assert clients[0] is clients[1] is not None
+        assert engine._client is None
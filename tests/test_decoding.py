@@ -0,0 +1,138 @@
+"""Tests for the JSON decode process pool."""
+
+import decimal
+import json
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from tap_zoomphone import decoding
+from tap_zoomphone.decoding import (
+    DecodePool,
+    decode_compact,
+    expand_compact,
+    get_decode_pool,
+    shutdown_decode_pools,
+)
+from tap_zoomphone.tap import TapZoomPhone
+
+
+class TestCompactDecoding:
+    """Test the compact record encoding used between processes."""
+
+    def test_round_trip_preserves_records_and_order(self):
+        """Test that records with differing keys come back unchanged and in order."""
+        records = [{"id": "1", "duration": 1.5}, {"id": "2"}, {"id": "3", "duration": 2}]
+        content = json.dumps({"call_logs": records}).encode()
+
+        layouts, rows = decode_compact(content, "$.call_logs[*]")
+
+        assert len(layouts) == 2
+        assert expand_compact((layouts, rows)) == [
+            {"id": "1", "duration": decimal.Decimal("1.5")},
+            {"id": "2"},
+            {"id": "3", "duration": 2},
+        ]
+
+    def test_root_jsonpath_returns_whole_document(self):
+        """Test the call_history_path case where the body is the record."""
+        content = json.dumps({"id": "abc", "call_path": [{"id": "leg"}]}).encode()
+
+        assert expand_compact(decode_compact(content, "$")) == [
+            {"id": "abc", "call_path": [{"id": "leg"}]}
+        ]
+
+
+class TestDecodePool:
+    """Test decoding through worker processes."""
+
+    @pytest.fixture
+    def pool(self):
+        pool = DecodePool(1, min_bytes=10)
+        yield pool
+        pool.shutdown()
+
+    def test_should_offload_respects_min_bytes(self, pool):
+        """Test that only large bodies are sent to the workers."""
+        assert pool.should_offload(b"x" * 10) is True
+        assert pool.should_offload(b"x" * 9) is False
+
+    def test_decode_in_worker(self, pool):
+        """Test that a worker decodes and projects the records."""
+        content = json.dumps({"users": [{"id": "1"}, {"id": "2"}]}).encode()
+
+        assert pool.decode(content, "$.users[*]") == [{"id": "1"}, {"id": "2"}]
+
+    def test_pools_are_shared_per_settings(self):
+        """Test that pools differ by min_bytes too and are all shut down together."""
+        pool = get_decode_pool(1, min_bytes=10)
+        assert get_decode_pool(1, min_bytes=10) is pool
+        assert get_decode_pool(1, min_bytes=20) is not pool
+
+        shutdown_decode_pools()
+
+        assert decoding._pools == {}
+
+
+class TestStreamDecoding:
+    """Test when streams hand bodies to the decode pool."""
+
+    @pytest.fixture
+    def stream(self):
+        tap = TapZoomPhone(
+            config={
+                "client_id": "test_client_id",
+                "client_secret": "test_client_secret",
+                "account_id": "test_account_id",
+                "decode_workers": 1,
+                "decode_min_bytes": 10,
+            },
+            parse_env_config=False,
+        )
+        yield tap.streams["users"]
+        tap.release_resources()
+
+    def make_response(self):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({"users": [{"id": "1"}, {"id": "2"}]}).encode()
+        return response
+
+    def test_page_fetched_alone_is_decoded_in_process(self, stream):
+        """Test that a body is not offloaded when no other page is in flight."""
+        response = self.make_response()
+
+        stream.start_decode(response)
+
+        assert not hasattr(response, "decoded")
+        assert list(stream.parse_response(response)) == [{"id": "1"}, {"id": "2"}]
+
+    def test_concurrent_page_is_decoded_in_worker(self, stream):
+        """Test that bodies received among several fetches are decoded in the pool."""
+        response = self.make_response()
+
+        with stream.concurrent_fetch():
+            stream.start_decode(response)
+
+        assert response.decoded.result() == ([("id",)], [(0, ("1",)), (0, ("2",))])
+        assert list(stream.parse_response(response)) == [{"id": "1"}, {"id": "2"}]
+
+    def test_pool_is_shut_down_at_exit(self):
+        """Test that the tap releases the decode workers when the process exits."""
+        with patch("tap_zoomphone.tap.atexit.register") as register:
+            tap = TapZoomPhone(
+                config={
+                    "client_id": "test_client_id",
+                    "client_secret": "test_client_secret",
+                    "account_id": "test_account_id",
+                    "decode_workers": 1,
+                },
+                parse_env_config=False,
+            )
+        assert tap.streams["users"].decode_pool in decoding._pools.values()
+        release, tap_ref = register.call_args.args
+
+        release(tap_ref)
+
+        assert decoding._pools == {}
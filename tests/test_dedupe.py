@@ -0,0 +1,127 @@
+"""Tests for duplicate record removal."""
+
+from unittest.mock import Mock, patch
+
+from singer_sdk.streams import RESTStream
+
+from tap_zoomphone.dedupe import BloomFilter, DigestSet, RecordDeduplicator
+from tap_zoomphone.streams import CallHistoryPathStream, CallHistoryStream
+
+
+def call(call_id, start_time):
+    return {"id": call_id, "start_time": start_time}
+
+
+class TestRecordDeduplicator:
+    """Test the rolling window sets and the Bloom filter."""
+
+    def test_duplicates_across_window_edge(self):
+        """Test that a record repeated in the next window is dropped."""
+        dedupe = RecordDeduplicator(["id"], window_key="start_time")
+
+        assert not dedupe.is_duplicate(call("a", "2024-01-31T23:59:59Z"))
+        assert not dedupe.is_duplicate(call("b", "2024-02-01T00:00:00Z"))
+        assert dedupe.is_duplicate(call("a", "2024-01-31T23:59:59Z"))
+        assert dedupe.duplicates == 1
+
+    def test_only_recent_windows_are_kept(self):
+        """Test that keys of old windows are forgotten without a Bloom filter."""
+        dedupe = RecordDeduplicator(["id"], window_key="start_time", retained_windows=2)
+        for month in range(1, 5):
+            dedupe.is_duplicate(call(f"m{month}", f"2024-0{month}-15T00:00:00Z"))
+
+        assert len(dedupe._windows) == 2
+        assert not dedupe.is_duplicate(call("m1", "2024-01-15T00:00:00Z"))
+
+    def test_bloom_filter_catches_distant_duplicates(self):
+        """Test that the Bloom filter remembers keys of dropped windows."""
+        dedupe = RecordDeduplicator(
+            ["id"], window_key="start_time", retained_windows=1, bloom_capacity=1000
+        )
+        dedupe.is_duplicate(call("a", "2024-01-15T00:00:00Z"))
+        dedupe.is_duplicate(call("b", "2024-03-15T00:00:00Z"))
+
+        assert dedupe.is_duplicate(call("a", "2024-01-15T00:00:00Z"))
+
+    def test_digests_catch_distant_duplicates_exactly(self):
+        """Test that digests of every key are kept without dropping unique keys."""
+        dedupe = RecordDeduplicator(
+            ["id"], window_key="start_time", retained_windows=1, max_digests=100_000
+        )
+        for index in range(10_000):
+            assert not dedupe.is_duplicate(call(f"in-{index}", "2024-01-15T00:00:00Z"))
+        dedupe.is_duplicate(call("b", "2024-03-15T00:00:00Z"))
+
+        assert dedupe.is_duplicate(call("in-0", "2024-01-15T00:00:00Z"))
+        assert dedupe.duplicates == 1
+
+    def test_digests_stop_at_the_limit(self):
+        """Test that keys past the limit are not remembered beyond the windows."""
+        digests = DigestSet(max_size=3)
+        for digest in (0, 1 << 40, 5, 7):
+            digests.add(digest)
+
+        assert len(digests) == 3
+        assert digests.full
+        assert digests.add(5)
+        assert not digests.add(7)
+
+    def test_bloom_filter_error_rate(self):
+        """Test that the false positive rate stays near the configured value."""
+        bloom = BloomFilter(10_000, error_rate=0.01)
+        for index in range(10_000):
+            bloom.add(f"in-{index}")
+
+        false_positives = sum(f"out-{index}" in bloom for index in range(10_000))
+
+        assert false_positives < 300
+
+
+class TestStreamDedupe:
+    """Test that streams drop duplicates before syncing children."""
+
+    def make_stream(self, stream_class, **config):
+        mock_tap = Mock()
+        mock_tap.config = {
+            "client_id": "test_client_id",
+            "client_secret": "test_client_secret",
+            "account_id": "test_account_id",
+            **config,
+        }
+        mock_tap.state = {}
+        return stream_class(mock_tap)
+
+    def test_duplicates_are_not_yielded(self):
+        """Test that repeated call ids are yielded once."""
+        stream = self.make_stream(CallHistoryStream, dedupe_records=True)
+        records = [
+            call("a", "2024-01-31T23:59:59Z"),
+            call("a", "2024-01-31T23:59:59Z"),
+            call("b", "2024-02-01T00:00:00Z"),
+        ]
+
+        with patch.object(RESTStream, "get_records", return_value=iter(records)):
+            assert [r["id"] for r in stream.get_records(None)] == ["a", "b"]
+
+    def test_disabled_by_default(self):
+        """Test that the filter is only used with dedupe_records."""
+        stream = self.make_stream(CallHistoryStream)
+
+        assert stream.deduplicator is None
+
+    def test_user_partitions_are_deduplicated_by_default(self):
+        """Test that per-user call history drops repeated ids without dedupe_records."""
+        stream = self.make_stream(CallHistoryStream, call_history_partitioning="user")
+
+        assert stream.deduplicator.bloom is None
+        assert not stream.deduplicator.is_duplicate(call("a", "2024-01-15T00:00:00Z"))
+        for month in range(2, 6):
+            stream.deduplicator.is_duplicate(call(f"m{month}", f"2024-0{month}-15T00:00Z"))
+
+        assert stream.deduplicator.is_duplicate(call("a", "2024-01-15T00:00:00Z"))
+
+    def test_child_streams_are_not_deduplicated(self):
+        """Test that child streams, fetched once per parent record, skip the filter."""
+        stream = self.make_stream(CallHistoryPathStream, dedupe_records=True)
+
+        assert stream.deduplicator is None
@@ -0,0 +1,203 @@
+"""Tests for window record count verification and repair."""
+
+import json
+from datetime import datetime, timezone
+from unittest.mock import Mock, patch
+
+import requests
+from singer_sdk.streams import RESTStream
+
+from tap_zoomphone.integrity import (
+    STATE_KEY,
+    WindowIntegrity,
+    merge_mismatches,
+    request_window,
+    total_records,
+)
+from tap_zoomphone.streams import CallHistoryStream, UsersStream
+from tap_zoomphone.tap import TapZoomPhone
+
+URL = "https://api.zoom.us/v2/phone/call_history?from=2024-01-01T00%3A00%3A00Z&to=2024-02-01T00%3A00%3A00Z"
+WINDOW = ("2024-01-01T00:00:00Z", "2024-02-01T00:00:00Z")
+
+
+def make_stream(stream_class, state=None, **config):
+    mock_tap = Mock()
+    mock_tap.config = {
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "account_id": "test_account_id",
+        "dedupe_records": False,
+        **config,
+    }
+    mock_tap.state = state or {}
+    stream = stream_class(mock_tap)
+    stream.authenticator = None
+    stream._write_starting_replication_value(None)
+    return stream
+
+
+def page(records, total):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(
+        {"total_records": total, "call_logs": records}
+    ).encode()
+    response.request = requests.Request("GET", URL).prepare()
+    return response
+
+
+def mismatch_state(entries):
+    return {"bookmarks": {"call_history": {STATE_KEY: entries}}}
+
+
+class TestWindowIntegrity:
+    """Test the per-window tallies and their merge with state."""
+
+    def test_total_records_and_window(self):
+        """Test that the reported total and the window are read from a page."""
+        assert total_records(b'{"next_page_token": "", "total_records": 42}') == 42
+        assert total_records(b'{"users": []}') is None
+        assert request_window(URL) == WINDOW
+
+    def test_mismatch_is_tallied_across_pages(self):
+        """Test that records of all pages of a window are summed."""
+        integrity = WindowIntegrity()
+        integrity.observe(WINDOW, 3, 2)
+        integrity.observe(WINDOW, 3, 0)
+
+        assert integrity.mismatches() == [
+            {"from": WINDOW[0], "to": WINDOW[1], "expected": 3, "received": 2}
+        ]
+
+        integrity.observe(WINDOW, 3, 1)
+        assert integrity.verified() == [WINDOW]
+
+    def test_merge_replaces_revisited_windows(self):
+        """Test that windows tallied again leave state and others are kept."""
+        previous = [
+            {"from": WINDOW[0], "to": WINDOW[1], "expected": 3, "received": 2},
+            {"from": "2023-06-01T00:00:00Z", "to": "2023-07-01T00:00:00Z"},
+        ]
+        integrity = WindowIntegrity()
+        integrity.observe(WINDOW, 3, 3)
+
+        assert merge_mismatches(previous, integrity) == [previous[1]]
+
+
+class TestStreamVerification:
+    """Test that streams tally pages and record mismatches in state."""
+
+    def test_pages_are_counted(self):
+        """Test that parse_response adds the parsed records to the tally."""
+        stream = make_stream(CallHistoryStream)
+        records = list(stream.parse_response(page([{"id": "a"}], 2)))
+
+        assert len(records) == 1
+        integrity = stream.window_integrity["/v2/phone/call_history"]
+        assert integrity.mismatches()[0]["received"] == 1
+
+    def test_mismatches_are_stored_in_state(self):
+        """Test that a short window is kept in the stream state after the sync."""
+        stream = make_stream(CallHistoryStream)
+
+        def get_records(self, context):
+            yield from self.parse_response(page([{"id": "a", "start_time": WINDOW[0]}], 2))
+
+        with patch.object(RESTStream, "get_records", get_records):
+            list(stream.get_records(None))
+
+        assert stream.get_context_state(None)[STATE_KEY] == [
+            {"from": WINDOW[0], "to": WINDOW[1], "expected": 2, "received": 1}
+        ]
+
+    def test_full_table_streams_are_not_verified(self):
+        """Test that only date-range streams are verified."""
+        assert make_stream(UsersStream).window_integrity is None
+        assert make_stream(CallHistoryStream, verify_windows=False).window_integrity is None
+
+
+class TestRepair:
+    """Test that repair mode only requests the recorded windows."""
+
+    def test_repair_starts_at_earliest_mismatch(self):
+        """Test that the start and window filter follow the recorded windows."""
+        stream = make_stream(
+            CallHistoryStream,
+            state=mismatch_state([{"from": WINDOW[0], "to": WINDOW[1]}]),
+            repair_windows=True,
+        )
+
+        assert stream.get_starting_timestamp(None) == datetime(2024, 1, 1, tzinfo=timezone.utc)
+        assert stream.window_filter(datetime(2024, 1, 1, tzinfo=timezone.utc))
+        assert not stream.window_filter(datetime(2024, 2, 1, tzinfo=timezone.utc))
+
+    def test_nothing_to_repair(self):
+        """Test that no request is made when no window is recorded."""
+        stream = make_stream(CallHistoryStream, repair_windows=True)
+
+        with patch.object(RESTStream, "get_records") as get_records:
+            assert list(stream.get_records(None)) == []
+        get_records.assert_not_called()
+
+    def test_repair_reads_state_loaded_by_the_tap(self):
+        """Test that repair finds the windows in the state the tap loads after its streams."""
+        tap = TapZoomPhone(
+            config={
+                "client_id": "test_client_id",
+                "client_secret": "test_client_secret",
+                "account_id": "test_account_id",
+                "repair_windows": True,
+            },
+            state=mismatch_state([{"from": "2024-03-01T00:00:00Z", "to": "2024-04-01T00:00:00Z"}]),
+            parse_env_config=False,
+        )
+        stream = tap.streams["call_history"]
+
+        with patch.object(RESTStream, "get_records", return_value=iter([])):
+            list(stream._sync_records(None, write_messages=False))
+
+        assert stream.repair_mismatches(None) == [
+            {"from": "2024-03-01T00:00:00Z", "to": "2024-04-01T00:00:00Z"}
+        ]
+        assert list(stream.iter_windows(None)) == [
+            ("2024-03-01T00:00:00Z", "2024-04-01T00:00:00Z")
+        ]
+
+    def test_user_partitions_are_repaired_from_their_own_state(self):
+        """Test that windows recorded per user are repaired in that user's partition."""
+        state = {
+            "bookmarks": {
+                "call_history": {
+                    "partitions": [
+                        {
+                            "context": {"user_id": "u1"},
+                            "replication_key_value": "2024-06-01T00:00:00Z",
+                            STATE_KEY: [{"from": WINDOW[0], "to": WINDOW[1]}],
+                        },
+                        {
+                            "context": {"user_id": "u2"},
+                            "replication_key_value": "2024-06-01T00:00:00Z",
+                        },
+                    ]
+                }
+            }
+        }
+        stream = make_stream(
+            CallHistoryStream,
+            state=state,
+            repair_windows=True,
+            call_history_partitioning="user",
+        )
+
+        with patch.object(UsersStream, "request_records") as list_users:
+            assert stream.partitions == [{"user_id": "u1"}]
+        list_users.assert_not_called()
+        assert stream.get_starting_timestamp({"user_id": "u1"}) == datetime(
+            2024, 1, 1, tzinfo=timezone.utc
+        )
+        assert stream.window_filter(datetime(2024, 1, 1, tzinfo=timezone.utc))
+        assert not stream.window_filter(datetime(2024, 2, 1, tzinfo=timezone.utc))
+        with patch.object(RESTStream, "get_records") as get_records:
+            assert list(stream.get_records({"user_id": "u2"})) == []
+        get_records.assert_not_called()
@@ -0,0 +1,155 @@
+"""Tests for the late-arrival lookback."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+
+from singer_sdk.streams import RESTStream
+
+from tap_zoomphone.change_index import TimestampedHashIndex
+from tap_zoomphone.streams import CallHistoryStream, UsersStream
+
+
+def make_stream(stream_class, state=None, **config):
+    mock_tap = Mock()
+    mock_tap.config = {
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "account_id": "test_account_id",
+        **config,
+    }
+    mock_tap.state = state or {}
+    mock_tap.mapper = None
+    stream = stream_class(mock_tap)
+    stream._write_starting_replication_value(None)
+    return stream
+
+
+def bookmark_state(value):
+    return {
+        "bookmarks": {
+            "call_history": {
+                "replication_key": "start_time",
+                "replication_key_value": value,
+            }
+        }
+    }
+
+
+def iso(value):
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class TestLookbackStart:
+    """Test that the starting timestamp is rewound from a bookmark."""
+
+    def test_bookmark_is_rewound(self):
+        """Test that the lookback is subtracted from the bookmark."""
+        stream = make_stream(
+            CallHistoryStream,
+            state=bookmark_state("2024-05-10T12:00:00Z"),
+            lookback_hours=6,
+        )
+
+        assert stream.get_starting_timestamp(None) == datetime(
+            2024, 5, 10, 6, tzinfo=timezone.utc
+        )
+
+    def test_no_lookback_by_default(self):
+        """Test that the bookmark is used as is without lookback_hours."""
+        stream = make_stream(CallHistoryStream, state=bookmark_state("2024-05-10T12:00:00Z"))
+
+        assert stream.get_starting_timestamp(None) == datetime(
+            2024, 5, 10, 12, tzinfo=timezone.utc
+        )
+
+    def test_full_table_streams_are_unaffected(self):
+        """Test that only date-range streams have a lookback."""
+        assert make_stream(UsersStream, lookback_hours=6).lookback is None
+
+
+class TestUnchangedSuppression:
+    """Test that rescanned records are only emitted when they changed."""
+
+    def sync(self, tmp_path, records, bookmark):
+        stream = make_stream(
+            CallHistoryStream,
+            state=bookmark_state(bookmark) if bookmark else None,
+            lookback_hours=24,
+            state_dir=str(tmp_path),
+            dedupe_records=False,
+        )
+        with patch.object(RESTStream, "get_records", return_value=iter(records)):
+            return list(stream._sync_records(None, write_messages=False))
+
+    def test_unchanged_records_are_skipped(self, tmp_path):
+        """Test that a second run only emits the changed and the new record."""
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        first = [
+            {"id": "a", "start_time": iso(now - timedelta(hours=3)), "duration": 10},
+            {"id": "b", "start_time": iso(now - timedelta(hours=2)), "duration": 20},
+        ]
+        assert self.sync(tmp_path, first, None) == first
+
+        second = [
+            first[0],
+            {**first[1], "duration": 25},
+            {"id": "c", "start_time": iso(now - timedelta(hours=1)), "duration": 5},
+        ]
+        emitted = self.sync(tmp_path, second, first[1]["start_time"])
+
+        assert [record["id"] for record in emitted] == ["b", "c"]
+
+    def test_old_entries_are_pruned(self, tmp_path):
+        """Test that hashes older than the next rescan are dropped from the index."""
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        records = [
+            {"id": "old", "start_time": iso(now - timedelta(hours=30))},
+            {"id": "new", "start_time": iso(now - timedelta(hours=1))},
+        ]
+        self.sync(tmp_path, records, iso(now - timedelta(hours=40)))
+
+        index = TimestampedHashIndex(tmp_path / "call_history_lookback_index.json")
+        assert set(index.keys()) == {"new"}
+
+    def test_index_is_pruned_against_the_oldest_partition(self, tmp_path):
+        """Test that a partition with an older bookmark keeps its hashes."""
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        old, recent = iso(now - timedelta(hours=60)), iso(now - timedelta(hours=1))
+        state = {
+            "bookmarks": {
+                "call_history": {
+                    "partitions": [
+                        {"context": {"user_id": "u1"}, "replication_key_value": old},
+                        {"context": {"user_id": "u2"}, "replication_key_value": recent},
+                    ]
+                }
+            }
+        }
+        stream = make_stream(
+            CallHistoryStream, state=state, lookback_hours=24, state_dir=str(tmp_path)
+        )
+        index = stream.lookback_index
+        index.changed("u1-call", "hash", iso(now - timedelta(hours=70)))
+        index.changed("u1-older", "hash", iso(now - timedelta(hours=90)))
+        with patch.object(index, "save", wraps=index.save) as save:
+            stream._save_lookback_index()
+
+        assert set(index.keys()) == {"u1-call"}
+        save.assert_called_once()
+
+    def test_index_starts_at_start_date(self, tmp_path):
+        """Test that records before start_date are not hashed."""
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        stream = make_stream(
+            CallHistoryStream,
+            lookback_hours=24,
+            state_dir=str(tmp_path),
+            start_date=iso(now - timedelta(hours=2)),
+        )
+        records = [
+            {"id": "before", "start_time": iso(now - timedelta(hours=5))},
+            {"id": "after", "start_time": iso(now - timedelta(hours=1))},
+        ]
+
+        assert list(stream._drop_unchanged(records, None)) == records
+        assert set(stream.lookback_index.keys()) == {"after"}
@@ -0,0 +1,76 @@
+"""Tests for the tracemalloc memory profiler."""
+
+import json
+import tracemalloc
+from unittest.mock import patch
+
+import pytest
+
+from tap_zoomphone.memory import MemoryProfiler, component
+from tap_zoomphone.streams import UsersStream
+from tap_zoomphone.tap import TapZoomPhone
+
+
+@pytest.fixture
+def profiler():
+    tracemalloc.start(4)
+    profiler = MemoryProfiler(interval=3600, top=5)
+    profiler.sample()
+    yield profiler
+    tracemalloc.stop()
+
+
+class TestMemoryProfiler:
+    """Test attribution of retained memory."""
+
+    def test_component(self):
+        """Test that files map to tap modules and library components."""
+        import tap_zoomphone.client
+
+        assert component(tap_zoomphone.client.__file__) == "tap_zoomphone.client"
+        assert component(json.decoder.__file__) == "json"
+        assert component("/somewhere/else.py") == "other"
+
+    def test_child_streams_are_excluded(self, profiler):
+        """Test that a parent's retained memory does not include its children's."""
+        held = []
+        with profiler.measure("parent"):
+            held.append(bytearray(2_000_000))
+            with profiler.measure("child"):
+                held.append(bytearray(1_000_000))
+
+        assert 1_000_000 <= profiler.stream_sizes["child"] < 1_100_000
+        assert 2_000_000 <= profiler.stream_sizes["parent"] < 2_100_000
+
+    def test_report(self, profiler):
+        """Test that the report lists streams and sites with their tap caller."""
+        held = []
+        with profiler.measure("users"):
+            held.append(json.loads("[" + ",".join(['"' + "x" * 100 + '"'] * 20000) + "]"))
+
+        report = profiler.report()
+
+        assert "By component:" in report
+        assert "users" in report.split("By stream")[1]
+        assert "json/decoder.py" in report.split("Top allocation sites:")[1]
+        assert len(profiler.samples) == 2
+
+    def test_stream_syncs_are_measured(self, profiler):
+        """Test that stream syncs report to the profiler."""
+        tap = TapZoomPhone(
+            config={
+                "client_id": "test_client_id",
+                "client_secret": "test_client_secret",
+                "account_id": "test_account_id",
+            },
+            parse_env_config=False,
+        )
+        stream = tap.streams["users"]
+        stream.memory_profiler = profiler
+
+        with patch.object(
+            UsersStream, "get_records", return_value=iter([{"id": "1"}, {"id": "2"}])
+        ):
+            list(stream._sync_records(None, write_messages=False))
+
+        assert "users" in profiler.stream_sizes
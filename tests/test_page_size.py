@@ -0,0 +1,111 @@
+"""Tests for configurable and adaptive page sizes."""
+
+import json
+from datetime import timedelta
+
+import pytest
+import requests
+
+from tap_zoomphone.page_size import AdaptivePageSize
+from tap_zoomphone.pagination import PageState
+from tap_zoomphone.tap import TapZoomPhone
+
+
+def make_tap(**config):
+    return TapZoomPhone(
+        config={
+            "client_id": "test_client_id",
+            "client_secret": "test_client_secret",
+            "account_id": "test_account_id",
+            **config,
+        },
+        parse_env_config=False,
+    )
+
+
+def make_response(page_size, records, seconds):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps({"call_logs": [{}] * records}).encode()
+    response.elapsed = timedelta(seconds=seconds)
+    response.request = requests.Request(
+        "GET",
+        "https://api.zoom.us/v2/phone/call_history",
+        params={"page_size": page_size},
+    ).prepare()
+    return response
+
+
+class TestAdaptivePageSize:
+    """Test when the size shrinks and grows."""
+
+    @pytest.mark.parametrize(
+        ("latency", "size", "records", "expected"),
+        [
+            (6.0, 1000, 200, 100),  # slow
+            (1.0, 5_000_000, 200, 100),  # large
+            (1.0, 1000, 200, 300),  # full, fast and small
+            (1.0, 1000, 150, 200),  # not full
+            (4.0, 1000, 200, 200),  # would be too slow at 300
+        ],
+    )
+    def test_observe(self, latency, size, records, expected):
+        """Test that pages move the size within the endpoint's bounds."""
+        page_size = AdaptivePageSize(200, 300)
+
+        page_size.observe(200, latency, size, records)
+
+        assert page_size.size == expected
+
+    def test_bounds_and_stale_pages(self):
+        """Test the minimum, the maximum and pages requested at an older size."""
+        page_size = AdaptivePageSize(20, 300)
+        assert page_size.shrink() and page_size.size == 10
+        assert not page_size.shrink()
+        assert not page_size.observe(20, 60.0, 0, 0)
+
+        page_size = AdaptivePageSize(250, 300)
+        assert page_size.grow() and page_size.size == 300
+        assert not page_size.grow()
+
+
+class TestStreamPageSize:
+    """Test page sizes on streams."""
+
+    def test_configured_size_is_capped(self):
+        """Test that configured sizes apply up to the endpoint's maximum."""
+        tap = make_tap(page_sizes={"users": 50, "call_history": 1000})
+
+        assert tap.streams["users"].page_size == 50
+        assert tap.streams["sms_sessions"].page_size == 100
+        assert tap.streams["call_history"].page_size == 300
+        assert tap.streams["call_history_path"].page_size is None
+
+    def test_adapts_at_window_boundaries(self):
+        """Test that a slow page shrinks the size of the next window only."""
+        stream = make_tap(adaptive_page_size=True).streams["call_history"]
+        strategy = stream._pagination_strategy
+        state = strategy.start_state()
+        assert strategy.get_url_params(None, state)["page_size"] == 300
+
+        stream.observe_page(make_response(300, 300, 20.0), 300)
+
+        assert strategy.page_size == 150
+        next_page = PageState(state.window, "token", 2, state.page_size)
+        assert strategy.get_url_params(None, next_page)["page_size"] == 300
+        assert strategy.get_url_params(None, strategy.start_state())["page_size"] == 150
+
+    def test_states_carry_the_size_of_their_chain(self):
+        """Test that states get their size from the strategy, not from the request."""
+        strategy = make_tap().streams["users"]._pagination_strategy
+        state = PageState()
+
+        assert strategy.get_url_params(None, state)["page_size"] == 100
+        assert state.page_size is None
+
+        first = strategy.start_state()
+        strategy.page_size = 50
+        response = make_response(100, 100, 1.0)
+        response._content = b'{"next_page_token": "abc", "users": []}'
+        assert strategy.next_state(response, first).page_size == 100
+        assert strategy.start_state().page_size == 50
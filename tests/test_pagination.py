@@ -1,22 +1,72 @@
 """Tests for pagination logic."""
 
+import json
 import logging
 from datetime import datetime, timezone
 from unittest.mock import Mock, patch
 from urllib.parse import urlparse, parse_qs
 
 import pytest
+import requests
 from dateutil.relativedelta import relativedelta
 
 from tap_zoomphone.pagination import (
+    PageState,
     TokenPaginationStrategy,
     TokenBasedDateRangePaginationStrategy,
     PageCountBasedDateRangePaginationStrategy,
     SinglePageStrategy,
+    Window,
     ZoomDateJsonPaginator,
+    next_page_token,
+    page_count,
+    top_level_field,
 )
 
 
+def make_response(body):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(body).encode()
+    return response
+
+
+class TestTopLevelFields:
+    """Test reading pagination fields from raw response bodies."""
+
+    def test_leading_members(self):
+        """Test that fields ahead of the records are read without decoding."""
+        content = b'{"page_count": 3, "page_size": 300, "next_page_token": "a\\"b", "call_logs": []}'
+
+        assert page_count(content) == 3
+        assert next_page_token(content) == 'a"b'
+
+    def test_nested_and_string_occurrences_are_ignored(self):
+        """Test that keys inside records or string values are not mistaken for fields."""
+        content = json.dumps(
+            {
+                "users": [{"id": "1", "next_page_token": "nested", "page_count": 9}],
+                "note": '"next_page_token": "in-string"',
+            }
+        ).encode()
+
+        assert next_page_token(content) is None
+        assert page_count(content) is None
+
+    def test_scan_stops_at_records(self):
+        """Test that the body past the first nested value is neither read nor decoded."""
+        content = json.dumps(
+            {"users": [{"next_page_token": "nested"}], "next_page_token": "top"}
+        ).encode()
+
+        with patch("tap_zoomphone.pagination.json.loads", wraps=json.loads) as loads:
+            assert next_page_token(content) is None
+            assert top_level_field(content, "missing") is None
+
+        loads.assert_not_called()
+        assert next_page_token(b'{"next_page_token": ""}') is None
+
+
 class TestTokenPaginationStrategy:
     """Test token-based pagination strategy."""
 
@@ -30,8 +80,7 @@ class TestTokenPaginationStrategy:
     def test_request_with_token(self):
         """Test request with next page token."""
         strategy = TokenPaginationStrategy(page_size=100)
-        next_page_token = {"next_page_token": "abc123"}
-        params = strategy.get_url_params(context=None, next_page_token=next_page_token)
+        params = strategy.get_url_params(context=None, next_page_token=PageState(None, "abc123", 2))
         
         assert params == {
             "page_size": 100,
@@ -41,26 +90,23 @@ class TestTokenPaginationStrategy:
     def test_request_with_empty_token(self):
         """Test request with empty token."""
         strategy = TokenPaginationStrategy(page_size=100)
-        next_page_token = {"next_page_token": None}
-        params = strategy.get_url_params(context=None, next_page_token=next_page_token)
+        params = strategy.get_url_params(context=None, next_page_token=PageState())
         
         assert params == {"page_size": 100}
 
-    def test_should_continue_with_token(self):
-        """Test should_continue returns True when token exists."""
+    def test_next_state_with_token(self):
+        """Test that a token leads to the next page."""
         strategy = TokenPaginationStrategy()
-        mock_response = Mock()
-        mock_response.json.return_value = {"next_page_token": "abc123"}
+        state = strategy.next_state(make_response({"next_page_token": "abc123"}), None)
         
-        assert strategy.should_continue(mock_response) is True
+        assert state.next_page_token == "abc123"
+        assert state.page == 2
 
-    def test_should_continue_without_token(self):
-        """Test should_continue returns False when no token."""
+    def test_next_state_without_token(self):
+        """Test that pagination ends without a token."""
         strategy = TokenPaginationStrategy()
-        mock_response = Mock()
-        mock_response.json.return_value = {}
         
-        assert strategy.should_continue(mock_response) is False
+        assert strategy.next_state(make_response({}), PageState()) is None
 
 
 class TestTokenBasedDateRangePaginationStrategy:
@@ -76,66 +122,39 @@ class TestTokenBasedDateRangePaginationStrategy:
             logger=self.logger
         )
 
-    def test_extract_pagination_data_with_token(self):
-        """Test SMS Sessions data extraction with token."""
-        mock_response = Mock()
-        mock_response.request.url = "https://api.zoom.us/v2/phone/sms/sessions?from=2024-01-01T00:00:00Z&to=2024-01-31T23:59:59Z"
-        mock_response.json.return_value = {
-            "next_page_token": "abc123",
-            "sms_sessions": [{"id": "1"}, {"id": "2"}]
-        }
+    def test_next_state_with_token(self):
+        """Test that a token leads to the next page of the same window."""
+        state = PageState(Window(datetime(2024, 1, 1, tzinfo=timezone.utc), datetime(2024, 2, 1, tzinfo=timezone.utc)))
+        response = make_response({"next_page_token": "abc123", "sms_sessions": [{"id": "1"}]})
         
-        data = self.strategy.extract_pagination_data(mock_response, mock_response.request.url)
+        next_state = self.strategy.next_state(response, state)
         
-        assert data["next_page_token"] == "abc123"
-        assert data["last_from"] == "2024-01-01T00:00:00Z"
-        assert data["last_to"] == "2024-01-31T23:59:59Z"
-        assert data["has_more"] is True  # SMS Sessions: Only check token
-
-    def test_extract_pagination_data_without_token(self):
-        """Test SMS Sessions data extraction without token."""
-        mock_response = Mock()
-        mock_response.request.url = "https://api.zoom.us/v2/phone/sms/sessions?from=2024-01-01T00:00:00Z&to=2024-01-31T23:59:59Z"
-        mock_response.json.return_value = {
-            "sms_sessions": [{"id": "1"}]
-            # No next_page_token field
-        }
+        assert next_state.window is state.window
+        assert next_state.next_page_token == "abc123"
+
+    def test_next_state_without_token(self):
+        """Test that a window without more pages moves on to the next month."""
+        state = PageState(Window(datetime(2024, 1, 1, tzinfo=timezone.utc), datetime(2024, 2, 1, tzinfo=timezone.utc)))
         
-        data = self.strategy.extract_pagination_data(mock_response, mock_response.request.url)
+        next_state = self.strategy.next_state(make_response({"sms_sessions": [{"id": "1"}]}), state)
         
-        assert data["next_page_token"] is None
-        assert data["has_more"] is True  # Should continue to next month since 2024-01-31 is in the past
-
-    def test_extract_pagination_data_without_token_future_date(self):
-        """Test SMS Sessions data extraction without token when date range is in the future."""
-        mock_response = Mock()
-        # Use a future date (next year)
-        future_date = datetime.now(timezone.utc).replace(year=2026, month=1, day=31)
-        future_date_str = future_date.strftime('%Y-%m-%dT%H:%M:%SZ')
-        mock_response.request.url = f"https://api.zoom.us/v2/phone/sms/sessions?from=2026-01-01T00:00:00Z&to={future_date_str}"
-        mock_response.json.return_value = {
-            "sms_sessions": [{"id": "1"}]
-            # No next_page_token field
-        }
-        
-        data = self.strategy.extract_pagination_data(mock_response, mock_response.request.url)
+        assert next_state.next_page_token is None
+        assert next_state.window.from_param == "2024-02-01T00:00:00Z"
+        assert next_state.window.to_param == "2024-03-01T00:00:00Z"
+
+    def test_next_state_without_token_future_date(self):
+        """Test that pagination ends after the window reaching past now."""
+        start = datetime.now(timezone.utc) + relativedelta(months=1)
+        state = PageState(Window(start, start + relativedelta(months=1)))
         
-        assert data["next_page_token"] is None
-        assert data["has_more"] is False  # Should not continue since date is in the future
+        assert self.strategy.next_state(make_response({"sms_sessions": []}), state) is None
 
-    def test_extract_pagination_data_ignores_page_count(self):
+    def test_next_state_ignores_page_count(self):
         """Test that SMS Sessions strategy ignores page_count if present."""
-        mock_response = Mock()
-        mock_response.request.url = "https://api.zoom.us/v2/phone/sms/sessions"
-        mock_response.json.return_value = {
-            "next_page_token": "abc123",
-            "page_count": 5,  # This should be ignored
-            "sms_sessions": [{"id": "1"}]
-        }
-        
-        data = self.strategy.extract_pagination_data(mock_response, mock_response.request.url)
+        state = PageState(Window(datetime(2024, 1, 1, tzinfo=timezone.utc), datetime(2024, 2, 1, tzinfo=timezone.utc)))
+        response = make_response({"next_page_token": "abc123", "page_count": 1, "sms_sessions": [{"id": "1"}]})
         
-        assert data["has_more"] is True  # Should use token, not page_count
+        assert self.strategy.next_state(response, state).next_page_token == "abc123"
 
 
 class TestPageCountBasedDateRangePaginationStrategy:
@@ -151,53 +170,26 @@ class TestPageCountBasedDateRangePaginationStrategy:
             logger=self.logger
         )
 
-    def test_extract_pagination_data_with_page_count(self):
-        """Test Call History data extraction with page count."""
-        mock_response = Mock()
-        mock_response.request.url = "https://api.zoom.us/v2/phone/call_history?from=2024-01-01T00:00:00Z&to=2024-01-31T23:59:59Z"
-        mock_response.json.return_value = {
-            "next_page_token": "def456",
-            "page_count": 5,
-            "call_logs": [{"id": "1"}, {"id": "2"}]
-        }
-        
-        data = self.strategy.extract_pagination_data(mock_response, mock_response.request.url)
-        
-        assert data["next_page_token"] == "def456"
-        assert data["last_from"] == "2024-01-01T00:00:00Z"
-        assert data["last_to"] == "2024-01-31T23:59:59Z"
-        assert data["page_count"] == 5
-        assert data["has_more"] is True  # Call History: Use page_count
-
-    def test_extract_pagination_data_no_more_pages(self):
-        """Test Call History data extraction when no more pages."""
-        mock_response = Mock()
-        mock_response.request.url = "https://api.zoom.us/v2/phone/call_history?from=2024-01-01T00:00:00Z&to=2024-01-31T23:59:59Z"
-        mock_response.json.return_value = {
-            "next_page_token": "def456",  # Misleading token - still present
-            "page_count": 0,  # But page_count indicates no more pages
-            "call_logs": [{"id": "1"}]
-        }
+    def test_next_state_with_page_count(self):
+        """Test that the token is followed while pages remain."""
+        state = PageState(Window(datetime(2024, 1, 1, tzinfo=timezone.utc), datetime(2024, 2, 1, tzinfo=timezone.utc)))
+        response = make_response({"next_page_token": "def456", "page_count": 5, "call_logs": [{"id": "1"}]})
         
-        data = self.strategy.extract_pagination_data(mock_response, mock_response.request.url)
+        next_state = self.strategy.next_state(response, state)
         
-        assert data["next_page_token"] == "def456"  # Still extracted
-        assert data["page_count"] == 0
-        assert data["has_more"] is False  # Call History: Use page_count, ignore token
-
-    def test_extract_pagination_data_ignores_misleading_token(self):
-        """Test that Call History strategy ignores misleading token."""
-        mock_response = Mock()
-        mock_response.request.url = "https://api.zoom.us/v2/phone/call_history"
-        mock_response.json.return_value = {
-            "next_page_token": "misleading_token",  # Misleading token
-            "page_count": 0,  # But page_count is 0
-            "call_logs": [{"id": "1"}]
-        }
+        assert next_state.window is state.window
+        assert next_state.next_page_token == "def456"
+        assert next_state.page == 2
+
+    def test_next_state_ignores_misleading_token(self):
+        """Test that Call History strategy ignores the token when page_count says no more pages."""
+        state = PageState(Window(datetime(2024, 1, 1, tzinfo=timezone.utc), datetime(2024, 2, 1, tzinfo=timezone.utc)))
+        response = make_response({"next_page_token": "misleading_token", "page_count": 0, "call_logs": [{"id": "1"}]})
         
-        data = self.strategy.extract_pagination_data(mock_response, mock_response.request.url)
+        next_state = self.strategy.next_state(response, state)
         
-        assert data["has_more"] is False  # Should use page_count, not token
+        assert next_state.next_page_token is None
+        assert next_state.window.from_param == "2024-02-01T00:00:00Z"
 
     def test_initial_request_no_token(self):
         """Test initial request with no token."""
@@ -211,68 +203,15 @@ class TestPageCountBasedDateRangePaginationStrategy:
 
     def test_request_with_valid_token(self):
         """Test request with valid token and date range."""
-        next_page_token = {
-            "next_page_token": "abc123",
-            "last_from": "2024-01-01T00:00:00Z",
-            "last_to": "2024-01-31T23:59:59Z",
-            "last_page_in_batch": False
-        }
-        params = self.strategy.get_url_params(context=None, next_page_token=next_page_token)
+        window = Window(datetime(2024, 1, 1, tzinfo=timezone.utc), datetime(2024, 2, 1, tzinfo=timezone.utc))
+        params = self.strategy.get_url_params(context=None, next_page_token=PageState(window, "abc123", 2))
         
         assert params == {
             "page_size": 300,
             "next_page_token": "abc123",
             "from": "2024-01-01T00:00:00Z",
-            "to": "2024-01-31T23:59:59Z"
-        }
-
-    def test_request_with_last_page_in_batch(self):
-        """Test request when last page in batch."""
-        next_page_token = {
-            "next_page_token": "abc123",
-            "last_from": "2024-01-01T00:00:00Z",
-            "last_to": "2024-01-31T23:59:59Z",
-            "last_page_in_batch": True
+            "to": "2024-02-01T00:00:00Z"
         }
-        params = self.strategy.get_url_params(context=None, next_page_token=next_page_token)
-        
-        # Should advance to next month
-        assert params["page_size"] == 300
-        assert params["from"] == "2024-01-31T23:59:59Z"
-        assert "to" in params
-        assert params["to"] != "2024-01-31T23:59:59Z"  # Should be next month
-
-    def test_has_valid_token(self):
-        """Test _has_valid_token method."""
-        # Valid token
-        token = {"next_page_token": "abc123", "last_page_in_batch": False}
-        assert self.strategy._has_valid_token(token) is True
-        
-        # Invalid token - last page in batch
-        token = {"next_page_token": "abc123", "last_page_in_batch": True}
-        assert self.strategy._has_valid_token(token) is False
-        
-        # Invalid token - no token
-        token = {"last_page_in_batch": False}
-        assert self.strategy._has_valid_token(token) is False
-
-    def test_has_date_range(self):
-        """Test _has_date_range method."""
-        # Has date range
-        token = {"last_from": "2024-01-01T00:00:00Z", "last_to": "2024-01-31T23:59:59Z"}
-        assert self.strategy._has_date_range(token) is True
-        
-        # Missing date range
-        token = {"last_from": "2024-01-01T00:00:00Z"}
-        assert self.strategy._has_date_range(token) is False
-
-    def test_calculate_next_month_end(self):
-        """Test _calculate_next_month_end method."""
-        last_to = "2024-01-31T23:59:59Z"
-        next_month_end = self.strategy._calculate_next_month_end(last_to)
-        
-        # Should be February 29th (leap year) or 28th
-        assert "2024-02-29" in next_month_end or "2024-02-28" in next_month_end
 
 
 class TestSinglePageStrategy:
@@ -284,148 +223,104 @@ class TestSinglePageStrategy:
         params = strategy.get_url_params(context=None, next_page_token=None)
         assert params == {}
 
-    def test_should_continue(self):
-        """Test should_continue always returns False."""
+    def test_next_state(self):
+        """Test that there is never a next page."""
         strategy = SinglePageStrategy()
-        mock_response = Mock()
-        assert strategy.should_continue(mock_response) is False
+        assert strategy.next_state(make_response({"next_page_token": "abc123"}), None) is None
 
 
 class TestZoomDateJsonPaginator:
-    """Test the ZoomDateJsonPaginator class."""
+    """Test the ZoomDateJsonPaginator state machine."""
 
     def setup_method(self):
         """Set up test fixtures."""
         self.logger = Mock(spec=logging.Logger)
-        self.strategy = Mock()
-        self.paginator = ZoomDateJsonPaginator(
-            jsonpath="$.next_page_token",
-            logger=self.logger,
-            pagination_strategy=self.strategy
-        )
 
-    def test_get_next_with_token(self):
-        """Test get_next with valid token."""
-        mock_response = Mock()
-        mock_response.request.url = "https://api.zoom.us/v2/phone/users?from=2024-01-01T00:00:00Z&to=2024-01-31T23:59:59Z"
-        mock_response.json.return_value = {
-            "next_page_token": "abc123",
-            "page_count": 5
-        }
-        
-        # Mock the strategy's extract_pagination_data method
-        self.strategy.extract_pagination_data.return_value = {
+    def _paginator(self, strategy, start=datetime(2024, 1, 1, tzinfo=timezone.utc)):
+        paginator = ZoomDateJsonPaginator("$.next_page_token", self.logger, strategy)
+        with patch.object(strategy, "_get_initial_start_date", return_value=start):
+            strategy.get_url_params(None, paginator.current_value)
+        return paginator
+
+    def test_page_count_strategy_pages_through_window(self):
+        """Test that the token is followed until page_count pages were read."""
+        strategy = PageCountBasedDateRangePaginationStrategy(
+            page_size=300, history_window=relativedelta(months=6), logger=self.logger
+        )
+        paginator = self._paginator(strategy)
+        window = paginator.current_value.window
+
+        paginator.advance(make_response({"page_count": 2, "next_page_token": "abc123"}))
+        state = paginator.current_value
+        assert state.window is window
+        assert state.page == 2
+        assert strategy.get_url_params(None, state) == {
+            "page_size": 300,
+            "from": "2024-01-01T00:00:00Z",
+            "to": "2024-02-01T00:00:00Z",
             "next_page_token": "abc123",
-            "last_from": "2024-01-01T00:00:00Z",
-            "last_to": "2024-01-31T23:59:59Z",
-            "page_count": 5,
-            "has_more": True
-        }
-        
-        result = self.paginator.get_next(mock_response)
-        
-        assert result is not None
-        assert result["next_page_token"] == "abc123"
-        assert result["last_from"] == "2024-01-01T00:00:00Z"
-        assert result["last_to"] == "2024-01-31T23:59:59Z"
-        assert result["last_page_in_batch"] is False
-
-    def test_get_next_no_token(self):
-        """Test get_next with no token."""
-        mock_response = Mock()
-        mock_response.request.url = "https://api.zoom.us/v2/phone/users"
-        mock_response.json.return_value = {"page_count": 0}
-        
-        # Mock the strategy's extract_pagination_data method
-        self.strategy.extract_pagination_data.return_value = {
-            "next_page_token": None,
-            "last_from": None,
-            "last_to": None,
-            "page_count": 0,
-            "has_more": False
         }
-        
-        result = self.paginator.get_next(mock_response)
-        
-        assert result is None
 
-    def test_advance_reset_sub_page_count(self):
-        """Test advance resets sub_page_count when last page in batch."""
-        # Make the mock strategy appear as a date range strategy
-        from tap_zoomphone.pagination import TokenBasedDateRangePaginationStrategy
-        self.paginator.pagination_strategy = Mock(spec=TokenBasedDateRangePaginationStrategy)
-        
-        self.paginator._last_seen_record = {"last_page_in_batch": True}
-        self.paginator._sub_page_count = 5
-        
-        mock_response = Mock()
-        self.paginator.advance(mock_response)
-        
-        assert self.paginator._sub_page_count == 1
+        # Zoom still sends a token on the last page
+        paginator.advance(make_response({"page_count": 2, "next_page_token": "misleading"}))
+        state = paginator.current_value
+        assert state.page == 1
+        assert state.next_page_token is None
+        assert strategy.get_url_params(None, state)["from"] == "2024-02-01T00:00:00Z"
+        assert strategy.get_url_params(None, state)["to"] == "2024-03-01T00:00:00Z"
 
-    def test_advance_increment_sub_page_count(self):
-        """Test advance increments sub_page_count when not last page."""
-        # Make the mock strategy appear as a date range strategy
-        from tap_zoomphone.pagination import TokenBasedDateRangePaginationStrategy
-        self.paginator.pagination_strategy = Mock(spec=TokenBasedDateRangePaginationStrategy)
-        
-        self.paginator._last_seen_record = {"last_page_in_batch": False}
-        self.paginator._sub_page_count = 2
-        
-        mock_response = Mock()
-        self.paginator.advance(mock_response)
-        
-        assert self.paginator._sub_page_count == 3
+    def test_token_strategy_advances_window_without_token(self):
+        """Test that an empty token moves on to the next window."""
+        strategy = TokenBasedDateRangePaginationStrategy(
+            page_size=300, history_window=relativedelta(months=6), logger=self.logger
+        )
+        paginator = self._paginator(strategy)
 
-    def test_has_more_future_date(self):
-        """Test has_more returns True for future dates."""
-        # Make the mock strategy appear as a date range strategy
-        from tap_zoomphone.pagination import TokenBasedDateRangePaginationStrategy
-        self.paginator.pagination_strategy = Mock(spec=TokenBasedDateRangePaginationStrategy)
-        
-        self.paginator._last_seen_record = {
-            "page_count": 5,
-            "last_to": "2025-01-01T00:00:00Z"
-        }
-        self.paginator._sub_page_count = 5
-        
-        mock_response = Mock()
-        result = self.paginator.has_more(mock_response)
-        
-        assert result is True
+        paginator.advance(make_response({"next_page_token": "abc123", "page_count": 1}))
+        assert paginator.current_value.next_page_token == "abc123"
 
-    def test_has_more_past_date(self):
-        """Test has_more returns False for past dates."""
-        self.paginator._last_seen_record = {
-            "page_count": 5,
-            "last_to": "2020-01-01T00:00:00Z"
-        }
-        self.paginator._sub_page_count = 5
-        
-        mock_response = Mock()
-        result = self.paginator.has_more(mock_response)
-        
-        assert result is False
+        paginator.advance(make_response({"next_page_token": ""}))
+        assert paginator.current_value.next_page_token is None
+        assert paginator.current_value.window.from_param == "2024-02-01T00:00:00Z"
 
-    def test_strategy_aware_behavior(self):
-        """Test that paginator behaves differently based on strategy type."""
-        # Test with token strategy
-        token_strategy = TokenPaginationStrategy(page_size=100)
-        token_paginator = ZoomDateJsonPaginator("$.next_page_token", self.logger, token_strategy)
-        token_paginator._last_seen_record = {"next_page_token": "abc123"}
-        
-        mock_response = Mock()
-        has_more_token = token_paginator.has_more(mock_response)
-        assert has_more_token is True
-        
-        # Test with single page strategy
-        single_strategy = SinglePageStrategy()
-        single_paginator = ZoomDateJsonPaginator("$.next_page_token", self.logger, single_strategy)
-        
-        has_more_single = single_paginator.has_more(mock_response)
-        assert has_more_single is False
+    def test_finishes_after_current_window(self):
+        """Test that pagination stops when no window starts before now."""
+        strategy = PageCountBasedDateRangePaginationStrategy(
+            page_size=300, history_window=relativedelta(months=6), logger=self.logger
+        )
+        paginator = self._paginator(strategy, start=datetime.now(timezone.utc))
+
+        paginator.advance(make_response({"page_count": 0}))
 
+        assert paginator.finished
 
+    def test_repeated_token_is_a_loop(self):
+        """Test that the SDK's loop detection still sees repeated tokens."""
+        paginator = ZoomDateJsonPaginator(
+            "$.next_page_token", self.logger, TokenPaginationStrategy(page_size=100)
+        )
+        paginator.advance(make_response({"next_page_token": "abc123"}))
+
+        with pytest.raises(RuntimeError, match="Loop detected"):
+            paginator.advance(make_response({"next_page_token": "abc123"}))
+
+    def test_strategy_aware_behavior(self):
+        """Test that paginator behaves differently based on strategy type."""
+        token_paginator = ZoomDateJsonPaginator(
+            "$.next_page_token", self.logger, TokenPaginationStrategy(page_size=100)
+        )
+        token_paginator.advance(make_response({"next_page_token": "abc123"}))
+        assert not token_paginator.finished
+        assert token_paginator.current_value.next_page_token == "abc123"
+        token_paginator.advance(make_response({"next_page_token": ""}))
+        assert token_paginator.finished
+
+        single_paginator = ZoomDateJsonPaginator(
+            "$.next_page_token", self.logger, SinglePageStrategy()
+        )
+        assert single_paginator.current_value is None
+        single_paginator.advance(make_response({"next_page_token": "abc123"}))
+        assert single_paginator.finished
 
 
 class TestPaginationIntegration:
@@ -440,14 +335,12 @@ class TestPaginationIntegration:
         assert params == {"page_size": 100}
         
         # Second request with token
-        next_page_token = {"next_page_token": "abc123"}
-        params = strategy.get_url_params(context=None, next_page_token=next_page_token)
+        state = strategy.next_state(make_response({"next_page_token": "abc123"}), strategy.start_state())
+        params = strategy.get_url_params(context=None, next_page_token=state)
         assert params == {"page_size": 100, "next_page_token": "abc123"}
         
-        # Third request with empty token (end of pagination)
-        next_page_token = {"next_page_token": None}
-        params = strategy.get_url_params(context=None, next_page_token=next_page_token)
-        assert params == {"page_size": 100}
+        # No token ends pagination
+        assert strategy.next_state(make_response({"next_page_token": ""}), state) is None
 
     def test_sms_sessions_stream_pagination_flow(self):
         """Test complete pagination flow for SMS sessions stream."""
@@ -463,28 +356,22 @@ class TestPaginationIntegration:
             mock_start_date.return_value = datetime(2024, 1, 1, tzinfo=timezone.utc)
             
             # Initial request
-            params = strategy.get_url_params(context=None, next_page_token=None)
+            state = strategy.start_state()
+            params = strategy.get_url_params(context=None, next_page_token=state)
             assert params["page_size"] == 300
-            assert "from" in params
-            assert "to" in params
+            assert params["from"] == "2024-01-01T00:00:00Z"
+            assert params["to"] == "2024-02-01T00:00:00Z"
             
-            # Request with valid token and date range
-            next_page_token = {
-                "next_page_token": "abc123",
-                "last_from": "2024-01-01T00:00:00Z",
-                "last_to": "2024-01-31T23:59:59Z",
-                "last_page_in_batch": False
-            }
-            params = strategy.get_url_params(context=None, next_page_token=next_page_token)
+            # Request with a token stays in the window
+            state = strategy.next_state(make_response({"next_page_token": "abc123"}), state)
+            params = strategy.get_url_params(context=None, next_page_token=state)
             assert params["next_page_token"] == "abc123"
             assert params["from"] == "2024-01-01T00:00:00Z"
-            assert params["to"] == "2024-01-31T23:59:59Z"
+            assert params["to"] == "2024-02-01T00:00:00Z"
             
             # Request when advancing to next month
-            next_page_token = {
-                "last_to": "2024-01-31T23:59:59Z",
-                "last_page_in_batch": True
-            }
-            params = strategy.get_url_params(context=None, next_page_token=next_page_token)
-            assert params["from"] == "2024-01-31T23:59:59Z"
-            assert "2024-02" in params["to"]  # Should be next month
+            state = strategy.next_state(make_response({"next_page_token": ""}), state)
+            params = strategy.get_url_params(context=None, next_page_token=state)
+            assert "next_page_token" not in params
+            assert params["from"] == "2024-02-01T00:00:00Z"
+            assert params["to"] == "2024-03-01T00:00:00Z"
@@ -0,0 +1,238 @@
+"""Tests for per-user call history partitions."""
+
+import json
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from tap_zoomphone.partitions import PartitionPrefetcher
+from tap_zoomphone.streams import CallHistoryStream, UsersStream
+from tap_zoomphone.tap import TapZoomPhone
+
+
+class TestPartitionPrefetcher:
+    """Test that upcoming partitions are fetched ahead of the sync loop."""
+
+    def test_records_are_returned_per_partition(self):
+        """Test that each partition gets its own records, fetched ahead in order."""
+        contexts = [{"user_id": str(index)} for index in range(5)]
+        prepared = []
+        fetched = []
+
+        def fetch_batch(batch, buffers):
+            for context, buffer in zip(batch, buffers):
+                fetched.append(context["user_id"])
+                buffer.put([{"id": context["user_id"]}])
+
+        prefetcher = PartitionPrefetcher(
+            contexts, fetch_batch=fetch_batch, prepare=prepared.append, workers=2
+        )
+
+        assert list(prefetcher.records(contexts[0])) == [{"id": "0"}]
+        assert prepared == contexts[:3]
+        assert [list(prefetcher.records(context)) for context in contexts[1:]] == [
+            [{"id": str(index)}] for index in range(1, 5)
+        ]
+        assert sorted(fetched) == ["0", "1", "2", "3", "4"]
+        prefetcher.close()
+
+    def test_partitions_are_fetched_concurrently(self):
+        """Test that workers fetch several partitions at the same time."""
+        contexts = [{"user_id": str(index)} for index in range(2)]
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fetch_batch(batch, buffers):
+            barrier.wait()
+
+        prefetcher = PartitionPrefetcher(
+            contexts, fetch_batch=fetch_batch, prepare=lambda context: None, workers=2
+        )
+
+        assert list(prefetcher.records(contexts[0])) == []
+        assert list(prefetcher.records(contexts[1])) == []
+        prefetcher.close()
+
+    def test_pages_are_buffered_up_to_the_limit(self):
+        """Test that a worker waits for its pages to be read instead of holding them all."""
+        contexts = [{"user_id": "0"}]
+        put = []
+
+        def fetch_batch(batch, buffers):
+            for index in range(10):
+                buffers[0].put([{"id": index}])
+                put.append(index)
+
+        prefetcher = PartitionPrefetcher(
+            contexts,
+            fetch_batch=fetch_batch,
+            prepare=lambda context: None,
+            workers=1,
+            max_pages=2,
+        )
+        records = prefetcher.records(contexts[0])
+
+        assert next(records) == {"id": 0}
+        time.sleep(0.1)
+        assert len(put) <= 3
+        assert [record["id"] for record in records] == list(range(1, 10))
+        prefetcher.close()
+
+    def test_fetch_errors_are_raised_to_the_reader(self):
+        """Test that a failed partition raises its error after its fetched pages."""
+        contexts = [{"user_id": "0"}]
+
+        def fetch_batch(batch, buffers):
+            buffers[0].put([{"id": 0}])
+            raise RuntimeError("boom")
+
+        prefetcher = PartitionPrefetcher(
+            contexts, fetch_batch=fetch_batch, prepare=lambda context: None, workers=1
+        )
+        records = prefetcher.records(contexts[0])
+
+        assert next(records) == {"id": 0}
+        with pytest.raises(RuntimeError, match="boom"):
+            next(records)
+        prefetcher.close()
+
+
+class TestUserPartitionedCallHistory:
+    """Test call history requested per user."""
+
+    def make_stream(self, **config):
+        mock_tap = Mock()
+        mock_tap.config = {
+            "client_id": "test_client_id",
+            "client_secret": "test_client_secret",
+            "account_id": "test_account_id",
+            "call_history_partitioning": "user",
+            "start_date": "2024-01-01T00:00:00Z",
+            **config,
+        }
+        mock_tap.state = {}
+        mock_tap.streams = {"users": UsersStream(mock_tap)}
+        stream = CallHistoryStream(mock_tap)
+        stream.authenticator = None
+        return stream
+
+    def test_calls_are_requested_per_user(self):
+        """Test that partitions follow the users listing and emit each call once."""
+        calls = {
+            "u1": [{"id": "a", "start_time": "2024-01-02T00:00:00Z"}],
+            "u2": [
+                {"id": "a", "start_time": "2024-01-02T00:00:00Z"},
+                {"id": "b", "start_time": "2024-01-03T00:00:00Z"},
+            ],
+        }
+        requested = []
+
+        def send(session, prepared_request, **kwargs):
+            requested.append(prepared_request.path_url)
+            user_id = prepared_request.path_url.split("/")[4]
+            response = requests.Response()
+            response.status_code = 200
+            response._content = json.dumps(
+                {"call_logs": calls[user_id], "next_page_token": ""}
+            ).encode()
+            response.request = prepared_request
+            return response
+
+        stream = self.make_stream(verify_windows=False)
+        users = [{"id": "u1"}, {"id": "u2"}]
+        with patch.object(
+            UsersStream, "request_records", return_value=iter(users)
+        ), patch.object(requests.Session, "send", autospec=True, side_effect=send), patch(
+            "tap_zoomphone.pagination.DateRangePaginationStrategy.has_window_after",
+            return_value=False,
+        ):
+            assert stream.partitions == [{"user_id": "u1"}, {"user_id": "u2"}]
+            records = [
+                record["id"]
+                for context in stream.partitions
+                for record in stream.get_records(context)
+            ]
+
+        assert records == ["a", "b"]
+        assert {path.split("?")[0] for path in requested} == {
+            "/v2/phone/users/u1/call_history",
+            "/v2/phone/users/u2/call_history",
+        }
+        assert stream.get_context_state({"user_id": "u2"})["starting_replication_value"]
+
+    def test_partitions_are_synced_concurrently(self):
+        """Test that workers request partitions at once, each with its own session."""
+        workers = 4
+        users = [{"id": f"u{index}"} for index in range(workers)]
+        barrier = threading.Barrier(workers, timeout=5)
+        sessions = set()
+
+        def send(session, prepared_request, **kwargs):
+            barrier.wait()
+            sessions.add(id(session))
+            user_id = prepared_request.path_url.split("/")[4]
+            calls = [
+                {"id": f"{user_id}-{index}", "start_time": "2024-01-02T00:00:00Z"}
+                for index in range(3)
+            ]
+            response = requests.Response()
+            response.status_code = 200
+            response._content = json.dumps(
+                {"call_logs": calls, "total_records": 3, "next_page_token": ""}
+            ).encode()
+            response.request = prepared_request
+            return response
+
+        stream = self.make_stream(user_partition_workers=workers)
+        with patch.object(
+            UsersStream, "request_records", return_value=iter(users)
+        ), patch.object(requests.Session, "send", autospec=True, side_effect=send), patch(
+            "tap_zoomphone.pagination.DateRangePaginationStrategy.has_window_after",
+            return_value=False,
+        ):
+            records = [
+                record["id"]
+                for context in stream.partitions
+                for record in stream.get_records(context)
+            ]
+        stream.partition_prefetcher.close()
+
+        assert len(records) == 3 * workers
+        assert len(sessions) == workers
+        assert id(stream.requests_session) not in sessions
+        assert stream.window_integrity == {}
+        assert all(
+            "window_mismatches" not in stream.get_context_state(context)
+            for context in stream.partitions
+        )
+
+    def test_account_endpoint_by_default(self):
+        """Test that call history is not partitioned unless configured."""
+        stream = self.make_stream(call_history_partitioning="account")
+
+        assert stream.partitions is None
+        assert stream.get_url(None).endswith("/call_history")
+
+    def test_records_do_not_carry_the_partition(self):
+        """Test that the user and shard partition keys are not copied onto records."""
+        tap = TapZoomPhone(
+            config={
+                "client_id": "test_client_id",
+                "client_secret": "test_client_secret",
+                "account_id": "test_account_id",
+                "call_history_partitioning": "user",
+                "shard": "1/2",
+            },
+            parse_env_config=False,
+        )
+        stream = tap.streams["call_history"]
+        record = {"id": "1"}
+
+        with patch.object(stream, "_sync_children"):
+            stream._process_record(
+                record, partition_context={"user_id": "u1", "shard": "1/2"}
+            )
+
+        assert record == {"id": "1"}
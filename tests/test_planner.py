@@ -0,0 +1,166 @@
+"""Tests for the backfill planner."""
+
+import json
+import logging
+from datetime import datetime, timezone
+from unittest.mock import Mock, patch
+
+import requests
+from dateutil.relativedelta import relativedelta
+
+from tap_zoomphone.pagination import PageCountBasedDateRangePaginationStrategy
+from tap_zoomphone.planner import BackfillPlan, BackfillPlanner
+from tap_zoomphone.streams import CallHistoryPathStream, CallHistoryStream, UsersStream
+
+
+def make_tap(**config):
+    mock_tap = Mock()
+    mock_tap.config = {
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "account_id": "test_account_id",
+        **config,
+    }
+    mock_tap.state = {}
+    return mock_tap
+
+
+class TestIterWindows:
+    """Test enumeration of the windows a sync would request."""
+
+    def test_windows_cover_start_to_now(self):
+        """Test that windows are consecutive months ending after now."""
+        strategy = PageCountBasedDateRangePaginationStrategy(
+            page_size=300,
+            history_window=relativedelta(months=6),
+            logger=Mock(spec=logging.Logger),
+        )
+        start = datetime.now(timezone.utc) - relativedelta(months=3)
+
+        with patch.object(strategy, "_get_initial_start_date", return_value=start):
+            windows = list(strategy.iter_windows(None))
+
+        assert windows[0][0] == start.strftime("%Y-%m-%dT%H:%M:%SZ")
+        for (_, previous_to), (window_from, _) in zip(windows, windows[1:]):
+            assert window_from == previous_to
+        assert datetime.fromisoformat(windows[-1][1]) >= datetime.now(timezone.utc)
+        assert len(windows) == 4
+
+    def test_only_date_range_streams_have_windows(self):
+        """Test the stream hooks the planner enumerates windows with."""
+        tap = make_tap()
+        users = UsersStream(tap)
+        call_history = CallHistoryStream(tap)
+
+        assert not users.has_date_windows
+        assert list(users.iter_windows(None)) == []
+        assert call_history.has_date_windows
+        windows = list(call_history.iter_windows(None))
+        assert len(windows) >= 6
+        for (_, previous_to), (window_from, _) in zip(windows, windows[1:]):
+            assert window_from == previous_to
+
+
+class TestBackfillPlanner:
+    """Test plan projection from probed window counts."""
+
+    def setup_method(self):
+        """Set up a call_history stream with a selected call_history_path child."""
+        tap = make_tap()
+        self.stream = CallHistoryStream(tap)
+        self.stream.child_streams = [CallHistoryPathStream(tap)]
+        tap.streams = {"call_history": self.stream}
+        self.planner = BackfillPlanner(tap)
+        self.windows = [
+            ("2024-01-15T00:00:00Z", "2024-02-01T00:00:00Z"),
+            ("2024-02-01T00:00:00Z", "2024-03-01T00:00:00Z"),
+            ("2024-03-01T00:00:00Z", "2024-04-01T00:00:00Z"),
+        ]
+
+    def build(self, counts):
+        with patch.object(
+            self.stream, "iter_windows", return_value=self.windows
+        ), patch.object(self.planner, "probe_window", side_effect=counts):
+            return self.planner.build().plan
+
+    def test_projects_page_and_child_requests(self):
+        """Test page requests per window and one child request per call."""
+        plan = self.build([301, 0, 300])
+
+        stream_plan = plan["streams"]["call_history"]
+        assert [w["page_requests"] for w in stream_plan["windows"]] == [2, 1, 1]
+        assert stream_plan["page_requests"] == 4
+        assert stream_plan["child_requests"] == 601
+        assert plan["requests_by_category"] == {"heavy": 605}
+        assert plan["estimated_seconds"] == 60.5
+        assert plan["estimated_days"] == 1
+
+    def test_daily_quota_spreads_over_days(self):
+        """Test the number of days needed at the configured daily quota."""
+        self.planner.tap.config["daily_quotas"] = {"heavy": 250}
+
+        plan = self.build([301, 0, 300])
+
+        assert plan["estimated_days"] == 3
+
+    def test_probe_reads_total_records(self):
+        """Test that a probe sends page_size=1 and reads total_records."""
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({"page_count": 42, "total_records": 42}).encode()
+        self.stream.authenticator = None
+
+        with patch.object(
+            self.stream.requests_session, "send", return_value=response
+        ) as send, patch.object(self.stream, "_request") as request:
+            count = self.planner.probe_window(self.stream, None, *self.windows[0])
+
+        assert count == 42
+        request.assert_not_called()
+        prepared_request = send.call_args[0][0]
+        assert "page_size=1" in prepared_request.url
+        assert "from=2024-01-15T00%3A00%3A00Z" in prepared_request.url
+
+
+class TestBackfillPlanFilter:
+    """Test that a plan limits a run to windows with records."""
+
+    def setup_method(self):
+        """Set up a plan with an empty middle window."""
+        self.plan = BackfillPlan(
+            {
+                "streams": {
+                    "call_history": {
+                        "windows": [
+                            {"from": "2024-01-15T00:00:00Z", "total_records": 5},
+                            {"from": "2024-02-01T00:00:00Z", "total_records": 0},
+                            {"from": "2024-03-01T00:00:00Z", "total_records": None},
+                        ]
+                    }
+                }
+            }
+        )
+
+    def test_filter_skips_empty_windows(self):
+        """Test windows are matched by month and empty ones are rejected."""
+        window_filter = self.plan.window_filter("call_history")
+
+        assert window_filter(datetime(2024, 1, 20, tzinfo=timezone.utc))
+        assert not window_filter(datetime(2024, 2, 1, tzinfo=timezone.utc))
+        assert window_filter(datetime(2024, 3, 1, tzinfo=timezone.utc))
+        assert window_filter(datetime(2024, 4, 1, tzinfo=timezone.utc))
+
+    def test_unplanned_stream_is_not_filtered(self):
+        """Test that streams missing from the plan run normally."""
+        assert self.plan.window_filter("sms_sessions") is None
+
+    def test_stream_uses_plan_from_config(self, tmp_path):
+        """Test that the backfill_plan setting feeds the strategy window filter."""
+        plan_path = tmp_path / "plan.json"
+        plan_path.write_text(json.dumps(self.plan.plan))
+
+        stream = CallHistoryStream(make_tap(backfill_plan=str(plan_path)))
+        window_filter = stream._pagination_strategy.window_filter
+
+        assert not window_filter(datetime(2024, 2, 1, tzinfo=timezone.utc))
+        assert window_filter(datetime(2024, 1, 1, tzinfo=timezone.utc))
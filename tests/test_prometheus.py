@@ -0,0 +1,126 @@
+"""Tests for the Prometheus metrics exporter."""
+
+import json
+import urllib.request
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from tap_zoomphone import prometheus
+from tap_zoomphone.prometheus import MetricsRegistry, serve_http, write_textfile
+from tap_zoomphone.retry import RateLimitedError
+from tap_zoomphone.streams import CallHistoryStream
+
+URL = (
+    "https://api.zoom.us/v2/phone/call_history"
+    "?from=2024-01-01T00%3A00%3A00Z&to=2024-02-01T00%3A00%3A00Z"
+)
+
+
+class TestMetricsRegistry:
+    """Test the registry and its exposition format."""
+
+    def test_render(self):
+        """Test that counters, gauges and cumulative histogram buckets are rendered."""
+        registry = MetricsRegistry(buckets=(0.1, 1.0))
+        registry.inc(prometheus.RECORDS, {"stream": "users"}, 3)
+        registry.set(prometheus.RATE_LIMIT_REMAINING, {"category": "heavy", "type": 'a"b'}, 5)
+        registry.observe(prometheus.REQUEST_DURATION, {"stream": "users"}, 0.05)
+        registry.observe(prometheus.REQUEST_DURATION, {"stream": "users"}, 0.5)
+        registry.observe(prometheus.REQUEST_DURATION, {"stream": "users"}, 3.0)
+
+        text = registry.render()
+
+        assert '# TYPE tap_zoomphone_records_total counter' in text
+        assert 'tap_zoomphone_records_total{stream="users"} 3' in text
+        assert 'tap_zoomphone_rate_limit_remaining{category="heavy",type="a\\"b"} 5' in text
+        assert 'tap_zoomphone_request_duration_seconds_bucket{stream="users",le="0.1"} 1' in text
+        assert 'tap_zoomphone_request_duration_seconds_bucket{stream="users",le="1.0"} 2' in text
+        assert 'tap_zoomphone_request_duration_seconds_bucket{stream="users",le="+Inf"} 3' in text
+        assert 'tap_zoomphone_request_duration_seconds_count{stream="users"} 3' in text
+        assert "tap_zoomphone_retries_total" not in text
+
+    def test_textfile_and_http(self, tmp_path):
+        """Test that both exporters publish the rendered registry."""
+        registry = MetricsRegistry()
+        registry.inc(prometheus.RECORDS, {"stream": "users"})
+
+        write_textfile(registry, str(tmp_path / "tap.prom"))
+        assert (tmp_path / "tap.prom").read_text() == registry.render()
+
+        server = serve_http(registry, "127.0.0.1", 0)
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as reply:
+                assert reply.read().decode() == registry.render()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestStreamMetrics:
+    """Test that streams update the registry."""
+
+    def make_stream(self, tmp_path):
+        mock_tap = Mock()
+        mock_tap.config = {
+            "client_id": "test_client_id",
+            "client_secret": "test_client_secret",
+            "account_id": "test_account_id",
+            "metrics_textfile": str(tmp_path / "tap.prom"),
+            "metrics_interval_seconds": 3600,
+        }
+        mock_tap.state = {}
+        stream = CallHistoryStream(mock_tap)
+        stream.authenticator = None
+        return stream
+
+    def test_requests_and_pages_are_measured(self, tmp_path):
+        """Test the latency, headroom, in-flight and window metrics of a request."""
+        stream = self.make_stream(tmp_path)
+        reply = requests.Response()
+        reply.status_code = 200
+        reply._content = json.dumps({"call_logs": [{"id": "a"}]}).encode()
+        reply.headers["X-RateLimit-Remaining"] = "41"
+        reply.headers["X-RateLimit-Type"] = "Daily-limit"
+        prepared = requests.Request("GET", URL).prepare()
+        reply.request = prepared
+
+        with patch.object(stream.requests_session, "send", return_value=reply):
+            list(stream.parse_response(stream._request(prepared, None)))
+
+        registry = stream.metrics_registry
+        labels = {"stream": "call_history"}
+        assert registry.value(prometheus.IN_FLIGHT, labels) == 0
+        assert registry.value(
+            prometheus.RATE_LIMIT_REMAINING, {"category": "heavy", "type": "Daily-limit"}
+        ) == 41
+        assert registry.value(prometheus.WINDOW_START, labels) == 1704067200
+        assert 'tap_zoomphone_request_duration_seconds_count{stream="call_history"} 1' in (
+            registry.render()
+        )
+
+    def test_headroom_of_rate_limited_request(self, tmp_path):
+        """Test that the headroom is read from a 429, whose response is falsy."""
+        stream = self.make_stream(tmp_path)
+        reply = requests.Response()
+        reply.status_code = 429
+        reply._content = b"{}"
+        reply.headers["Retry-After"] = "1"
+        reply.headers["X-RateLimit-Remaining"] = "0"
+        reply.headers["X-RateLimit-Type"] = "QPS"
+        prepared = requests.Request("GET", URL).prepare()
+        reply.request = prepared
+
+        with patch.object(stream.requests_session, "send", return_value=reply):
+            with pytest.raises(RateLimitedError):
+                stream._request(prepared, None)
+
+        assert stream.metrics_registry.value(
+            prometheus.RATE_LIMIT_REMAINING, {"category": "heavy", "type": "QPS"}
+        ) == 0
+
+    def test_disabled_by_default(self):
+        """Test that no registry is created without an exporter setting."""
+        assert prometheus.get_metrics_registry({}) is None
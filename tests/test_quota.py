@@ -0,0 +1,231 @@
+"""Tests for the daily quota ledger and deferred child fetches."""
+
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from tap_zoomphone.client import ZoomPhoneStream
+from tap_zoomphone.quota import ChildSpool, QuotaLedger, _today
+from tap_zoomphone.streams import CallHistoryStream
+
+
+class TestQuotaLedger:
+    """Test counting and persistence of daily requests."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.config = {"daily_quotas": {"heavy": 10}, "quota_reserve": 2}
+
+    def test_spend_is_persisted(self, tmp_path):
+        """Test that a new ledger picks up today's counts from disk."""
+        path = tmp_path / "ledger.json"
+        ledger = QuotaLedger(path, self.config)
+        ledger.spend("heavy", 3)
+        ledger.flush()
+
+        ledger = QuotaLedger(path, self.config)
+
+        assert ledger.spent("heavy") == 3
+        assert ledger.remaining("heavy") == 7
+        assert json.loads(path.read_text()) == {_today(): {"heavy": 3}}
+
+    def test_old_days_do_not_count(self, tmp_path):
+        """Test that counts from earlier days are ignored and dropped."""
+        path = tmp_path / "ledger.json"
+        path.write_text(json.dumps({"2020-01-01": {"heavy": 10}}))
+
+        ledger = QuotaLedger(path, self.config)
+        ledger.spend("heavy")
+        ledger.flush()
+
+        assert ledger.remaining("heavy") == 9
+        assert "2020-01-01" not in json.loads(path.read_text())
+
+    def test_writes_are_batched(self, tmp_path):
+        """Test that the file is only rewritten every few requests or on flush."""
+        path = tmp_path / "ledger.json"
+        ledger = QuotaLedger(path, self.config, flush_requests=3)
+
+        ledger.spend("heavy")
+        ledger.spend("heavy")
+        assert not path.exists()
+
+        ledger.spend("heavy")
+        assert json.loads(path.read_text()) == {_today(): {"heavy": 3}}
+
+        ledger.spend("heavy")
+        ledger.flush()
+        assert json.loads(path.read_text()) == {_today(): {"heavy": 4}}
+
+    def test_exhausted_at_reserve(self, tmp_path):
+        """Test that the budget is exhausted once only the reserve remains."""
+        ledger = QuotaLedger(tmp_path / "ledger.json", self.config)
+        ledger.spend("heavy", 7)
+
+        assert not ledger.exhausted("heavy")
+        assert ledger.exhausted("heavy", pending=1)
+        assert not ledger.exhausted("medium")
+
+    def test_observe_remaining_only_raises_count(self, tmp_path):
+        """Test that the server's remaining quota catches the ledger up."""
+        ledger = QuotaLedger(tmp_path / "ledger.json", self.config)
+        ledger.spend("heavy", 2)
+
+        ledger.observe_remaining("heavy", 4)
+        assert ledger.spent("heavy") == 6
+
+        ledger.observe_remaining("heavy", 8)
+        assert ledger.spent("heavy") == 6
+
+
+class TestChildSpool:
+    """Test the spool file of deferred child contexts."""
+
+    def test_drain_returns_in_order_and_clears(self, tmp_path):
+        """Test that spooled contexts come back oldest first, once."""
+        spool = ChildSpool(tmp_path / "spool.jsonl")
+        spool.put({"id": "a"})
+        spool.put({"id": "b"})
+
+        assert len(spool) == 2
+        drained = []
+        assert spool.drain(drained.append) == 2
+        assert drained == [{"id": "a"}, {"id": "b"}]
+        assert spool.drain(drained.append) == 0
+        assert len(spool) == 0
+
+    def test_failed_drain_keeps_unsynced_contexts(self, tmp_path):
+        """Test that contexts not synced before a failure stay ahead of new ones."""
+        spool = ChildSpool(tmp_path / "spool.jsonl")
+        for call_id in "abc":
+            spool.put({"id": call_id})
+
+        def sync(context):
+            if context["id"] == "b":
+                spool.put({"id": "d"})
+                raise RuntimeError("child failed")
+
+        with pytest.raises(RuntimeError):
+            spool.drain(sync)
+
+        drained = []
+        spool.drain(drained.append)
+        assert drained == [{"id": "b"}, {"id": "c"}, {"id": "d"}]
+
+    def test_failed_flush_keeps_every_context(self, tmp_path):
+        """Test that queued contexts are only dropped once the queue is flushed."""
+        spool = ChildSpool(tmp_path / "spool.jsonl")
+        spool.put({"id": "a"})
+
+        def flush():
+            raise RuntimeError("child failed")
+
+        with pytest.raises(RuntimeError):
+            spool.drain(lambda context: None, flush=flush)
+
+        assert len(spool) == 1
+
+    def test_failed_flush_drops_synced_contexts(self, tmp_path):
+        """Test that queued contexts synced before a failed flush are not replayed."""
+        spool = ChildSpool(tmp_path / "spool.jsonl")
+        for call_id in "abc":
+            spool.put({"id": call_id})
+
+        def flush():
+            raise RuntimeError("child failed")
+
+        with pytest.raises(RuntimeError):
+            spool.drain(lambda context: None, flush=flush, progress=lambda: 1)
+
+        drained = []
+        spool.drain(drained.append)
+        assert drained == [{"id": "b"}, {"id": "c"}]
+
+    def test_interrupted_drain_is_resumed(self, tmp_path):
+        """Test that a drain killed midway is picked up by the next one."""
+        spool = ChildSpool(tmp_path / "spool.jsonl")
+        spool.put({"id": "a"})
+        spool.path.rename(spool.draining_path)
+        spool.put({"id": "b"})
+
+        drained = []
+        spool.drain(drained.append)
+        assert drained == [{"id": "a"}, {"id": "b"}]
+        assert not spool.draining_path.exists()
+
+
+class TestDeferredChildren:
+    """Test that call_history spools children when the quota runs low."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.synced = []
+
+    def make_stream(self, tmp_path):
+        mock_tap = Mock()
+        mock_tap.config = {
+            "client_id": "test_client_id",
+            "client_secret": "test_client_secret",
+            "account_id": "test_account_id",
+            "state_dir": str(tmp_path),
+            "daily_quotas": {"heavy": 5},
+        }
+        mock_tap.state = {}
+        stream = CallHistoryStream(mock_tap)
+        stream.child_streams = [Mock(selected=True, api_category="heavy")]
+        return stream
+
+    def sync_children(self, stream, child_context):
+        self.synced.append(child_context["id"])
+        stream.quota_ledger.spend("heavy")
+
+    def test_children_spooled_when_quota_low(self, tmp_path):
+        """Test that children past the quota are spooled rather than fetched."""
+        stream = self.make_stream(tmp_path)
+
+        with patch.object(
+            ZoomPhoneStream, "_sync_children", autospec=True, side_effect=self.sync_children
+        ):
+            for call_id in range(8):
+                stream._sync_children({"id": call_id})
+
+        assert self.synced == [0, 1, 2, 3, 4]
+        drained = []
+        stream.child_spool.drain(drained.append)
+        assert drained == [{"id": 5}, {"id": 6}, {"id": 7}]
+
+    def test_spool_drained_before_new_records(self, tmp_path):
+        """Test that a later run syncs the spooled children first."""
+        stream = self.make_stream(tmp_path)
+        stream.child_spool.put({"id": "deferred"})
+
+        with patch.object(
+            ZoomPhoneStream, "_sync_children", autospec=True, side_effect=self.sync_children
+        ), patch.object(ZoomPhoneStream, "get_records", return_value=iter([])):
+            list(stream.get_records(None))
+
+        assert self.synced == ["deferred"]
+        assert len(stream.child_spool) == 0
+
+    def test_failing_child_keeps_spool(self, tmp_path):
+        """Test that a child failing during the drain leaves it and later ones spooled."""
+        stream = self.make_stream(tmp_path)
+        for call_id in ("a", "b", "c"):
+            stream.child_spool.put({"id": call_id})
+
+        def sync_children(stream, child_context):
+            if child_context["id"] == "b":
+                raise RuntimeError("5xx after retries")
+            self.sync_children(stream, child_context)
+
+        with patch.object(
+            ZoomPhoneStream, "_sync_children", autospec=True, side_effect=sync_children
+        ), patch.object(ZoomPhoneStream, "get_records", return_value=iter([])):
+            with pytest.raises(RuntimeError):
+                list(stream.get_records(None))
+
+        assert self.synced == ["a"]
+        drained = []
+        stream.child_spool.drain(drained.append)
+        assert drained == [{"id": "b"}, {"id": "c"}]
@@ -0,0 +1,162 @@
+"""Tests for error classification, retry waits and the circuit breaker."""
+
+import json
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+import requests
+from singer_sdk.exceptions import FatalAPIError
+
+from tap_zoomphone.async_engine import AsyncRequestEngine
+from tap_zoomphone.retry import (
+    CircuitBreaker,
+    RateLimitedError,
+    RecordNotFoundError,
+    RetryAfterTooLongError,
+    ServerError,
+    parse_retry_after,
+    retry_wait_generator,
+)
+from tap_zoomphone.streams import CallHistoryPathStream, CallHistoryStream
+
+
+def make_stream(stream_class, **config):
+    mock_tap = Mock()
+    mock_tap.config = {
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "account_id": "test_account_id",
+        **config,
+    }
+    stream = stream_class(mock_tap)
+    stream.authenticator = None
+    return stream
+
+
+def make_response(status_code, headers=None, body=b""):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response._content = body
+    response.url = "https://api.zoom.us/v2/phone/call_history/abc"
+    return response
+
+
+class TestRetryWaits:
+    """Test Retry-After parsing and the retry wait generator."""
+
+    def test_parse_retry_after_seconds_and_date(self):
+        """Test both Retry-After forms."""
+        assert parse_retry_after("7") == 7
+        assert parse_retry_after("Thu, 01 Jan 1970 00:00:00 GMT") == 0
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+    def test_rate_limited_waits_for_retry_after(self):
+        """Test that a 429 waits exactly as long as the API asked."""
+        waits = retry_wait_generator()
+        next(waits)
+
+        assert waits.send(RateLimitedError("429", retry_after=12.0)) == 12.0
+
+    def test_server_errors_back_off_with_jitter(self):
+        """Test that 5xx waits are random and capped by an exponential bound."""
+        waits = retry_wait_generator(factor=1, max_value=5)
+        next(waits)
+
+        bounds = [1, 2, 4, 5, 5]
+        for bound in bounds:
+            assert 0 <= waits.send(ServerError("503")) <= bound
+
+
+class TestValidateResponse:
+    """Test that error responses are classified."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.parent = make_stream(CallHistoryStream)
+        self.child = make_stream(CallHistoryPathStream)
+
+    def test_rate_limited(self):
+        """Test that a 429 carries its Retry-After."""
+        with pytest.raises(RateLimitedError) as exc_info:
+            self.parent.validate_response(make_response(429, {"Retry-After": "3"}))
+        assert exc_info.value.retry_after == 3
+
+    def test_long_retry_after_is_not_retried(self):
+        """Test that waiting for a daily quota reset is not attempted."""
+        with pytest.raises(RetryAfterTooLongError):
+            self.parent.validate_response(make_response(429, {"Retry-After": "3600"}))
+
+    def test_server_error(self):
+        """Test that a 5xx is a retriable server error."""
+        with pytest.raises(ServerError):
+            self.parent.validate_response(make_response(502))
+
+    def test_not_found_on_child_is_skippable(self):
+        """Test that a 404 is only a missing record for child streams."""
+        with pytest.raises(RecordNotFoundError):
+            self.child.validate_response(make_response(404))
+        with pytest.raises(FatalAPIError) as exc_info:
+            self.parent.validate_response(make_response(404))
+        assert not isinstance(exc_info.value, RecordNotFoundError)
+
+    def test_deleted_call_is_skipped(self):
+        """Test that a child 404 yields no records and is requested once."""
+        with patch.object(
+            self.child.requests_session, "send", return_value=make_response(404)
+        ) as send:
+            assert list(self.child.get_records({"id": "abc"})) == []
+        assert send.call_count == 1
+
+    def test_deleted_call_is_skipped_by_async_engine(self):
+        """Test that a 404 in a concurrent batch only empties that call."""
+
+        def handler(request):
+            call_id = request.url.path.rsplit("/", 1)[-1]
+            if call_id == "gone":
+                return httpx.Response(404)
+            return httpx.Response(200, content=json.dumps({"id": call_id}).encode())
+
+        engine = AsyncRequestEngine(self.child, transport=httpx.MockTransport(handler))
+        results = engine.fetch_many([{"id": "a"}, {"id": "gone"}, {"id": "b"}])
+        engine.close()
+
+        assert results == [[{"id": "a"}], [], [{"id": "b"}]]
+
+
+class TestCircuitBreaker:
+    """Test that the breaker pauses an endpoint when its error rate spikes."""
+
+    def test_opens_at_threshold(self):
+        """Test that the breaker opens once enough recent requests failed."""
+        breaker = CircuitBreaker(threshold=0.5, cooldown=60, window=10, min_requests=4)
+        breaker.record_success()
+        breaker.record_success()
+        assert not breaker.record_failure()
+        assert breaker.record_failure()
+
+        assert breaker.is_open
+        assert 59 < breaker.delay() <= 60
+
+    def test_stays_closed_below_min_requests(self):
+        """Test that a few early failures do not open the breaker."""
+        breaker = CircuitBreaker(threshold=0.5, cooldown=60, window=10, min_requests=4)
+        for _ in range(3):
+            breaker.record_failure()
+
+        assert not breaker.is_open
+        assert breaker.delay() == 0
+
+    def test_stream_request_waits_while_open(self):
+        """Test that a stream request sleeps out an open breaker."""
+        stream = make_stream(CallHistoryPathStream)
+        stream.circuit_breaker.delay = Mock(return_value=2.5)
+
+        with patch("tap_zoomphone.client.time.sleep") as sleep, patch.object(
+            stream.requests_session, "send", return_value=make_response(200, body=b"{}")
+        ):
+            stream._request(stream.prepare_request({"id": "abc"}, None), None)
+
+        sleep.assert_called_once_with(2.5)
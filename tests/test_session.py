@@ -0,0 +1,78 @@
+"""Tests for the shared connection pool."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from tap_zoomphone.session import _adapters, get_http_adapter, pool_size
+from tap_zoomphone.tap import TapZoomPhone
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def tap():
+    return TapZoomPhone(
+        config={
+            "client_id": "test_client_id",
+            "client_secret": "test_client_secret",
+            "account_id": "test_account_id",
+        },
+        parse_env_config=False,
+    )
+
+
+class TestConnectionPool:
+    """Test pool sizing and connection reuse across streams."""
+
+    def test_pool_size(self):
+        """Test that the pool fits the partition workers unless set explicitly."""
+        assert pool_size({}) == 10
+        assert pool_size({"user_partition_workers": 32}) == 34
+        assert pool_size({"http_pool_size": 4, "user_partition_workers": 32}) == 4
+
+    def test_streams_reuse_connections(self, tap, server):
+        """Test that a connection opened by one stream is reused by another."""
+        users = tap.streams["users"].requests_session
+        sms = tap.streams["sms_sessions"].requests_session
+        assert users.get_adapter(server) is get_http_adapter(tap.config)
+
+        first = users.get(f"{server}/a")
+        second = sms.get(f"{server}/b")
+
+        assert first.connection_reused is False
+        assert second.connection_reused is True
+
+    def test_release_resources_closes_pool(self, tap, server):
+        """Test that releasing the tap's resources closes the pooled connections."""
+        adapter = get_http_adapter(tap.config)
+        tap.streams["users"].requests_session.get(f"{server}/a")
+        assert adapter.poolmanager.pools
+
+        tap.release_resources()
+
+        assert not adapter.poolmanager.pools
+        assert not _adapters
@@ -0,0 +1,225 @@
+"""Tests for date-range sharding."""
+
+import logging
+from datetime import datetime, timezone
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+from dateutil.relativedelta import relativedelta
+
+from tap_zoomphone.pagination import (
+    PageCountBasedDateRangePaginationStrategy,
+    PageState,
+    Window,
+)
+from tap_zoomphone.sharding import Shard, merge_shard_states
+from tap_zoomphone.streams import CallHistoryStream, UsersStream
+from tap_zoomphone.tap import TapZoomPhone
+
+
+class TestShard:
+    """Test shard parsing and window assignment."""
+
+    def test_parse(self):
+        """Test parsing a k/n specification."""
+        assert Shard.parse("2/4") == Shard(2, 4)
+        assert str(Shard.parse(" 1 / 3 ")) == "1/3"
+
+    @pytest.mark.parametrize("value", ["0/4", "5/4", "1", "a/b", "1/0"])
+    def test_parse_invalid(self, value):
+        """Test that malformed or out of range shards are rejected."""
+        with pytest.raises(ValueError):
+            Shard.parse(value)
+
+    def test_every_month_has_exactly_one_owner(self):
+        """Test that months are split round-robin without gaps or overlaps."""
+        shards = [Shard(k, 3) for k in range(1, 4)]
+        month = datetime(2023, 1, 1, tzinfo=timezone.utc)
+        for _ in range(24):
+            owners = [shard for shard in shards if shard.owns_window(month)]
+            assert len(owners) == 1
+            month += relativedelta(months=1)
+
+
+class TestShardedPagination:
+    """Test that date-range strategies skip windows owned by other shards."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.shard = Shard(2, 3)
+        self.strategy = PageCountBasedDateRangePaginationStrategy(
+            page_size=300,
+            history_window=relativedelta(months=6),
+            logger=Mock(spec=logging.Logger),
+            window_filter=self.shard.owns_window,
+        )
+
+    def test_initial_window_skips_to_owned_month(self):
+        """Test that the first request starts at the first owned month."""
+        with patch.object(self.strategy, "_get_initial_start_date") as mock_start_date:
+            mock_start_date.return_value = datetime(2024, 1, 15, tzinfo=timezone.utc)
+            params = self.strategy.get_url_params(context=None, next_page_token=None)
+
+        expected = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        while not self.shard.owns_window(expected):
+            expected += relativedelta(months=1)
+        assert params["from"] == expected.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def test_advance_skips_to_next_owned_month(self):
+        """Test that advancing jumps over windows owned by other shards."""
+        window = Window(datetime(2024, 1, 1, tzinfo=timezone.utc), datetime(2024, 2, 1, tzinfo=timezone.utc))
+        response = requests.Response()
+        response._content = b'{"page_count": 1, "call_logs": []}'
+        next_page_token = self.strategy.next_state(response, PageState(window))
+
+        params = self.strategy.get_url_params(context=None, next_page_token=next_page_token)
+
+        window_from = datetime.fromisoformat(params["from"])
+        assert self.shard.owns_window(window_from)
+        assert window_from >= datetime(2024, 2, 1, tzinfo=timezone.utc)
+        assert window_from < datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+    def test_no_window_after_last_owned_month(self):
+        """Test that pagination stops when the next owned month is in the future."""
+        now = datetime.now(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        owned_current = self.shard.owns_window(now)
+
+        assert self.strategy.has_window_after(now.strftime("%Y-%m-%dT%H:%M:%SZ")) is owned_current
+
+
+class TestShardedStreams:
+    """Test stream configuration for sharded runs."""
+
+    def make_stream(self, stream_class, **config):
+        mock_tap = Mock()
+        mock_tap.config = {
+            "client_id": "test_client_id",
+            "client_secret": "test_client_secret",
+            "account_id": "test_account_id",
+            **config,
+        }
+        mock_tap.state = {}
+        return stream_class(mock_tap)
+
+    def test_date_range_stream_uses_shard_partition(self):
+        """Test that a sharded date-range stream keeps state in a shard partition."""
+        stream = self.make_stream(CallHistoryStream, shard="1/2")
+
+        assert stream.partitions == [{"shard": "1/2"}]
+        assert stream._pagination_strategy.window_filter == stream.shard.owns_window
+
+    def test_records_do_not_carry_the_shard(self):
+        """Test that the shard partition key is not copied onto emitted records."""
+        tap = TapZoomPhone(
+            config={
+                "client_id": "test_client_id",
+                "client_secret": "test_client_secret",
+                "account_id": "test_account_id",
+                "shard": "1/2",
+            },
+            parse_env_config=False,
+        )
+        stream = tap.streams["call_history"]
+        record = {"id": "1"}
+
+        with patch.object(stream, "_sync_children"):
+            stream._process_record(record, partition_context=stream.shard.context)
+
+        assert record == {"id": "1"}
+
+    def test_full_table_stream_is_not_sharded(self):
+        """Test that streams without date windows are unaffected by sharding."""
+        stream = self.make_stream(UsersStream, shard="1/2")
+
+        assert stream.partitions is None
+
+
+class TestMergeShardStates:
+    """Test merging of shard states."""
+
+    @staticmethod
+    def shard_state(shard, value):
+        return {
+            "bookmarks": {
+                "call_history": {
+                    "partitions": [
+                        {
+                            "context": {"shard": shard},
+                            "replication_key": "start_time",
+                            "replication_key_value": value,
+                        }
+                    ]
+                },
+                "call_history_path": {},
+            }
+        }
+
+    def test_merge_takes_latest_bookmark(self):
+        """Test that the merged bookmark is the latest value of any shard."""
+        merged = merge_shard_states(
+            [
+                self.shard_state("1/2", "2024-05-31T10:00:00Z"),
+                self.shard_state("2/2", "2024-06-30T09:00:00Z"),
+            ]
+        )
+
+        assert merged == {
+            "bookmarks": {
+                "call_history": {
+                    "replication_key": "start_time",
+                    "replication_key_value": "2024-06-30T09:00:00Z",
+                },
+                "call_history_path": {},
+            }
+        }
+
+    def test_merge_keeps_user_partitions_and_mismatches(self):
+        """Test that partitions are merged per user and keep every shard's mismatches."""
+
+        def user_state(shard, value, mismatch):
+            return {
+                "bookmarks": {
+                    "call_history": {
+                        "partitions": [
+                            {
+                                "context": {"user_id": user_id, "shard": shard},
+                                "replication_key": "start_time",
+                                "replication_key_value": value,
+                                "window_mismatches": [mismatch],
+                            }
+                            for user_id in ("u1", "u2")
+                        ]
+                    }
+                }
+            }
+
+        january = {"from": "2024-01-01", "to": "2024-02-01", "expected": 5, "received": 4}
+        february = {"from": "2024-02-01", "to": "2024-03-01", "expected": 2, "received": 1}
+        merged = merge_shard_states(
+            [
+                user_state("2/2", "2024-02-28T10:00:00Z", february),
+                user_state("1/2", "2024-01-31T10:00:00Z", january),
+            ]
+        )
+
+        assert merged == {
+            "bookmarks": {
+                "call_history": {
+                    "partitions": [
+                        {
+                            "context": {"user_id": user_id},
+                            "replication_key": "start_time",
+                            "replication_key_value": "2024-02-28T10:00:00Z",
+                            "window_mismatches": [january, february],
+                        }
+                        for user_id in ("u1", "u2")
+                    ]
+                }
+            }
+        }
+
+    def test_merge_requires_every_shard(self):
+        """Test that merging fails when a shard state is missing."""
+        with pytest.raises(ValueError, match="missing shard states"):
+            merge_shard_states([self.shard_state("1/3", "2024-05-31T10:00:00Z")])
@@ -1,11 +1,16 @@
 """Integration tests for stream pagination."""
 
+import json
 import logging
+import threading
 from datetime import datetime, timezone
 from unittest.mock import Mock, patch
+from urllib.parse import parse_qs, urlparse
 from dateutil.relativedelta import relativedelta
 
 import pytest
+import requests
+from singer_sdk.pagination import BaseAPIPaginator
 
 from tap_zoomphone.client import ZoomPhoneStream
 from tap_zoomphone.streams import (
@@ -15,10 +20,12 @@ from tap_zoomphone.streams import (
     CallHistoryPathStream,
 )
 from tap_zoomphone.pagination import (
+    PageState,
     TokenPaginationStrategy,
     TokenBasedDateRangePaginationStrategy,
     PageCountBasedDateRangePaginationStrategy,
     SinglePageStrategy,
+    Window,
 )
 
 
@@ -72,8 +79,7 @@ class TestStreamPaginationIntegration:
         assert params == {"page_size": 100}
         
         # Request with token
-        next_page_token = {"next_page_token": "abc123"}
-        params = stream.get_url_params(context=None, next_page_token=next_page_token)
+        params = stream.get_url_params(context=None, next_page_token=PageState(None, "abc123", 2))
         assert params == {"page_size": 100, "next_page_token": "abc123"}
 
     def test_sms_sessions_stream_url_params(self):
@@ -184,23 +190,23 @@ class TestStreamPaginationIntegration:
                 assert "next_page_token" in params
             
             # Simulate getting a token for next request
-            next_page_token = {"next_page_token": f"token_{i}"}
+            next_page_token = PageState(None, f"token_{i}", i + 2)
 
     def test_date_range_pagination_month_boundaries(self):
         """Test that date range pagination handles month boundaries correctly."""
         stream = SmsSessionsStream(self.mock_tap)
         
         # Test advancing from one month to the next
-        next_page_token = {
-            "last_to": "2024-01-31T23:59:59Z",
-            "last_page_in_batch": True
-        }
+        window = Window(datetime(2024, 1, 1, tzinfo=timezone.utc), datetime(2024, 2, 1, tzinfo=timezone.utc))
+        response = requests.Response()
+        response._content = b'{"sms_sessions": [], "next_page_token": ""}'
+        next_page_token = stream._pagination_strategy.next_state(response, PageState(window))
         
         params = stream.get_url_params(context=None, next_page_token=next_page_token)
         
         # Should advance to next month
-        assert params["from"] == "2024-01-31T23:59:59Z"
-        assert "2024-02" in params["to"]  # Should be February
+        assert params["from"] == "2024-02-01T00:00:00Z"
+        assert params["to"] == "2024-03-01T00:00:00Z"
 
     def test_pagination_with_context(self):
         """Test that pagination works correctly with stream context."""
@@ -214,3 +220,90 @@ class TestStreamPaginationIntegration:
             assert params["page_size"] == 300
             assert "from" in params
             assert "to" in params
+
+
+class TokenPaginator(BaseAPIPaginator):
+    """Minimal paginator returning the page states the strategies expect."""
+
+    def get_next(self, response):
+        token = response.json().get("next_page_token")
+        return PageState(None, token) if token else None
+
+
+class TestPagePrefetch:
+    """Tests for background prefetching of the next page."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_tap = Mock()
+        self.mock_tap.config = {
+            "client_id": "test_client_id",
+            "client_secret": "test_client_secret",
+            "account_id": "test_account_id",
+            "page_prefetch": True,
+        }
+
+    @staticmethod
+    def _response(body):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(body).encode()
+        return response
+
+    def test_next_page_requested_before_current_page_is_consumed(self):
+        """Test that page two is in flight while page one's records are yielded."""
+        stream = UsersStream(self.mock_tap)
+        stream.authenticator = None
+        pages = {
+            None: {"users": [{"id": "1"}, {"id": "2"}], "next_page_token": "abc"},
+            "abc": {"users": [{"id": "3"}], "next_page_token": ""},
+        }
+        sent = []
+        second_page_sent = threading.Event()
+
+        def fake_request(prepared_request, context):
+            token = parse_qs(urlparse(prepared_request.url).query).get("next_page_token")
+            sent.append(token)
+            if token:
+                second_page_sent.set()
+            return self._response(pages[token[0] if token else None])
+
+        with patch.object(stream, "_request", side_effect=fake_request), patch.object(
+            stream, "get_new_paginator", return_value=TokenPaginator(None)
+        ):
+            records = stream.request_records(None)
+            first = next(records)
+            assert second_page_sent.wait(timeout=5)
+            rest = list(records)
+
+        assert [first["id"]] + [record["id"] for record in rest] == ["1", "2", "3"]
+        assert sent == [None, ["abc"]]
+
+    def test_pages_share_one_worker_and_session(self):
+        """Test that every prefetched request reuses the stream's worker and session."""
+        stream = UsersStream(self.mock_tap)
+        stream.authenticator = None
+        sessions = set()
+
+        def fake_request(prepared_request, context):
+            sessions.add(id(stream.requests_session))
+            return self._response({"users": [{"id": "1"}], "next_page_token": ""})
+
+        with patch.object(stream, "_request", side_effect=fake_request), patch.object(
+            stream, "get_new_paginator", return_value=TokenPaginator(None)
+        ):
+            for _ in range(3):
+                assert [r["id"] for r in stream.request_records(None)] == ["1"]
+            executor = stream.prefetch_executor
+
+        assert len(sessions) == 1
+        stream.close_http_engine()
+        assert "prefetch_executor" not in stream.__dict__
+        assert executor._shutdown
+
+    def test_single_page_children_are_not_prefetched(self):
+        """Test that call_history_path requests its page without the prefetch worker."""
+        stream = CallHistoryPathStream(self.mock_tap)
+
+        assert not stream.prefetches_pages
+        assert UsersStream(self.mock_tap).prefetches_pages
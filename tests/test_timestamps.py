@@ -0,0 +1,59 @@
+"""Tests for timestamp parsing and comparison keys."""
+
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+import pytest
+
+from tap_zoomphone.streams import SmsSessionsStream
+from tap_zoomphone.timestamps import format_timestamp, parse_timestamp, timestamp_key
+
+
+class TestTimestamps:
+    """Test the fixed-format and fallback paths."""
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "2024-01-05T10:00:00Z",
+            "2024-01-05T12:00:00+02:00",
+            "2024-01-05T10:00:00",
+            "20240105T100000Z",
+        ],
+    )
+    def test_parse(self, value):
+        """Test that Zoom's shape, offsets, naive and basic-format values parse to UTC."""
+        assert parse_timestamp(value) == datetime(2024, 1, 5, 10, tzinfo=timezone.utc)
+
+    def test_timestamp_key(self):
+        """Test that keys compare like the instants they denote."""
+        assert timestamp_key("2024-01-05T10:00:00Z") == "2024-01-05T10:00:00Z"
+        assert timestamp_key("2024-01-05T12:00:00.5+02:00") == "2024-01-05T10:00:00Z"
+        assert timestamp_key("2024-01-05T09:00:00-02:00") > timestamp_key(
+            "2024-01-05T10:00:00Z"
+        )
+        assert format_timestamp(parse_timestamp("2024-01-05T10:00:00Z")) == (
+            "2024-01-05T10:00:00Z"
+        )
+
+    def test_bookmark_is_normalized(self):
+        """Test that a replication key in another shape is bookmarked in Zoom's."""
+        mock_tap = Mock()
+        mock_tap.config = {
+            "client_id": "test_client_id",
+            "client_secret": "test_client_secret",
+            "account_id": "test_account_id",
+        }
+        mock_tap.state = {}
+        stream = SmsSessionsStream(mock_tap)
+
+        stream._increment_stream_state(
+            {"session_id": "a", "last_access_time": "2024-01-05T12:00:00+02:00"}
+        )
+        stream._increment_stream_state(
+            {"session_id": "b", "last_access_time": "2024-01-05T09:30:00Z"}
+        )
+
+        state = stream.get_context_state(None)
+        progress = state.get("progress_markers", state)
+        assert progress["replication_key_value"] == "2024-01-05T10:00:00Z"
@@ -0,0 +1,205 @@
+"""Tests for the request trace log and its summary."""
+
+import json
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from tap_zoomphone.retry import ServerError
+from tap_zoomphone.streams import CallHistoryStream
+from tap_zoomphone.trace import (
+    TraceSink,
+    format_summary,
+    main,
+    path_template,
+    read_events,
+    summarize,
+)
+
+URL = (
+    "https://api.zoom.us/v2/phone/call_history"
+    "?from=2024-01-01T00%3A00%3A00Z&to=2024-02-01T00%3A00%3A00Z"
+)
+
+
+def make_stream(**config):
+    mock_tap = Mock()
+    mock_tap.config = {
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "account_id": "test_account_id",
+        **config,
+    }
+    mock_tap.state = {}
+    stream = CallHistoryStream(mock_tap)
+    stream.authenticator = None
+    return stream
+
+
+def response(status, body, url=URL):
+    reply = requests.Response()
+    reply.status_code = status
+    reply._content = json.dumps(body).encode()
+    reply.request = requests.Request("GET", url).prepare()
+    reply.elapsed = timedelta(milliseconds=250)
+    return reply
+
+
+def load(path):
+    return list(read_events(path.read_text().splitlines()))
+
+
+class TestTraceSink:
+    """Test the JSONL events written per request."""
+
+    def test_pages_are_numbered_per_window(self, tmp_path):
+        """Test that successful pages of a window count up and failures do not."""
+        sink = TraceSink(str(tmp_path / "trace.jsonl"))
+        sink.request("call_history", URL, status=200, latency=0.5, size=10, records=3)
+        sink.request("call_history", URL, status=429, latency=0.1, error="RateLimitedError")
+        sink.request(
+            "call_history", URL + "&next_page_token=t", status=200, latency=0.2, records=1
+        )
+        sink.close()
+
+        events = load(tmp_path / "trace.jsonl")
+        assert [event.get("page") for event in events] == [1, None, 2]
+        assert events[0]["from"] == "2024-01-01T00:00:00Z"
+        assert [event["token"] for event in events] == [False, False, True]
+        assert events[1]["error"] == "RateLimitedError"
+
+
+    def test_finished_chains_are_forgotten(self, tmp_path):
+        """Test that a chain is dropped after its last page, leaving nothing behind."""
+        sink = TraceSink(str(tmp_path / "trace.jsonl"))
+        first_page = b'{"next_page_token": "t"}'
+        sink.request("call_history", URL, status=200, latency=0.1, content=first_page)
+        assert len(sink._pages) == 1
+        sink.request(
+            "call_history",
+            URL + "&next_page_token=t",
+            status=200,
+            latency=0.1,
+            content=b'{"next_page_token": ""}',
+        )
+        for call_id in range(3):
+            sink.request(
+                "call_history_path",
+                f"https://api.zoom.us/v2/phone/call_history/{call_id}",
+                status=200,
+                latency=0.1,
+                content=b'{"id": "x"}',
+            )
+        sink.close()
+
+        assert sink._pages == {}
+        assert [event["page"] for event in load(tmp_path / "trace.jsonl")] == [1, 2, 1, 1, 1]
+
+
+class TestStreamTracing:
+    """Test that streams write pages and failed attempts to the trace."""
+
+    def test_pages_and_failures_are_traced(self, tmp_path):
+        """Test that a retried request leaves a failure and a page event."""
+        stream = make_stream(trace_file=str(tmp_path / "trace.jsonl"))
+        replies = iter(
+            [
+                response(500, {}),
+                response(200, {"call_logs": [{"id": "a"}], "total_records": 1}),
+            ]
+        )
+
+        with patch.object(
+            stream.requests_session, "send", side_effect=lambda *a, **k: next(replies)
+        ), patch("backoff._sync.time.sleep"):
+            decorated = stream.request_decorator(stream._request)
+            reply = decorated(requests.Request("GET", URL).prepare(), None)
+            list(stream.parse_response(reply))
+
+        stream.trace_sink.close()
+        events = load(tmp_path / "trace.jsonl")
+        assert [event["status"] for event in events] == [500, 200]
+        assert events[0]["error"] == ServerError.__name__
+        assert events[1]["records"] == 1
+        assert events[1]["latency_ms"] == 250.0
+
+    def test_disabled_by_default(self):
+        """Test that no trace is written without trace_file."""
+        assert make_stream().trace_sink is None
+
+
+class TestSummary:
+    """Test the offline summary."""
+
+    @pytest.fixture
+    def events(self):
+        window = {"stream": "call_history", "path": "/v2/phone/call_history"}
+        return [
+            {**window, "from": "a", "to": "b", "latency_ms": 100.0, "page": 1, "records": 3},
+            {**window, "from": "a", "to": "b", "latency_ms": 900.0, "page": 2, "records": 3},
+            {**window, "from": "b", "to": "c", "latency_ms": 300.0, "page": 1, "records": 1},
+            {**window, "from": "b", "to": "c", "latency_ms": 50.0, "status": 429,
+             "error": "RateLimitedError"},
+        ]
+
+    def test_summary_tables(self, events):
+        """Test the slowest windows, chains, hot spots and percentiles."""
+        summary = summarize(events)
+
+        assert summary["slowest_windows"][0]["from"] == "a"
+        assert summary["slowest_windows"][0]["latency_ms"] == 1000.0
+        assert summary["longest_chains"][0]["pages"] == 2
+        assert summary["retry_hot_spots"] == [
+            {
+                "stream": "call_history",
+                "path": "/v2/phone/call_history",
+                "from": "b",
+                "to": "c",
+                "failures": 1,
+                "statuses": {"429": 1},
+            }
+        ]
+        assert summary["latency"][0]["p50_ms"] == 100.0
+        assert summary["latency"][0]["p99_ms"] == 900.0
+        assert "p95 900ms" in format_summary(summary)
+
+    def test_latency_is_grouped_by_path_template(self):
+        """Test that child requests of different calls share one endpoint row."""
+        events = [
+            {
+                "stream": "call_history_path",
+                "path": f"/v2/phone/call_history/{call_id}",
+                "latency_ms": latency,
+                "page": 1,
+                "records": 1,
+            }
+            for call_id, latency in (("7f3a-91", 100.0), ("20240101", 300.0))
+        ]
+
+        summary = summarize(events)
+
+        assert summary["latency"] == [
+            {
+                "path": "/v2/phone/call_history/{id}",
+                "requests": 2,
+                "p50_ms": 100.0,
+                "p95_ms": 300.0,
+                "p99_ms": 300.0,
+            }
+        ]
+        assert summary["slowest_windows"][0]["path"] == "/v2/phone/call_history/{id}"
+        assert summary["slowest_windows"][0]["latency_ms"] == 400.0
+        assert path_template("/v2/phone/users/KDcuGIm1QgePTO8WbOqwIQ/call_history") == (
+            "/v2/phone/users/{id}/call_history"
+        )
+
+    def test_command(self, events, tmp_path, capsys):
+        """Test the summarizer command on a trace file."""
+        trace = tmp_path / "trace.jsonl"
+        trace.write_text("\n".join(json.dumps(event) for event in events) + "\n{trunc")
+
+        main([str(trace), "--json"])
+
+        assert json.loads(capsys.readouterr().out)["longest_chains"][0]["pages"] == 2
@@ -0,0 +1,112 @@
+"""Tests for the users index and participant enrichment."""
+
+from unittest.mock import patch
+
+import pytest
+
+from tap_zoomphone.streams import UsersStream
+from tap_zoomphone.tap import TapZoomPhone
+from tap_zoomphone.users_index import UsersIndex
+
+USERS = [
+    {
+        "id": "u1",
+        "extension_id": "e1",
+        "extension_number": 101,
+        "site_name": "London",
+        "department": "Sales",
+        "cost_center": "CC1",
+    },
+    {
+        "id": "u2",
+        "extension_id": "e2",
+        "extension_number": 102,
+        "site_name": "London",
+        "department": "Sales",
+        "cost_center": "CC1",
+    },
+]
+
+
+@pytest.fixture
+def tap():
+    return TapZoomPhone(
+        config={
+            "client_id": "test_client_id",
+            "client_secret": "test_client_secret",
+            "account_id": "test_account_id",
+            "enrich_participants": True,
+        },
+        parse_env_config=False,
+    )
+
+
+class TestUsersIndex:
+    """Test lookups and enrichment."""
+
+    def test_lookup(self):
+        """Test that users are found by id, extension id and extension number."""
+        index = UsersIndex(USERS)
+
+        assert len(index) == 2
+        assert index.lookup(user_id="u1") == ("London", "Sales", "CC1")
+        assert index.lookup(extension_id="e2") is index.lookup(user_id="u1")
+        assert index.lookup(extension_id="unknown", extension_number="102") == (
+            "London",
+            "Sales",
+            "CC1",
+        )
+        assert index.lookup(extension_id="unknown") is None
+
+    def test_call_history_is_enriched(self, tap):
+        """Test that callers and callees are enriched from one users listing."""
+        users_stream = tap.streams["users"]
+        stream = tap.streams["call_history"]
+        row = {"id": "c1", "caller_ext_id": "e1", "callee_ext_number": "999"}
+
+        with patch.object(
+            UsersStream, "request_records", return_value=iter(USERS)
+        ) as request_records:
+            stream.post_process(row)
+            stream.post_process({"id": "c2", "caller_ext_number": "102"})
+
+        request_records.assert_called_once_with(None)
+        assert users_stream.get_users_index() is stream.users_index
+        assert row["caller_site_name"] == "London"
+        assert row["caller_cost_center"] == "CC1"
+        assert row["callee_department"] is None
+        assert "caller_site_name" in stream.schema["properties"]
+
+    def test_users_sync_builds_the_index(self, tap):
+        """Test that syncing users first builds the index without another listing."""
+        users_stream = tap.streams["users"]
+
+        with patch.object(
+            UsersStream, "request_records", return_value=iter(USERS)
+        ) as request_records:
+            list(users_stream.get_records(None))
+            index = users_stream.get_users_index()
+
+        request_records.assert_called_once_with(None)
+        assert index.lookup(user_id="u2") == ("London", "Sales", "CC1")
+
+    def test_sms_and_call_path_participants(self, tap):
+        """Test that SMS participants and call path items are enriched."""
+        tap.streams["users"]._users_index = UsersIndex(USERS)
+        session = {
+            "session_id": "s1",
+            "participants": [
+                {"owner": {"id": "u1", "type": "user"}},
+                {"phone_number": "+15550100"},
+            ],
+        }
+        path = {"id": "c1", "call_path": [{"callee_ext_id": "e2"}]}
+
+        tap.streams["sms_sessions"].post_process(session)
+        tap.streams["call_history_path"].post_process(path)
+
+        assert session["participants"][0]["department"] == "Sales"
+        assert session["participants"][1]["department"] is None
+        assert path["call_path"][0]["callee_site_name"] == "London"
+        legs_schema = tap.streams["call_history_path_legs"].schema
+        assert "callee_site_name" in legs_schema["properties"]
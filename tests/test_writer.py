@@ -0,0 +1,130 @@
+"""Tests for the buffered Singer message writer."""
+
+import io
+import json
+import sys
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from singer_sdk.io_base import SingerWriter
+from singer_sdk.singerlib import RecordMessage, SchemaMessage, StateMessage
+
+from tap_zoomphone.tap import TapZoomPhone
+from tap_zoomphone.writer import BufferedSingerWriter
+
+
+def written(capsysbinary):
+    return capsysbinary.readouterr().out.decode()
+
+
+def record_message(record):
+    return RecordMessage(
+        stream="call_history",
+        record=record,
+        time_extracted=datetime(2024, 1, 5, 10, 0, 0, 123456, tzinfo=timezone.utc),
+    )
+
+
+class TestBufferedSingerWriter:
+    """Test serialisation and flushing."""
+
+    def test_lines_match_the_sdk_writer(self, capsysbinary):
+        """Test that messages decode to the same values as the SDK's lines."""
+        messages = [
+            SchemaMessage(
+                stream="call_history", schema={"type": "object"}, key_properties=["id"]
+            ),
+            record_message(
+                {
+                    "id": "1",
+                    "duration": 60,
+                    "rate": Decimal("0.10"),
+                    "exact": Decimal("1.00000000000000000001"),
+                    "answer_time": None,
+                    "tags": [{"name": "x"}],
+                }
+            ),
+        ]
+        sdk_lines = [SingerWriter().format_message(message) for message in messages]
+
+        writer = BufferedSingerWriter()
+        for message in messages:
+            writer.write_message(message)
+        writer.flush()
+
+        lines = written(capsysbinary).splitlines()
+        assert [json.loads(line) for line in lines] == [
+            json.loads(line) for line in sdk_lines
+        ]
+        assert '"exact":1.00000000000000000001' in lines[1]
+
+    def test_numbers_are_written_byte_for_byte_like_the_sdk(self, capsysbinary):
+        """Test that Decimals, integral or not, are written as the SDK writes them."""
+        message = RecordMessage(
+            stream="call_history",
+            record={
+                "id": "1",
+                "duration": Decimal(60),
+                "charge": Decimal("60.0"),
+                "rate": Decimal("0.10"),
+                "large": Decimal("1E+3"),
+                "count": 3,
+                "ratio": 0.25,
+            },
+        )
+        sdk_line = SingerWriter().format_message(message)
+
+        writer = BufferedSingerWriter()
+        writer.write_message(message)
+        writer.flush()
+
+        assert written(capsysbinary) == sdk_line + "\n"
+        assert '"duration":60,' in sdk_line
+
+    def test_flushed_on_state(self, capsysbinary):
+        """Test that records are held until a STATE message follows them."""
+        writer = BufferedSingerWriter(flush_interval=3600)
+
+        writer.write_message(record_message({"id": "1"}))
+        assert written(capsysbinary) == ""
+
+        writer.write_message(record_message({"id": "2"}))
+        writer.write_message(StateMessage(value={"bookmarks": {}}))
+        types = [json.loads(line)["type"] for line in written(capsysbinary).splitlines()]
+        assert types == ["RECORD", "RECORD", "STATE"]
+
+    def test_flushed_when_full(self, capsysbinary):
+        """Test that the buffer is written out once it holds flush_bytes."""
+        writer = BufferedSingerWriter(flush_bytes=200, flush_interval=3600)
+
+        for index in range(5):
+            writer.write_message(record_message({"id": str(index)}))
+
+        assert 0 < len(written(capsysbinary).splitlines()) < 5
+        writer.flush()
+
+    def test_text_stdout(self, monkeypatch):
+        """Test that a stdout without a binary buffer is written as text."""
+        output = io.StringIO()
+        monkeypatch.setattr(sys, "stdout", output)
+
+        BufferedSingerWriter().write_message(StateMessage(value={"a": 1}))
+
+        assert json.loads(output.getvalue()) == {"type": "STATE", "value": {"a": 1}}
+
+    def test_enabled_by_config(self):
+        """Test that the tap writes messages and state through the buffered writer."""
+        tap = TapZoomPhone(
+            config={
+                "client_id": "test_client_id",
+                "client_secret": "test_client_secret",
+                "account_id": "test_account_id",
+                "buffered_writer": True,
+                "writer_flush_bytes": 4096,
+            },
+            parse_env_config=False,
+        )
+
+        assert isinstance(tap.message_writer, BufferedSingerWriter)
+        assert tap.message_writer.flush_bytes == 4096
+        assert tap.state_writer._message_writer is tap.message_writer